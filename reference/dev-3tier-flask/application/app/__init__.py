@@ -4,14 +4,22 @@ The factory pattern allows creating multiple app instances with different
 configurations, which is useful for testing and running multiple instances.
 """
 from flask import Flask, render_template
+from app.cache import TTLCache
 from app.extensions import db, migrate, login_manager
+from app.json_provider import FastJSONProvider
+from app.metrics import RequestMetrics
+from app.page_cache import PageCache
+from app.pool_stats import PoolMonitor
+from app.passwords import PasswordVerifier
+from app.write_buffer import GroupCommitBuffer
 
 
 def create_app(config_name='development'):
     """Create and configure the Flask application.
 
     Args:
-        config_name: Configuration to use ('development', 'production', 'testing').
+        config_name: Configuration to use ('development', 'production', 'testing',
+            'benchmark').
 
     Returns:
         Configured Flask application instance.
@@ -22,7 +30,8 @@ def create_app(config_name='development'):
     config_map = {
         'development': 'config.DevelopmentConfig',
         'production': 'config.ProductionConfig',
-        'testing': 'config.TestingConfig'
+        'testing': 'config.TestingConfig',
+        'benchmark': 'config.BenchmarkConfig'
     }
     app.config.from_object(config_map.get(config_name, 'config.DevelopmentConfig'))
 
@@ -34,14 +43,88 @@ def create_app(config_name='development'):
     # Configure user loader for Flask-Login
     from app.services.auth_service import AuthService
 
+    # Per-process cache of user snapshots behind the user loader
+    app.extensions['user_cache'] = TTLCache(
+        maxsize=app.config['USER_CACHE_SIZE'],
+        ttl=app.config['USER_CACHE_TTL']
+    )
+
+    # Bounded pool for slow password hash checks
+    app.extensions['password_verifier'] = PasswordVerifier(
+        method=app.config['PASSWORD_HASH_METHOD'],
+        workers=app.config['PASSWORD_VERIFY_WORKERS'],
+        queue_limit=app.config['PASSWORD_VERIFY_QUEUE_LIMIT'],
+        timeout=app.config['PASSWORD_VERIFY_TIMEOUT']
+    )
+
+    # Rendered marketing pages (see app.page_cache.cached_page)
+    app.extensions['page_cache'] = PageCache(
+        max_age=app.config['PAGE_CACHE_MAX_AGE'],
+        enabled=app.config['PAGE_CACHE_ENABLED']
+    )
+
     @login_manager.user_loader
     def load_user(user_id):
         """Load user by ID for Flask-Login session management."""
-        return AuthService.get_user_by_id(user_id)
+        return AuthService.load_user(user_id)
+
+    with app.app_context():
+        # Connection pool statistics for /admin/pool-stats
+        app.extensions['pool_monitor'] = PoolMonitor(db.engine)
+
+        # Latency, status and SQL metrics on /metrics (Prometheus format)
+        if app.config['METRICS_ENABLED']:
+            app.extensions['metrics'] = RequestMetrics(
+                app, db.engine,
+                directory=app.config['METRICS_DIR'],
+                flush_interval=app.config['METRICS_FLUSH_INTERVAL'],
+                token=app.config['METRICS_TOKEN'],
+                allow_local=app.config['METRICS_ALLOW_LOCAL']
+            )
 
     # Import models so they are registered with SQLAlchemy
     from app import models  # noqa: F401
 
+    # jsonify/app.json with serializers compiled once per listed type
+    from app.projections import EntryRow, RegistrationRow
+    app.json = FastJSONProvider(app, backend=app.config['JSON_BACKEND'])
+    app.json.register(models.Entry, models.Registration, EntryRow, RegistrationRow)
+
+    # Entry count for the demo page (exact, cached or estimated)
+    from app.services.entry_count import EntryCountProvider
+    app.extensions['entry_count'] = EntryCountProvider(
+        mode=app.config['ENTRY_COUNT_MODE'],
+        reconcile_interval=app.config['ENTRY_COUNT_RECONCILE_SECONDS'],
+        estimate_threshold=app.config['ENTRY_COUNT_ESTIMATE_THRESHOLD']
+    )
+
+    # Opt-in group commit for new entries (see app.write_buffer)
+    if app.config['ENTRY_WRITE_BUFFER']:
+        from app.models.entry import Entry
+        metrics = app.extensions.get('metrics')
+        app.extensions['entry_buffer'] = GroupCommitBuffer(
+            app, Entry.__table__,
+            flush_interval=app.config['ENTRY_BUFFER_FLUSH_MS'] / 1000,
+            max_rows=app.config['ENTRY_BUFFER_MAX_ROWS'],
+            durability=app.config['ENTRY_BUFFER_DURABILITY'],
+            queue_limit=app.config['ENTRY_BUFFER_QUEUE_LIMIT'],
+            on_flush=app.extensions['entry_count'].increment,
+            metrics=metrics.registry if metrics else None
+        )
+
+    # Live registration counts for /admin/attendees (see app.live_stats)
+    if app.config['LIVE_STATS_ENABLED']:
+        from app.live_stats import FileChannel, LiveStatsFeed, LocalChannel
+        from app.services.registration_service import RegistrationService
+        channel_path = app.config['LIVE_STATS_CHANNEL']
+        app.extensions['live_stats'] = LiveStatsFeed(
+            app, FileChannel(channel_path) if channel_path else LocalChannel(),
+            RegistrationService.get_live_counts,
+            poll_interval=app.config['LIVE_STATS_POLL_SECONDS'],
+            min_interval=app.config['LIVE_STATS_MIN_INTERVAL_SECONDS'],
+            max_listeners=app.config['LIVE_STATS_MAX_LISTENERS']
+        )
+
     # Register blueprints
     from app.routes import register_blueprints
     register_blueprints(app)
@@ -56,21 +139,12 @@ def create_app(config_name='development'):
     from app.cli import register_commands
     register_commands(app)
 
-    # Auto-create database tables in production (safe for container deployments)
-    if config_name == 'production':
+    # Create tables and the admin user once per schema version, not per worker
+    if config_name == 'production' and app.config['STARTUP_TASKS_ON_BOOT']:
+        from app.startup import run_startup_tasks
         with app.app_context():
-            db.create_all()
-            # Auto-create admin user if none exists and ADMIN_PASSWORD is set
-            import os
-            admin_password = os.environ.get('ADMIN_PASSWORD')
-            if admin_password:
-                from app.models import User
-                if not User.query.filter_by(username='admin').first():
-                    try:
-                        AuthService.create_user('admin', admin_password)
-                        app.logger.info('Default admin user created')
-                    except Exception as e:
-                        app.logger.warning(f'Could not create admin user: {e}')
+            run_startup_tasks(app)
+            db.session.remove()
 
     return app
 
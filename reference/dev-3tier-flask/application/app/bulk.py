@@ -0,0 +1,65 @@
+"""Bulk inserts through the database driver's fastest path.
+
+SQLAlchemy's Core executemany turns every row into a parameter dict and
+runs each value through the column type's bind processor. For the bulk
+import and flask seed that bookkeeping costs more than the insert itself,
+so rows are handed to the driver directly as tuples:
+
+- PostgreSQL (psycopg2): COPY ... FROM STDIN
+- SQL Server (pyodbc): executemany with fast_executemany enabled
+- SQLite: sqlite3 executemany, with datetimes formatted the way
+  SQLAlchemy's SQLite DateTime type stores them
+- Anything else: SQLAlchemy Core executemany
+"""
+import csv
+import io
+from sqlalchemy import DateTime, insert
+
+
+def insert_rows(connection, table, columns, rows):
+    """Insert rows given as tuples of values in ``columns`` order.
+
+    Args:
+        connection: SQLAlchemy connection (e.g. db.session.connection()),
+            so the rows are part of its transaction
+        table: Table to insert into
+        columns: Column names matching the tuple positions
+        rows: List of tuples
+    """
+    dialect = connection.dialect
+    column_list = ', '.join(columns)
+
+    if dialect.name == 'postgresql' and dialect.driver == 'psycopg2':
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        connection.connection.cursor().copy_expert(
+            f'COPY {table.name} ({column_list}) FROM STDIN WITH (FORMAT csv)', buffer
+        )
+    elif dialect.name == 'mssql' and dialect.driver == 'pyodbc':
+        cursor = connection.connection.cursor()
+        cursor.fast_executemany = True
+        cursor.executemany(
+            f"INSERT INTO {table.name} ({column_list}) VALUES ({', '.join('?' for _ in columns)})",
+            rows
+        )
+    elif dialect.name == 'sqlite':
+        dates = [i for i, name in enumerate(columns) if isinstance(table.c[name].type, DateTime)]
+        if dates and rows:
+            rows = _sqlite_dates(rows, dates)
+        connection.connection.cursor().executemany(
+            f"INSERT INTO {table.name} ({column_list}) VALUES ({', '.join('?' for _ in columns)})",
+            rows
+        )
+    else:
+        connection.execute(insert(table), [dict(zip(columns, row)) for row in rows])
+
+
+def _sqlite_dates(rows, positions):
+    # Convert column by column: transposing with zip() is cheaper than
+    # rebuilding every row tuple in Python
+    values = list(zip(*rows))
+    for i in positions:
+        values[i] = [None if value is None else value.isoformat(' ', 'microseconds')
+                     for value in values[i]]
+    return list(zip(*values))
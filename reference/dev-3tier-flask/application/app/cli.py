@@ -1,8 +1,19 @@
 """Flask CLI commands for application management."""
+import csv
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 import click
+from flask import current_app
 from flask.cli import with_appcontext
 from app.extensions import db
+from app.loadtest import (DEFAULT_MIX, HttpClient, LoadTest, WsgiClient, format_report,
+                          parse_mix)
+from app.seed import seed_database
+from app.passwords import PasswordVerifier, PasswordVerifierBusyError
 from app.services.auth_service import AuthService, DuplicateUsernameError
+from app.services.registration_service import RegistrationService
+from app.startup import run_startup_tasks, schema_version
 
 
 @click.command('init-db')
@@ -20,6 +31,30 @@ def init_db_command():
     click.echo('Database tables created successfully.')
 
 
+@click.command('startup')
+@click.option('--force', is_flag=True,
+              help='Run the tasks even if this schema version was already applied.')
+@with_appcontext
+def startup_command(force):
+    """Run the one-time startup tasks (create tables, bootstrap admin).
+
+    Does nothing if the recorded schema version already matches, so it is
+    safe to run on every deployment. Production workers run the same tasks
+    on boot unless STARTUP_TASKS_ON_BOOT is false.
+
+    Example usage:
+        flask startup
+        flask startup --force
+    """
+    timings = run_startup_tasks(current_app, force=force)
+    if timings is None:
+        click.echo(f'Startup tasks already applied (version {schema_version(current_app)}).')
+        return
+    for name, ms in timings.items():
+        click.echo(f'{name:<20} {ms:>9.1f} ms')
+    click.echo(f'Startup tasks completed (version {schema_version(current_app)}).')
+
+
 @click.command('create-admin')
 @click.argument('username')
 @click.option('--password', '-p', default=None,
@@ -56,7 +91,249 @@ def create_admin_command(username, password):
         raise SystemExit(1)
 
 
+@click.command('rebuild-stats')
+@with_appcontext
+def rebuild_stats_command():
+    """Rebuild the daily registration statistics and analytics sketches.
+
+    Both are normally kept up to date as registrations are created.
+    Run this after importing data outside the application, or whenever
+    the admin statistics disagree with the registrations table.
+
+    Example usage:
+        flask rebuild-stats
+    """
+    days = RegistrationService.rebuild_daily_stats()
+    distinct = RegistrationService.rebuild_sketches()
+    click.echo(f'Registration statistics rebuilt ({days} days).')
+    click.echo(f"Analytics sketches rebuilt (~{distinct['company']} companies, "
+               f"~{distinct['job_title']} job titles).")
+
+
+# CSV headers accepted by import-registrations, including those written by
+# /admin/export/csv, mapped to Registration columns
+IMPORT_HEADER_MAP = {
+    'name': 'name',
+    'email': 'email',
+    'company': 'company',
+    'job_title': 'job_title',
+    'job title': 'job_title',
+    'created_at': 'created_at',
+    'registered at': 'created_at',
+}
+
+
+@click.command('import-registrations')
+@click.argument('file', type=click.File('r', encoding='utf-8-sig'))
+@click.option('--batch-size', '-b', default=1000, show_default=True,
+              type=click.IntRange(1, 2000),
+              help='Rows per INSERT batch and transaction.')
+@with_appcontext
+def import_registrations_command(file, batch_size):
+    """Bulk import registrations from a CSV file.
+
+    FILE: CSV with a header row containing name, email, company and
+    job_title (and optionally created_at). Files produced by
+    /admin/export/csv can be imported as-is.
+
+    Emails are normalized like the registration form does. Rows whose
+    email already exists, or repeats within the file, are skipped.
+
+    Example usage:
+        flask import-registrations attendees.csv
+        flask import-registrations attendees.csv --batch-size 500
+    """
+    reader = csv.DictReader(file)
+    fields = {h: IMPORT_HEADER_MAP.get(h.strip().lower()) for h in reader.fieldnames or []}
+    missing = {'name', 'email', 'company', 'job_title'} - set(fields.values())
+    if missing:
+        click.echo(f"Error: Missing column(s): {', '.join(sorted(missing))}.", err=True)
+        raise SystemExit(1)
+
+    rows = (
+        {fields[k]: v for k, v in row.items() if fields.get(k)}
+        for row in reader
+    )
+
+    start = time.perf_counter()
+    result = RegistrationService.import_registrations(rows, batch_size=batch_size)
+    elapsed = time.perf_counter() - start
+
+    rate = result['inserted'] / elapsed if elapsed else 0
+    click.echo(
+        f"Imported {result['inserted']} registrations in {elapsed:.2f}s "
+        f"({rate:,.0f} rows/s); skipped {result['duplicates']} duplicate(s) "
+        f"and {result['invalid']} invalid row(s)."
+    )
+
+
+@click.command('seed')
+@click.option('--registrations', '-r', default=0, show_default=True, type=click.IntRange(0),
+              help='Registrations to insert.')
+@click.option('--entries', '-e', default=0, show_default=True, type=click.IntRange(0),
+              help='Entries to insert.')
+@click.option('--users', '-u', default=0, show_default=True, type=click.IntRange(0),
+              help='Admin users (loadtest0, loadtest1, ...) to insert.')
+@click.option('--seed', '-s', 'seed', default=0, show_default=True, type=int,
+              help='Random seed; the same seed produces the same rows.')
+@click.option('--days', default=90, show_default=True, type=click.IntRange(1),
+              help='Days the created_at values are spread over.')
+@click.option('--end', type=click.DateTime(formats=['%Y-%m-%d']), default=None,
+              help='Date of the newest rows (UTC). Defaults to today; set it for '
+                   'identical rows across days.')
+@click.option('--user-password', default='loadtest-password', show_default=True,
+              help='Password shared by the seeded users.')
+@click.option('--batch-size', '-b', default=10000, show_default=True,
+              type=click.IntRange(1, 100000), help='Rows per executemany.')
+@with_appcontext
+def seed_command(registrations, entries, users, seed, days, end, user_password, batch_size):
+    """Insert deterministic synthetic data for load testing.
+
+    Rows are written with bulk inserts in large transactions, bypassing the
+    per-row services, then the registration statistics and the entry count
+    are rebuilt. Existing rows are kept; new emails and usernames continue
+    after them. Do not run this against production.
+
+    Example usage:
+        flask seed --registrations 100000 --entries 100000
+        flask seed -r 1000000 -u 50 --seed 42 --end 2025-06-01
+    """
+    if not (registrations or entries or users):
+        click.echo('Nothing to seed: pass --registrations, --entries and/or --users.', err=True)
+        raise SystemExit(1)
+
+    timings = seed_database(registrations=registrations, entries=entries, users=users,
+                            seed=seed, days=days, end=end, user_password=user_password,
+                            batch_size=batch_size)
+    for table, (rows, seconds) in timings.items():
+        rate = rows / seconds if seconds else 0
+        click.echo(f'{table:<20} {rows:>10,} rows in {seconds:6.2f}s ({rate:,.0f} rows/s)')
+
+
+@click.command('loadtest')
+@click.option('--url', default=None,
+              help='Base URL of a running instance, e.g. http://localhost:8000. '
+                   'Without it, requests go to this app in-process.')
+@click.option('--mix', '-m', 'mix_specs', multiple=True,
+              help="Weighted request, e.g. '70:GET /' (repeatable). "
+                   f"Default: {', '.join(DEFAULT_MIX)}.")
+@click.option('--concurrency', '-c', default=10, show_default=True, type=click.IntRange(1),
+              help='Concurrent visitors.')
+@click.option('--duration', '-d', default=10.0, show_default=True, type=click.FloatRange(0.1),
+              help='Seconds to run.')
+@click.option('--requests', '-n', 'max_requests', default=None, type=click.IntRange(1),
+              help='Stop after this many requests.')
+@click.option('--seed', default=None, type=int, help='Seed for a repeatable request order.')
+@click.option('--json', 'as_json', is_flag=True, help='Print the report as JSON.')
+@with_appcontext
+def loadtest_command(url, mix_specs, concurrency, duration, max_requests, seed, as_json):
+    """Run a weighted request mix and report latency per endpoint.
+
+    Each visitor keeps its own cookies and sends the CSRF token from the
+    form with every POST. Registrations use unique emails, so run it
+    against a throwaway database.
+
+    Example usage:
+        flask loadtest --url http://localhost:8000 -c 20 -d 30
+        flask loadtest -m '80:GET /' -m '20:POST /register' -n 2000
+    """
+    try:
+        mix = parse_mix(mix_specs or DEFAULT_MIX)
+    except ValueError as e:
+        click.echo(f'Error: {e}', err=True)
+        raise SystemExit(1)
+
+    if url:
+        def client_factory():
+            return HttpClient(url)
+    else:
+        app = current_app._get_current_object()
+
+        def client_factory():
+            return WsgiClient(app)
+
+    target = url or 'in-process'
+    click.echo(f'Load testing {target} with {concurrency} visitors...', err=True)
+    load = LoadTest(client_factory, mix, concurrency=concurrency, duration=duration,
+                    max_requests=max_requests, seed=seed)
+    report = load.run()
+
+    if as_json:
+        click.echo(json.dumps(report, indent=2))
+    else:
+        click.echo(format_report(report))
+
+
+# Cost settings compared by benchmark-passwords when no --method is given
+BENCHMARK_HASH_METHODS = [
+    'pbkdf2:sha256:100000',
+    'pbkdf2:sha256:600000',
+    'scrypt:16384:8:1',
+    'scrypt:32768:8:1',
+    'scrypt:65536:8:1',
+]
+
+
+@click.command('benchmark-passwords')
+@click.option('--method', '-m', 'methods', multiple=True,
+              help='Werkzeug hash method to measure (repeatable). '
+                   'Defaults to a range of pbkdf2 and scrypt costs.')
+@click.option('--clients', '-c', default=8, show_default=True, type=click.IntRange(1),
+              help='Concurrent login attempts.')
+@click.option('--duration', '-d', default=3.0, show_default=True, type=click.FloatRange(0.1),
+              help='Seconds to run each method.')
+@with_appcontext
+def benchmark_passwords_command(methods, clients, duration):
+    """Measure logins per second for each password hash cost setting.
+
+    Runs CLIENTS concurrent callers against a PasswordVerifier configured
+    like the application (PASSWORD_VERIFY_WORKERS, PASSWORD_VERIFY_QUEUE_LIMIT)
+    and reports accepted and rejected verifications per second. Use it to
+    choose PASSWORD_HASH_METHOD for a given VM or container size.
+
+    Example usage:
+        flask benchmark-passwords
+        flask benchmark-passwords -m scrypt:32768:8:1 -m pbkdf2:sha256:600000 -c 16
+    """
+    config = current_app.config
+    click.echo(f"{'method':<24} {'logins/s':>10} {'rejected/s':>11} {'ms/login':>9}")
+
+    for method in methods or BENCHMARK_HASH_METHODS:
+        verifier = PasswordVerifier(
+            method,
+            workers=config['PASSWORD_VERIFY_WORKERS'],
+            queue_limit=config['PASSWORD_VERIFY_QUEUE_LIMIT'],
+            timeout=config['PASSWORD_VERIFY_TIMEOUT']
+        )
+        pwhash = verifier.hash('benchmark-password')
+        deadline = time.perf_counter() + duration
+
+        def attempt_logins():
+            while time.perf_counter() < deadline:
+                try:
+                    verifier.verify(pwhash, 'benchmark-password')
+                except PasswordVerifierBusyError:
+                    time.sleep(0.001)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            for _ in range(clients):
+                pool.submit(attempt_logins)
+        elapsed = time.perf_counter() - start
+
+        rate = verifier.verified / elapsed
+        ms_per_login = 1000 * elapsed / verifier.verified if verifier.verified else 0
+        click.echo(f'{method:<24} {rate:>10.1f} {verifier.rejected / elapsed:>11.1f} '
+                   f'{ms_per_login:>9.1f}')
+
+
 def register_commands(app):
     """Register CLI commands with the Flask application."""
     app.cli.add_command(init_db_command)
+    app.cli.add_command(startup_command)
     app.cli.add_command(create_admin_command)
+    app.cli.add_command(rebuild_stats_command)
+    app.cli.add_command(import_registrations_command)
+    app.cli.add_command(seed_command)
+    app.cli.add_command(loadtest_command)
+    app.cli.add_command(benchmark_passwords_command)
@@ -0,0 +1,256 @@
+"""JSON provider with precompiled per-model serializers.
+
+Flask's default provider sends every object through json.dumps, with
+to_dict() building a dictionary per row and calling isoformat() on every
+timestamp first. FastJSONProvider (installed as ``app.json``, so jsonify
+uses it too) does three things differently:
+
+- Types registered with register() get a serializer generated once at
+  startup: straight-line code that reads the type's columns in order (by
+  index for row tuples), with no per-row loop over fields.
+- When orjson is installed it encodes (and decodes) instead of the
+  standard library json, and writes datetimes itself. Without orjson the
+  standard library is used and the serializers call isoformat().
+- iter_encode() yields a JSON array or NDJSON in chunks from any iterable,
+  so a large result is never held as one string.
+
+Both backends produce the same JSON: keys in insertion order, UTF-8 rather
+than \\u escapes, and datetimes as ISO 8601 (the format of the models'
+to_dict()), where Flask's default uses RFC 822 dates and sorts keys.
+"""
+import json
+from datetime import date
+from itertools import islice
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import Date, DateTime
+
+try:
+    import orjson
+except ImportError:  # Optional; the standard library json is used instead
+    orjson = None
+
+BACKENDS = ('auto', 'orjson', 'json')
+
+# Items encoded per chunk yielded by iter_encode()
+CHUNK_SIZE = 500
+
+
+def column_types(cls):
+    """Map field names to SQLAlchemy column types for a model or row type.
+
+    Args:
+        cls: Mapped model class, or a row type (app.projections) with
+            ``_fields`` and matching ``COLUMNS``
+
+    Returns:
+        dict: Field name to column type, in column order
+    """
+    if hasattr(cls, '__table__'):
+        return {column.key: column.type for column in cls.__table__.columns}
+    return {name: column.type for name, column in zip(cls._fields, cls.COLUMNS)}
+
+
+def compile_serializer(cls, fields=None, native_datetimes=False):
+    """Generate a function converting one ``cls`` object to a dictionary.
+
+    Args:
+        cls: Model class or row type
+        fields: Field names to include (default: every column)
+        native_datetimes: Leave datetime values as they are, for an encoder
+            that writes them itself; otherwise call isoformat()
+
+    Returns:
+        function: serialize(obj) -> dict
+
+    Raises:
+        ValueError: If a field is not a column of ``cls``
+    """
+    types = column_types(cls)
+    fields = list(fields or types)
+    unknown = [name for name in fields if name not in types or not name.isidentifier()]
+    if unknown:
+        raise ValueError(f"{cls.__name__} has no column(s) {', '.join(unknown)}.")
+
+    positions = {name: i for i, name in enumerate(getattr(cls, '_fields', ()))}
+    lines, items = [], []
+    for name in fields:
+        read = f'obj[{positions[name]}]' if name in positions else f'obj.{name}'
+        if native_datetimes or not isinstance(types[name], (DateTime, Date)):
+            items.append(f'{name!r}: {read}')
+        else:
+            lines.append(f'    {name} = {read}')
+            items.append(f'{name!r}: None if {name} is None else {name}.isoformat()')
+    function = f'serialize_{cls.__name__}'
+    source = '\n'.join([f'def {function}(obj):', *lines,
+                        f"    return {{{', '.join(items)}}}"])
+    namespace = {}
+    exec(compile(source, f'<{function}>', 'exec'), namespace)
+    return namespace[function]
+
+
+def _batched(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider using orjson when available and compiled serializers."""
+
+    sort_keys = False
+    ensure_ascii = False
+
+    def __init__(self, app, backend='auto'):
+        """Create the provider; assign it to ``app.json``.
+
+        Args:
+            app: Flask application
+            backend: 'orjson', 'json' (standard library) or 'auto' (orjson
+                if installed)
+
+        Raises:
+            ValueError: If backend is unknown, or 'orjson' is not installed
+        """
+        super().__init__(app)
+        if backend not in BACKENDS:
+            raise ValueError(f"JSON_BACKEND must be one of {', '.join(BACKENDS)}.")
+        if backend == 'orjson' and orjson is None:
+            raise ValueError("JSON_BACKEND is 'orjson' but orjson is not installed.")
+        self.backend = 'orjson' if orjson is not None and backend != 'json' else 'json'
+        self._serializers = {}
+
+    def register(self, *types, fields=None):
+        """Compile serializers for model classes or row types.
+
+        Registered objects can then be passed to jsonify(), dumps() and
+        iter_encode() directly, without calling to_dict().
+
+        Args:
+            *types: Model classes or row types
+            fields: Field names to include (default: every column)
+        """
+        for cls in types:
+            self._serializers[cls] = compile_serializer(
+                cls, fields, native_datetimes=self.backend == 'orjson'
+            )
+
+    def default(self, o):
+        """Convert objects the encoder does not know natively."""
+        serializer = self._serializers.get(type(o))
+        if serializer is not None:
+            return serializer(o)
+        if isinstance(o, date):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+    def _convert(self, obj):
+        # The standard library encodes tuples (and so row tuples) as arrays
+        # before consulting default(); convert registered ones up front, at
+        # any depth, the way orjson reaches them through default()
+        serializers = self._serializers
+        if not serializers:
+            return obj
+
+        def convert(value):
+            serializer = serializers.get(type(value))
+            if serializer is not None:
+                return serializer(value)
+            if isinstance(value, dict):
+                return {key: convert(item) for key, item in value.items()}
+            if isinstance(value, (list, tuple)):
+                return [convert(item) for item in value]
+            return value
+
+        return convert(obj)
+
+    def _orjson_option(self, kwargs):
+        # Translate the json.dumps arguments Flask passes; None if unsupported
+        option = orjson.OPT_NON_STR_KEYS
+        for key, value in kwargs.items():
+            if key == 'indent':
+                option |= orjson.OPT_INDENT_2 if value else 0
+            elif key == 'sort_keys':
+                option |= orjson.OPT_SORT_KEYS if value else 0
+            elif key not in ('separators', 'ensure_ascii'):
+                return None
+        return option
+
+    def dumps(self, obj, **kwargs):
+        """Serialize ``obj`` to a JSON string.
+
+        Arguments orjson cannot honour (e.g. ``cls``) fall back to the
+        standard library.
+        """
+        if self.backend == 'orjson':
+            option = self._orjson_option(kwargs)
+            if option is not None:
+                return orjson.dumps(obj, default=self.default, option=option).decode()
+        return super().dumps(self._convert(obj), **kwargs)
+
+    def loads(self, s, **kwargs):
+        """Deserialize JSON from a string or UTF-8 bytes.
+
+        Raises:
+            json.JSONDecodeError: If ``s`` is not valid JSON (orjson's
+                error is a subclass)
+        """
+        if self.backend == 'orjson' and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        """Serialize the arguments into an ``application/json`` response."""
+        if self.backend != 'orjson':
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        option = orjson.OPT_NON_STR_KEYS
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+        body = orjson.dumps(obj, default=self.default, option=option | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+    def _compact_dumps(self):
+        """Return a function encoding a converted value to compact JSON bytes."""
+        if self.backend == 'orjson':
+            default, option = self.default, orjson.OPT_NON_STR_KEYS
+            return lambda obj: orjson.dumps(obj, default=default, option=option)
+        encoder = json.JSONEncoder(default=self.default, ensure_ascii=False,
+                                   separators=(',', ':'))
+        return lambda obj: encoder.encode(obj).encode()
+
+    def iter_encode(self, items, ndjson=False, chunk_size=CHUNK_SIZE):
+        """Encode an iterable as a JSON array or NDJSON, chunk by chunk.
+
+        Items are consumed lazily, so with a streaming source (e.g.
+        EntryService.iter_entries) memory stays bounded by ``chunk_size``.
+        Each array chunk is encoded by one encoder call.
+
+        Args:
+            items: Iterable of JSON-serializable or registered objects
+            ndjson: One object per line instead of a JSON array
+            chunk_size: Items encoded per yielded chunk
+
+        Yields:
+            bytes: Consecutive pieces of the document
+        """
+        dumps = self._compact_dumps()
+        if self.backend == 'orjson':
+            serializers = self._serializers
+
+            def convert(item):
+                serializer = serializers.get(type(item))
+                return item if serializer is None else serializer(item)
+        else:
+            convert = self._convert
+
+        chunks = _batched(map(convert, items), chunk_size)
+        if ndjson:
+            for chunk in chunks:
+                yield b'\n'.join(map(dumps, chunk)) + b'\n'
+            return
+        prefix = b'['
+        for chunk in chunks:
+            # Encode the chunk as an array and drop its brackets
+            yield prefix + dumps(chunk)[1:-1]
+            prefix = b','
+        yield b'[]' if prefix == b'[' else b']'
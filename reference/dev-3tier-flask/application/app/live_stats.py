@@ -0,0 +1,226 @@
+"""Live registration counts for the admin page (Server-Sent Events).
+
+Each open admin page holds a /admin/attendees/live stream. Instead of every
+stream querying the database, registrations are announced on a channel and
+one watcher thread per worker reloads the counts once per change and hands
+them to all of that worker's streams:
+
+    create_registration commits -> channel.publish()
+    watcher sees a new version  -> load() once -> every stream in the worker
+
+Gunicorn workers are separate processes, so the channel must be visible to
+all of them. FileChannel is a small file that publish() atomically replaces
+with a new token; watchers read it every ``poll_interval`` seconds (a
+single read of a few bytes). LocalChannel only reaches the current
+process, for tests and single-process servers.
+
+Bursts are coalesced: a watcher loads at most once per ``min_interval``
+seconds, however many registrations arrive. The watcher thread starts with
+the first stream in a worker (after gunicorn forks) and stops when the last
+one closes.
+"""
+import itertools
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class LiveStatsBusyError(Exception):
+    """Raised when a worker already serves its maximum number of streams."""
+    pass
+
+
+class FileChannel:
+    """Change notifications shared by processes through a file."""
+
+    def __init__(self, path):
+        """Create a channel.
+
+        Args:
+            path: File shared by every worker; its directory is created if
+                needed
+        """
+        self.path = path
+        self._counter = itertools.count()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def publish(self):
+        """Announce a change to every process watching this file.
+
+        Raises:
+            OSError: If the file cannot be written
+        """
+        token = f'{os.getpid()}:{time.time_ns()}:{next(self._counter)}'
+        temp = f'{self.path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temp, 'w') as f:
+            f.write(token)
+        # Atomic, so readers see the old token or the new one, never a mix
+        os.replace(temp, self.path)
+
+    def version(self):
+        """Current token, or None if nothing was published yet."""
+        try:
+            with open(self.path) as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+
+class LocalChannel:
+    """Change notifications within the current process only."""
+
+    def __init__(self):
+        self._counter = itertools.count(1)
+        self._version = 0
+
+    def publish(self):
+        """Announce a change."""
+        self._version = next(self._counter)
+
+    def version(self):
+        """Current version number."""
+        return self._version
+
+
+class LiveStatsFeed:
+    """Fans out counts loaded once per change to this worker's streams."""
+
+    def __init__(self, app, channel, load, poll_interval=0.5, min_interval=1.0,
+                 max_listeners=8):
+        """Create a feed.
+
+        Args:
+            app: Flask application, used for an app context in the watcher
+            channel: FileChannel or LocalChannel
+            load: Callable returning the payload (a JSON-serializable dict);
+                runs in the watcher thread inside an app context
+            poll_interval: Seconds between checks of the channel
+            min_interval: Minimum seconds between two loads
+            max_listeners: Streams this worker serves at once; each holds a
+                worker thread for as long as the page is open
+        """
+        self.app = app
+        self.channel = channel
+        self.load = load
+        self.poll_interval = poll_interval
+        self.min_interval = min_interval
+        self.max_listeners = max_listeners
+        self._condition = threading.Condition()
+        self._wake = threading.Event()
+        self._thread = None
+        self._listeners = 0
+        self._sequence = 0
+        self._payload = None
+        self.loads = 0
+        self.rejected = 0
+
+    def publish(self):
+        """Announce that the counts changed; never raises.
+
+        Called after a commit, so a channel error is logged rather than
+        failing the registration.
+        """
+        try:
+            self.channel.publish()
+        except OSError:
+            logger.warning('Could not publish live stats change', exc_info=True)
+        # Streams in this worker need not wait for the next poll
+        self._wake.set()
+
+    def subscribe(self):
+        """Register a stream.
+
+        Returns:
+            LiveStatsSubscription: Iterate with events(); close() when done
+
+        Raises:
+            LiveStatsBusyError: If max_listeners streams are already open
+        """
+        with self._condition:
+            if self._listeners >= self.max_listeners:
+                self.rejected += 1
+                raise LiveStatsBusyError(
+                    f'{self._listeners} live stats streams already open in this worker.'
+                )
+            self._listeners += 1
+            if self._thread is None:
+                # Read now, so a change right after the caller's initial
+                # load is not missed
+                self._thread = threading.Thread(target=self._watch, name='live-stats',
+                                                args=(self.channel.version(),), daemon=True)
+                self._thread.start()
+            return LiveStatsSubscription(self, self._sequence)
+
+    def _unsubscribe(self):
+        with self._condition:
+            self._listeners -= 1
+        self._wake.set()
+
+    def _watch(self, seen):
+        while True:
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            with self._condition:
+                if self._listeners == 0:
+                    self._thread = None
+                    return
+            version = self.channel.version()
+            if version == seen:
+                continue
+            seen = version
+            try:
+                with self.app.app_context():
+                    payload = self.load()
+            except Exception:
+                logger.exception('Loading live stats failed')
+                continue
+            with self._condition:
+                self.loads += 1
+                self._payload = payload
+                self._sequence += 1
+                self._condition.notify_all()
+            # Coalesce bursts: changes meanwhile are picked up by one load
+            time.sleep(self.min_interval)
+
+    def stats(self):
+        """Open streams, loads and rejected streams for this worker."""
+        with self._condition:
+            return {'listeners': self._listeners, 'loads': self.loads,
+                    'rejected': self.rejected}
+
+
+class LiveStatsSubscription:
+    """One stream's view of a LiveStatsFeed."""
+
+    def __init__(self, feed, sequence):
+        self._feed = feed
+        self._sequence = sequence
+        self._closed = False
+
+    def events(self, duration, keepalive=15):
+        """Yield each new payload, or None when ``keepalive`` seconds pass quietly.
+
+        Args:
+            duration: Seconds after which the iteration ends (the client
+                reconnects), so a stream never holds a thread indefinitely
+            keepalive: Longest wait before yielding None
+        """
+        feed = self._feed
+        deadline = time.monotonic() + duration
+        while (remaining := deadline - time.monotonic()) > 0:
+            with feed._condition:
+                changed = feed._condition.wait_for(
+                    lambda: feed._sequence != self._sequence, timeout=min(keepalive, remaining)
+                )
+                self._sequence = feed._sequence
+                payload = feed._payload
+            yield payload if changed else None
+
+    def close(self):
+        """Release the stream's slot; safe to call more than once."""
+        if not self._closed:
+            self._closed = True
+            self._feed._unsubscribe()
@@ -0,0 +1,270 @@
+"""HTTP load generator behind flask loadtest.
+
+A pool of threads, each acting as one visitor with its own cookie jar,
+picks requests from a weighted mix and records the status and latency of
+each. Requests go to a running server over HTTP, or straight into the
+application through the Flask test client when no URL is given.
+
+Form posts fetch the form first and send back its CSRF token, like a
+browser would; only the POST itself is timed. A form post only counts as
+a success when it redirects, since a rejected form is re-rendered with
+200. Emails are unique per run, so POST /register succeeds every time.
+"""
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import CookieJar
+from random import Random
+from urllib import error, parse, request
+
+DEFAULT_MIX = ['70:GET /', '20:GET /register', '10:POST /register']
+
+CSRF_TOKEN_RE = re.compile(r'name="csrf_token"[^>]*value="([^"]+)"')
+
+
+def _registration_form(number, run_id):
+    return {
+        'name': f'Load Test {number}',
+        'email': f'loadtest-{run_id}-{number}@example.com',
+        'company': 'Load Test Corp',
+        'job_title': 'Tester',
+    }
+
+
+def _entry_form(number, run_id):
+    return {'value': f'Load test entry {run_id}-{number}'}
+
+
+# Form data for the POST routes the load test knows how to fill in
+POST_FORMS = {
+    '/register': _registration_form,
+    '/demo/': _entry_form,
+}
+
+
+def parse_mix(specs):
+    """Parse request mix specs like ``'70:GET /'``.
+
+    Args:
+        specs: Iterable of 'WEIGHT:METHOD PATH' strings
+
+    Returns:
+        list: (weight, method, path) tuples
+
+    Raises:
+        ValueError: If a spec is malformed or posts to an unknown form
+    """
+    mix = []
+    for spec in specs:
+        try:
+            weight, request_line = spec.split(':', 1)
+            method, path = request_line.split()
+            weight = float(weight)
+        except ValueError:
+            raise ValueError(f"Invalid mix entry '{spec}', expected e.g. '70:GET /'.")
+        method = method.upper()
+        if weight <= 0:
+            raise ValueError(f"Weight must be positive in '{spec}'.")
+        if method not in ('GET', 'POST'):
+            raise ValueError(f"Unsupported method in '{spec}', use GET or POST.")
+        if method == 'POST' and path not in POST_FORMS:
+            raise ValueError(f"No form data for POST {path}; supported: "
+                             f"{', '.join(sorted(POST_FORMS))}.")
+        mix.append((weight, method, path))
+    return mix
+
+
+class _NoRedirect(request.HTTPRedirectHandler):
+    """Report redirects as responses instead of following them."""
+
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HttpClient:
+    """Client for a running server, keeping cookies like a browser."""
+
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self._opener = request.build_opener(request.HTTPCookieProcessor(CookieJar()),
+                                            _NoRedirect())
+
+    def request(self, method, path, data=None):
+        """Send one request.
+
+        Returns:
+            tuple: (status code, response body as text)
+        """
+        body = parse.urlencode(data).encode() if data is not None else None
+        req = request.Request(self.base_url + path, data=body, method=method)
+        try:
+            with self._opener.open(req, timeout=self.timeout) as response:
+                return response.status, response.read().decode('utf-8', 'replace')
+        except error.HTTPError as e:
+            return e.code, e.read().decode('utf-8', 'replace')
+
+
+class WsgiClient:
+    """Client calling the application in-process through the test client."""
+
+    def __init__(self, app):
+        self._client = app.test_client()
+
+    def request(self, method, path, data=None):
+        """Send one request.
+
+        Returns:
+            tuple: (status code, response body as text)
+        """
+        response = self._client.open(path, method=method, data=data)
+        return response.status_code, response.get_data(as_text=True)
+
+
+class LoadTest:
+    """Runs a weighted request mix at a fixed concurrency."""
+
+    def __init__(self, client_factory, mix, concurrency=10, duration=10.0,
+                 max_requests=None, seed=None):
+        """Configure the run.
+
+        Args:
+            client_factory: Callable returning a new client per visitor
+            mix: List of (weight, method, path) from parse_mix
+            concurrency: Concurrent visitors (threads)
+            duration: Seconds to run
+            max_requests: Stop after this many timed requests, if set
+            seed: Seed for the request choice, for repeatable mixes
+        """
+        self.client_factory = client_factory
+        self.mix = mix
+        self.concurrency = concurrency
+        self.duration = duration
+        self.max_requests = max_requests
+        self.seed = seed
+        self.run_id = uuid.uuid4().hex[:8]
+        self._lock = threading.Lock()
+        self._issued = 0
+        self._results = {}
+        self.elapsed = 0.0
+
+    def _claim(self):
+        """Reserve the next request number, or None when the run is over."""
+        with self._lock:
+            if self.max_requests is not None and self._issued >= self.max_requests:
+                return None
+            self._issued += 1
+            return self._issued
+
+    def _record(self, label, status, seconds, expect_redirect=False):
+        failed = (status is None or status >= 400
+                  or (expect_redirect and not 300 <= status < 400))
+        with self._lock:
+            result = self._results.setdefault(label, {'latencies': [], 'errors': 0,
+                                                      'statuses': {}})
+            result['latencies'].append(seconds)
+            key = 'failed' if status is None else str(status)
+            result['statuses'][key] = result['statuses'].get(key, 0) + 1
+            if failed:
+                result['errors'] += 1
+
+    def _visitor(self, index, deadline):
+        client = self.client_factory()
+        rng = Random(None if self.seed is None else f'{self.seed}:{index}')
+        weights = [weight for weight, _, _ in self.mix]
+
+        while time.perf_counter() < deadline:
+            number = self._claim()
+            if number is None:
+                return
+            _, method, path = rng.choices(self.mix, weights=weights)[0]
+            label = f'{method} {path}'
+            data = None
+            start = time.perf_counter()
+            try:
+                if method == 'POST':
+                    data = POST_FORMS[path](number, self.run_id)
+                    _, form = client.request('GET', path)
+                    token = CSRF_TOKEN_RE.search(form)
+                    if token:
+                        data['csrf_token'] = token.group(1)
+                start = time.perf_counter()
+                status, _ = client.request(method, path, data)
+            except OSError:
+                status = None  # Connection refused, reset or timed out
+            self._record(label, status, time.perf_counter() - start,
+                         expect_redirect=method == 'POST')
+
+    def run(self):
+        """Run the load test until the duration or request limit is reached.
+
+        Returns:
+            dict: Per-endpoint results, see report()
+        """
+        start = time.perf_counter()
+        deadline = start + self.duration
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            futures = [pool.submit(self._visitor, i, deadline)
+                       for i in range(self.concurrency)]
+            for future in futures:
+                future.result()
+        self.elapsed = time.perf_counter() - start
+        return self.report()
+
+    def report(self):
+        """Summarize the recorded requests.
+
+        Returns:
+            dict: {label: {requests, errors, error_rate, rps, p50_ms, p95_ms,
+                p99_ms, max_ms, statuses}} plus a 'total' entry
+        """
+        report = {}
+        everything = {'latencies': [], 'errors': 0, 'statuses': {}}
+        for label in sorted(self._results):
+            result = self._results[label]
+            report[label] = self._summarize(result)
+            everything['latencies'].extend(result['latencies'])
+            everything['errors'] += result['errors']
+            for status, count in result['statuses'].items():
+                everything['statuses'][status] = everything['statuses'].get(status, 0) + count
+        report['total'] = self._summarize(everything)
+        return report
+
+    def _summarize(self, result):
+        latencies = sorted(result['latencies'])
+        count = len(latencies)
+
+        def percentile(pct):
+            if not latencies:
+                return 0.0
+            index = min(count - 1, max(0, round(pct / 100 * count) - 1))
+            return latencies[index] * 1000
+
+        return {
+            'requests': count,
+            'errors': result['errors'],
+            'error_rate': result['errors'] / count if count else 0.0,
+            'rps': count / self.elapsed if self.elapsed else 0.0,
+            'p50_ms': percentile(50),
+            'p95_ms': percentile(95),
+            'p99_ms': percentile(99),
+            'max_ms': latencies[-1] * 1000 if latencies else 0.0,
+            'statuses': dict(sorted(result['statuses'].items())),
+        }
+
+
+def format_report(report):
+    """Render a report as an aligned text table."""
+    lines = [f"{'endpoint':<22} {'requests':>8} {'req/s':>8} {'errors':>7} "
+             f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"]
+    for label, row in report.items():
+        if label == 'total':
+            lines.append('-' * len(lines[0]))
+        lines.append(
+            f"{label:<22} {row['requests']:>8} {row['rps']:>8.1f} "
+            f"{row['error_rate']:>6.1%} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} "
+            f"{row['p99_ms']:>8.1f} {row['max_ms']:>8.1f}"
+        )
+    return '\n'.join(lines)
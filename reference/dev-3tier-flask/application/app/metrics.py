@@ -0,0 +1,346 @@
+"""Request and SQL metrics in Prometheus text format.
+
+RequestMetrics records, per endpoint:
+
+- http_requests_total: requests by method and status
+- http_request_duration_seconds: latency histogram
+- http_requests_in_flight: requests currently being handled
+- http_request_sql_queries / http_request_sql_duration_seconds: SQL
+  statements and time spent in them per request (from the engine's
+  before/after_cursor_execute events)
+
+and serves them on /metrics. The endpoint answers requests from the local
+host only, or, when a ``token`` is configured, requests carrying it as
+``Authorization: Bearer <token>``. Each gunicorn worker keeps its own numbers;
+with a shared ``directory`` every worker periodically writes a snapshot
+there, and /metrics sums the snapshots of all workers. Gauges from workers
+that have exited are dropped, counters and histograms are kept.
+
+The module only depends on Flask and SQLAlchemy, so the other reference
+apps can copy it and call ``RequestMetrics(app, engine)`` unchanged.
+"""
+import hmac
+import json
+import os
+import threading
+import time
+from flask import Response, abort, g, has_request_context, request
+from sqlalchemy import event
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LOCAL_ADDRESSES = ('127.0.0.1', '::1')
+
+# A reverse proxy on the same host (nginx in the VM deployment) connects
+# from 127.0.0.1; requests it forwards carry one of these headers
+FORWARDED_HEADERS = ('Forwarded', 'X-Forwarded-For', 'X-Real-IP')
+
+METRIC_HELP = {
+    'http_requests_total': ('counter', 'HTTP requests by endpoint, method and status.'),
+    'http_request_duration_seconds': ('histogram', 'HTTP request latency.'),
+    'http_requests_in_flight': ('gauge', 'HTTP requests currently being handled.'),
+    'http_request_sql_queries': ('histogram', 'SQL statements executed per request.'),
+    'http_request_sql_duration_seconds': ('histogram', 'Time spent in SQL per request.'),
+    'write_buffer_flush_rows': ('histogram', 'Rows written per group-commit flush.'),
+    'write_buffer_flush_seconds': ('histogram', 'Group-commit flush latency.'),
+}
+
+
+class MetricsRegistry:
+    """Thread-safe counters, gauges and histograms for one process.
+
+    Series are keyed by metric name and a tuple of (label, value) pairs.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+
+    def inc(self, name, labels, amount=1):
+        """Add ``amount`` to a counter."""
+        key = (name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def add_gauge(self, name, labels, amount):
+        """Add ``amount`` (may be negative) to a gauge."""
+        key = (name, labels)
+        with self._lock:
+            self.gauges[key] = self.gauges.get(key, 0) + amount
+
+    def observe(self, name, labels, value, buckets):
+        """Record ``value`` in a histogram with the given upper bounds."""
+        key = (name, labels)
+        with self._lock:
+            series = self.histograms.get(key)
+            if series is None:
+                series = self.histograms[key] = {
+                    'buckets': list(buckets), 'counts': [0] * len(buckets), 'sum': 0.0, 'count': 0
+                }
+            for i, bound in enumerate(series['buckets']):
+                if value <= bound:
+                    series['counts'][i] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def snapshot(self):
+        """Return the current values as a JSON-serialisable dict."""
+        with self._lock:
+            return {
+                'counters': [[name, labels, value]
+                             for (name, labels), value in self.counters.items()],
+                'gauges': [[name, labels, value]
+                           for (name, labels), value in self.gauges.items()],
+                'histograms': [[name, labels, dict(series, counts=list(series['counts']))]
+                               for (name, labels), series in self.histograms.items()],
+            }
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def merge_snapshots(snapshots):
+    """Sum per-process snapshots into one.
+
+    Args:
+        snapshots: Iterable of (snapshot, alive) pairs; gauges are only
+            taken from processes that are still alive
+
+    Returns:
+        dict: counters, gauges and histograms keyed by (name, labels)
+    """
+    counters, gauges, histograms = {}, {}, {}
+    for snapshot, alive in snapshots:
+        for name, labels, value in snapshot['counters']:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        if alive:
+            for name, labels, value in snapshot['gauges']:
+                key = (name, tuple(map(tuple, labels)))
+                gauges[key] = gauges.get(key, 0) + value
+        for name, labels, series in snapshot['histograms']:
+            key = (name, tuple(map(tuple, labels)))
+            merged = histograms.get(key)
+            if merged is None:
+                histograms[key] = dict(series, counts=list(series['counts']))
+            else:
+                merged['counts'] = [a + b for a, b in zip(merged['counts'], series['counts'])]
+                merged['sum'] += series['sum']
+                merged['count'] += series['count']
+    return {'counters': counters, 'gauges': gauges, 'histograms': histograms}
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_number(value):
+    if isinstance(value, float):
+        if value == float('inf'):
+            return '+Inf'
+        return repr(value)
+    return str(value)
+
+
+def render_text(merged):
+    """Render merged metrics in the Prometheus text exposition format.
+
+    Args:
+        merged: Result of merge_snapshots
+
+    Returns:
+        str: Exposition text, one HELP/TYPE block per metric
+    """
+    series_by_name = {}
+    for kind in ('counters', 'gauges', 'histograms'):
+        for (name, labels), value in merged[kind].items():
+            series_by_name.setdefault(name, []).append((labels, value))
+
+    lines = []
+    for name in sorted(series_by_name):
+        kind, help_text = METRIC_HELP.get(name, ('untyped', name))
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in sorted(series_by_name[name], key=lambda item: item[0]):
+            if kind != 'histogram':
+                lines.append(f'{name}{_format_labels(labels)} {_format_number(value)}')
+                continue
+            for bound, count in zip(value['buckets'], value['counts']):
+                le = _format_number(float(bound))
+                lines.append(f'{name}_bucket{_format_labels(labels, [("le", le)])} {count}')
+            lines.append(f'{name}_bucket{_format_labels(labels, [("le", "+Inf")])} '
+                         f'{value["count"]}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {_format_number(value["sum"])}')
+            lines.append(f'{name}_count{_format_labels(labels)} {value["count"]}')
+    return '\n'.join(lines) + '\n'
+
+
+class RequestMetrics:
+    """Flask middleware recording request and SQL metrics, served on /metrics."""
+
+    def __init__(self, app, engine, directory=None, flush_interval=5.0,
+                 buckets=DEFAULT_BUCKETS, path='/metrics', token=None,
+                 allow_local=True):
+        """Instrument ``app`` and ``engine``.
+
+        Args:
+            app: Flask application
+            engine: SQLAlchemy Engine whose statements are counted
+            directory: Directory shared by all workers for snapshots; None
+                reports this process only
+            flush_interval: Minimum seconds between snapshot writes
+            buckets: Latency histogram upper bounds in seconds
+            path: URL the metrics are served on
+            token: Bearer token required on ``path``; None allows requests
+                from the local host only (when ``allow_local`` is set)
+            allow_local: Serve local, unproxied requests without a token
+        """
+        self.registry = MetricsRegistry()
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.token = token
+        self.allow_local = allow_local
+        self.buckets = tuple(buckets)
+        self._last_flush = 0.0
+        self._flush_lock = threading.Lock()
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        app.add_url_rule(path, 'metrics', self.metrics_view)
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    # -- request hooks ---------------------------------------------------
+
+    def _before_request(self):
+        # g can outlive a request (e.g. an app context held open by tests),
+        # so reset the per-request state explicitly
+        g._metrics_start = time.perf_counter()
+        g._metrics_status = None
+        g._metrics_sql = [0, 0.0]
+        g._metrics_endpoint = request.endpoint or 'unmatched'
+        self.registry.add_gauge('http_requests_in_flight',
+                                (('endpoint', g._metrics_endpoint),), 1)
+
+    def _after_request(self, response):
+        g._metrics_status = response.status_code
+        return response
+
+    def _teardown_request(self, exc):
+        start = g.pop('_metrics_start', None)
+        if start is None:
+            return
+        endpoint = g._metrics_endpoint
+        status = g._metrics_status or 500
+        queries, sql_seconds = g._metrics_sql
+        by_endpoint = (('endpoint', endpoint),)
+
+        registry = self.registry
+        registry.add_gauge('http_requests_in_flight', by_endpoint, -1)
+        registry.inc('http_requests_total',
+                     (('endpoint', endpoint), ('method', request.method), ('status', str(status))))
+        registry.observe('http_request_duration_seconds',
+                         (('endpoint', endpoint), ('method', request.method)),
+                         time.perf_counter() - start, self.buckets)
+        registry.observe('http_request_sql_queries', by_endpoint, queries, QUERY_COUNT_BUCKETS)
+        registry.observe('http_request_sql_duration_seconds', by_endpoint, sql_seconds,
+                         self.buckets)
+        self._maybe_flush()
+
+    # -- SQL events ------------------------------------------------------
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info['_metrics_query_start'] = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        start = conn.info.pop('_metrics_query_start', None)
+        if start is None or not has_request_context():
+            return
+        sql = g.get('_metrics_sql')
+        if sql is not None:
+            sql[0] += 1
+            sql[1] += time.perf_counter() - start
+
+    # -- multi-worker snapshots -------------------------------------------
+
+    def _snapshot_path(self, pid):
+        return os.path.join(self.directory, f'{pid}.json')
+
+    def _maybe_flush(self, force=False):
+        if not self.directory:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_flush < self.flush_interval:
+            return
+        with self._flush_lock:
+            self._last_flush = now
+            path = self._snapshot_path(os.getpid())
+            tmp_path = f'{path}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(self.registry.snapshot(), f)
+            os.replace(tmp_path, path)
+
+    def collect(self):
+        """Merge this process's metrics with the other workers' snapshots.
+
+        Returns:
+            dict: Merged counters, gauges and histograms
+        """
+        if not self.directory:
+            return merge_snapshots([(self.registry.snapshot(), True)])
+
+        self._maybe_flush(force=True)
+        snapshots = []
+        for filename in os.listdir(self.directory):
+            pid = filename[:-len('.json')]
+            if not filename.endswith('.json') or not pid.isdigit():
+                continue
+            try:
+                with open(os.path.join(self.directory, filename)) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue  # Removed or being replaced
+            snapshots.append((snapshot, _pid_alive(int(pid))))
+        return merge_snapshots(snapshots)
+
+    def _authorized(self):
+        if self.token is None:
+            return (self.allow_local and request.remote_addr in LOCAL_ADDRESSES
+                    and not any(name in request.headers for name in FORWARDED_HEADERS))
+        scheme, _, credentials = request.headers.get('Authorization', '').partition(' ')
+        return scheme.lower() == 'bearer' and hmac.compare_digest(
+            credentials.encode(), self.token.encode()
+        )
+
+    def metrics_view(self):
+        """Serve all workers' metrics in Prometheus text format.
+
+        Responds 403 to callers that neither carry the token nor connect
+        from the local host directly (proxied requests are not local).
+        """
+        if not self._authorized():
+            abort(403)
+        return Response(render_text(self.collect()), content_type=CONTENT_TYPE)
@@ -5,6 +5,10 @@ All SQLAlchemy models are exported from this package.
 
 from app.models.entry import Entry
 from app.models.registration import Registration
+from app.models.registration_sketch import RegistrationSketch, RegistrationSketchDelta
+from app.models.registration_stat import RegistrationDailyStat
+from app.models.startup_marker import StartupMarker
 from app.models.user import User
 
-__all__ = ['Entry', 'Registration', 'User']
+__all__ = ['Entry', 'Registration', 'RegistrationDailyStat', 'RegistrationSketch',
+           'RegistrationSketchDelta', 'StartupMarker', 'User']
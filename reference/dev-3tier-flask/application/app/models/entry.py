@@ -8,6 +8,10 @@ class Entry(db.Model):
     """A simple entry with a text value and timestamp."""
 
     __tablename__ = 'entries'
+    __table_args__ = (
+        # Supports keyset pagination ordered by (created_at, id)
+        db.Index('ix_entries_created_at_id', 'created_at', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     value = db.Column(db.Text, nullable=False)
@@ -1,12 +1,21 @@
 """Registration model for webinar signups."""
 from datetime import datetime, timezone
+from sqlalchemy import event
 from app.extensions import db
+from app.search import create_search_index, drop_search_index
 
 
 class Registration(db.Model):
     """Webinar registration with attendee information."""
 
     __tablename__ = 'registrations'
+    __table_args__ = (
+        # Back the sortable admin columns; id breaks ties for stable paging
+        db.Index('ix_registrations_name_id', 'name', 'id'),
+        db.Index('ix_registrations_company_id', 'company', 'id'),
+        db.Index('ix_registrations_job_title_id', 'job_title', 'id'),
+        db.Index('ix_registrations_created_at_id', 'created_at', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -28,3 +37,18 @@ class Registration(db.Model):
             'job_title': self.job_title,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
+
+
+# Full-text search index (see app.search), created and dropped with the
+# table. SQL Server's full-text DDL cannot run inside create_all's
+# transaction; the search_index startup task creates it there.
+@event.listens_for(Registration.__table__, 'after_create')
+def _create_search_index(target, connection, **kw):
+    if connection.dialect.name != 'mssql':
+        create_search_index(connection)
+
+
+@event.listens_for(Registration.__table__, 'before_drop')
+def _drop_search_index(target, connection, **kw):
+    if connection.dialect.name != 'mssql':
+        drop_search_index(connection)
@@ -0,0 +1,44 @@
+"""Persisted attendee analytics sketches."""
+from datetime import datetime, timezone
+from app.extensions import db
+
+
+class RegistrationSketch(db.Model):
+    """Serialized ColumnSketch (see app.sketches) for one registration column.
+
+    The analytics panel reads one small row per column instead of grouping
+    the registrations table. New registrations reach it through
+    RegistrationSketchDelta.
+    """
+
+    __tablename__ = 'registration_sketches'
+
+    name = db.Column(db.String(64), primary_key=True)  # Registration column summarized
+    data = db.Column(db.LargeBinary, nullable=False)
+    updated_at = db.Column(db.DateTime, nullable=False,
+                           default=lambda: datetime.now(timezone.utc),
+                           onupdate=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return f'<RegistrationSketch {self.name}>'
+
+
+class RegistrationSketchDelta(db.Model):
+    """Registrations counted but not yet folded into the sketches.
+
+    Written in the same transaction as the registrations, one row per
+    distinct value and column. Writers only insert here, so concurrent
+    registrations never wait on each other; RegistrationService folds the
+    rows into RegistrationSketch when the analytics are read, like the
+    daily rollup counts per day instead of rewriting a total.
+    """
+
+    __tablename__ = 'registration_sketch_deltas'
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(64), nullable=False)  # Registration column
+    value = db.Column(db.String(100), nullable=False)
+    amount = db.Column(db.Integer, nullable=False)
+
+    def __repr__(self):
+        return f'<RegistrationSketchDelta {self.name}={self.value!r} +{self.amount}>'
@@ -0,0 +1,19 @@
+"""Daily registration rollup for the admin statistics panel."""
+from app.extensions import db
+
+
+class RegistrationDailyStat(db.Model):
+    """Number of registrations created on one (UTC) day.
+
+    Maintained by RegistrationService.create_registration in the same
+    transaction as the registration itself, so the stats panel reads one
+    row per day instead of aggregating the registrations table.
+    """
+
+    __tablename__ = 'registration_daily_stats'
+
+    day = db.Column(db.Date, primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<RegistrationDailyStat {self.day}: {self.count}>'
@@ -0,0 +1,21 @@
+"""Record of completed one-time startup tasks."""
+from app.extensions import db
+
+
+class StartupMarker(db.Model):
+    """Outcome of the last startup task run (see app.startup).
+
+    Workers compare ``version`` with the version they would apply and skip
+    the startup tasks entirely when it matches.
+    """
+
+    __tablename__ = 'startup_markers'
+
+    name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.String(64), nullable=False)
+    completed_at = db.Column(db.DateTime, nullable=False)
+    duration_ms = db.Column(db.Integer, nullable=False, default=0)
+    steps = db.Column(db.Text, nullable=False, default='{}')
+
+    def __repr__(self):
+        return f'<StartupMarker {self.name}: {self.version}>'
@@ -21,13 +21,17 @@ class User(UserMixin, db.Model):
     def __repr__(self):
         return f'<User {self.username}>'
 
-    def set_password(self, password):
+    def set_password(self, password, method=None):
         """Hash and store password.
 
         Args:
             password: Plain text password to hash
+            method: Werkzeug hash method (defaults to Werkzeug's default)
         """
-        self.password_hash = generate_password_hash(password)
+        if method is None:
+            self.password_hash = generate_password_hash(password)
+        else:
+            self.password_hash = generate_password_hash(password, method=method)
 
     def check_password(self, password):
         """Verify password against stored hash.
@@ -0,0 +1,158 @@
+"""Rendered-page cache for static marketing pages.
+
+Pages whose output only changes when their templates change are rendered
+once per worker and served from memory afterwards, together with a gzip
+copy and a strong ETag. Conditional GETs get 304 Not Modified, and
+Cache-Control lets nginx or a CDN absorb repeat traffic.
+
+Only anonymous requests without pending flash messages are cached, since
+the shared layout shows the login state and flashed messages. The same
+rule has to hold downstream: shared caches may keep a page for
+``s-maxage`` seconds but must key it on the Cookie header, and browsers
+revalidate on every use (max-age=0), so nobody is shown the anonymous
+copy after logging in. Responses for logged-in visitors are private.
+"""
+import gzip
+import hashlib
+import os
+import threading
+from functools import wraps
+from flask import Response, current_app, request, session
+
+
+class CachedPage:
+    """Rendered body with its precomputed encodings and ETag."""
+
+    __slots__ = ('body', 'gzip_body', 'mimetype', 'etag')
+
+    def __init__(self, body, mimetype):
+        self.body = body
+        self.gzip_body = gzip.compress(body, compresslevel=9)
+        self.mimetype = mimetype
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+
+    def to_response(self, max_age):
+        """Build the response for the current request.
+
+        Args:
+            max_age: Seconds shared caches (nginx, a CDN) may reuse the page
+
+        Returns:
+            Response: 200 with the best encoding, or 304 if the client's
+            ETag is current
+        """
+        use_gzip = 'gzip' in request.accept_encodings
+        # Strong ETags must differ between encodings of the same resource
+        etag = f'{self.etag}-gzip' if use_gzip else self.etag
+
+        if request.if_none_match.contains(self.etag) or \
+                request.if_none_match.contains(f'{self.etag}-gzip'):
+            response = Response(status=304)
+        else:
+            response = Response(self.gzip_body if use_gzip else self.body,
+                                mimetype=self.mimetype)
+            if use_gzip:
+                response.headers['Content-Encoding'] = 'gzip'
+
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = f'public, max-age=0, s-maxage={max_age}'
+        response.vary.update(('Accept-Encoding', 'Cookie'))
+        return response
+
+
+class PageCache:
+    """Per-process store of rendered pages keyed by endpoint and template mtime."""
+
+    def __init__(self, max_age=300, enabled=True):
+        """Create an empty page cache.
+
+        Args:
+            max_age: Cache-Control s-maxage for cached pages
+            enabled: When False, views render on every request
+        """
+        self.max_age = max_age
+        self.enabled = enabled
+        self._pages = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, endpoint, version):
+        """Return the cached page for ``endpoint`` if rendered from ``version``."""
+        with self._lock:
+            item = self._pages.get(endpoint)
+            if item is not None and item[0] == version:
+                self.hits += 1
+                return item[1]
+            self.misses += 1
+            return None
+
+    def put(self, endpoint, version, page):
+        """Store a page, replacing any copy rendered from older templates."""
+        with self._lock:
+            self._pages[endpoint] = (version, page)
+
+    def stats(self):
+        """Return hit/miss counters and the number of cached pages.
+
+        Returns:
+            dict: hits, misses, size and enabled flag
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._pages),
+                'enabled': self.enabled,
+            }
+
+
+def _is_cacheable_request():
+    """Whether the page would render the same for every visitor."""
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    remember_cookie = current_app.config.get('REMEMBER_COOKIE_NAME', 'remember_token')
+    return ('_user_id' not in session
+            and '_flashes' not in session
+            and remember_cookie not in request.cookies)
+
+
+def _template_version(templates):
+    """Modification times of the templates a page is rendered from."""
+    folder = os.path.join(current_app.root_path, current_app.template_folder)
+    return tuple(os.stat(os.path.join(folder, name)).st_mtime_ns for name in templates)
+
+
+def cached_page(*templates):
+    """Cache a view's rendered output until one of ``templates`` changes.
+
+    Args:
+        templates: Template names the page is rendered from, including
+            any it extends (e.g. 'base.html', 'landing.html')
+
+    Returns:
+        Decorator for a view that takes no request-dependent input
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            cache = current_app.extensions['page_cache']
+            if not cache.enabled:
+                return view(*args, **kwargs)
+            if not _is_cacheable_request():
+                response = current_app.make_response(view(*args, **kwargs))
+                response.headers['Cache-Control'] = 'private, no-cache'
+                response.vary.add('Cookie')
+                return response
+
+            version = _template_version(templates)
+            page = cache.get(request.endpoint, version)
+            if page is None:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                page = CachedPage(response.get_data(), response.mimetype)
+                cache.put(request.endpoint, version, page)
+            return page.to_response(cache.max_age)
+        return wrapper
+    return decorator
@@ -0,0 +1,118 @@
+"""Password hashing and bounded, off-thread verification.
+
+Password hashes are deliberately slow (scrypt/pbkdf2 spend tens of ms of
+CPU each). Verifying them on a small, bounded thread pool caps how many
+run at once, and rejecting attempts beyond the queue limit keeps a burst
+of logins from tying up every worker. hashlib releases the GIL while
+hashing, so other request threads keep running meanwhile.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class PasswordVerifierBusyError(Exception):
+    """Raised when too many password verifications are already pending."""
+    pass
+
+
+class PasswordVerifier:
+    """Hashes passwords with a configured method and verifies them on a pool."""
+
+    def __init__(self, method, workers=2, queue_limit=8, timeout=10):
+        """Create a verifier.
+
+        Args:
+            method: Werkzeug hash method, e.g. 'scrypt:32768:8:1' or
+                'pbkdf2:sha256:600000'
+            workers: Threads verifying passwords concurrently
+            queue_limit: Maximum verifications running or waiting; further
+                attempts raise PasswordVerifierBusyError immediately
+            timeout: Seconds to wait for a verification result
+        """
+        self.method = method
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(queue_limit)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._method_prefix = None
+        self.verified = 0
+        self.rejected = 0
+
+    def _get_executor(self):
+        # Created lazily so no threads exist before gunicorn forks workers
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix='password-verify'
+                )
+            return self._executor
+
+    def hash(self, password):
+        """Hash a password with the configured method.
+
+        Args:
+            password: Plain text password
+
+        Returns:
+            str: Werkzeug password hash
+        """
+        return generate_password_hash(password, method=self.method)
+
+    def verify(self, pwhash, password):
+        """Check a password against a stored hash on the verification pool.
+
+        Args:
+            pwhash: Stored Werkzeug password hash
+            password: Plain text password to verify
+
+        Returns:
+            bool: True if the password matches
+
+        Raises:
+            PasswordVerifierBusyError: If the queue is full or the result
+                does not arrive within the timeout
+        """
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise PasswordVerifierBusyError('Too many password checks in progress.')
+
+        # The slot is freed when the hash finishes, even if we stop waiting
+        future = self._get_executor().submit(check_password_hash, pwhash, password)
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            result = future.result(timeout=self.timeout)
+        except TimeoutError:
+            self.rejected += 1
+            raise PasswordVerifierBusyError('Password check timed out.')
+        self.verified += 1
+        return result
+
+    def needs_rehash(self, pwhash):
+        """Check whether a stored hash uses different parameters than configured.
+
+        Args:
+            pwhash: Stored Werkzeug password hash
+
+        Returns:
+            bool: True if the hash should be regenerated with the current method
+        """
+        if self._method_prefix is None:
+            # Werkzeug expands short names ('scrypt' -> 'scrypt:32768:8:1'),
+            # so compare against the prefix it actually writes
+            self._method_prefix = self.hash('').split('$', 1)[0]
+        return pwhash.split('$', 1)[0] != self._method_prefix
+
+    def stats(self):
+        """Return verification counters.
+
+        Returns:
+            dict: method, workers, verified and rejected counts
+        """
+        return {
+            'method': self.method,
+            'workers': self.workers,
+            'verified': self.verified,
+            'rejected': self.rejected,
+        }
@@ -0,0 +1,122 @@
+"""Live SQLAlchemy connection pool statistics.
+
+A PoolMonitor listens to the engine's pool events and keeps counters for
+connections opened, checkouts, invalidations and time spent checking out
+a connection (mostly waiting for a free one). Together with the pool's own
+gauges (checked out, overflow) this shows whether DB_POOL_SIZE / DB_MAX_OVERFLOW fit the load.
+Counters are per worker process.
+"""
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+
+class PoolMonitor:
+    """Collects checkout, wait and invalidation statistics for one engine."""
+
+    def __init__(self, engine):
+        """Attach to ``engine`` and start counting.
+
+        Args:
+            engine: SQLAlchemy Engine whose pool is monitored
+        """
+        self.engine = engine
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.soft_invalidations = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+        event.listen(engine, 'connect', self._on_connect)
+        event.listen(engine, 'checkout', self._on_checkout)
+        event.listen(engine, 'checkin', self._on_checkin)
+        event.listen(engine, 'invalidate', self._on_invalidate)
+        event.listen(engine, 'soft_invalidate', self._on_soft_invalidate)
+        # dispose() swaps in a fresh pool, which needs timing again
+        event.listen(engine, 'engine_disposed', lambda engine: self._time_waits(engine.pool))
+        self._time_waits(engine.pool)
+
+    def _time_waits(self, pool):
+        """Measure how long each checkout takes, waiting included.
+
+        Pool events only fire once a connection has been handed out, so
+        there is no public hook for the start of a checkout. Instead the
+        pool's public connect() method, which Engine.connect() calls for
+        every checkout, is wrapped on this pool instance and timed. The
+        time includes the pre-ping, which is small next to waiting on an
+        exhausted QueuePool. This relies on Engine.raw_connection() calling
+        ``self.pool.connect()``, true for the SQLAlchemy versions allowed by
+        requirements.txt; test_monitor_counts_timeouts_and_waits catches a
+        change.
+        """
+        connect = pool.connect
+
+        def timed_connect():
+            start = time.perf_counter()
+            try:
+                return connect()
+            except PoolTimeoutError:
+                with self._lock:
+                    self.timeouts += 1
+                raise
+            finally:
+                waited = time.perf_counter() - start
+                with self._lock:
+                    self.wait_total += waited
+                    self.wait_max = max(self.wait_max, waited)
+
+        pool.connect = timed_connect
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checkins += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+    def _on_soft_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.soft_invalidations += 1
+
+    def stats(self):
+        """Return current pool gauges and cumulative counters.
+
+        Returns:
+            dict: Pool class and size gauges, checkout/connect/invalidation
+            counters, and checkout wait time (total, average and max, in ms)
+        """
+        pool = self.engine.pool
+        gauges = {'pool_class': type(pool).__name__}
+        # Only QueuePool-style pools report size/overflow
+        for name in ('size', 'checkedin', 'checkedout', 'overflow'):
+            method = getattr(pool, name, None)
+            gauges[name] = method() if callable(method) else None
+
+        with self._lock:
+            return {
+                **gauges,
+                'connects': self.connects,
+                'checkouts': self.checkouts,
+                'checkins': self.checkins,
+                'invalidations': self.invalidations,
+                'soft_invalidations': self.soft_invalidations,
+                'timeouts': self.timeouts,
+                'checkout_wait_ms_total': round(self.wait_total * 1000, 3),
+                'checkout_wait_ms_avg': round(
+                    self.wait_total * 1000 / self.checkouts, 3) if self.checkouts else 0.0,
+                'checkout_wait_ms_max': round(self.wait_max * 1000, 3),
+            }
@@ -0,0 +1,102 @@
+"""Read-only row objects for listing queries.
+
+Lists, exports and the entries API only read a few attributes of each
+row. Loading them as ORM instances pays for identity-map bookkeeping,
+attribute instrumentation and change tracking on every row, which
+dominates when thousands of rows are rendered or streamed. The row types
+here are named tuples with ``__slots__ = ()``: the query selects just
+their columns with Core select() and each result row becomes one tuple.
+
+They have the same attribute names (and to_dict()) as the models, so
+templates and serializers work with either. They are detached values:
+changing one does not change the database.
+"""
+from collections import namedtuple
+from flask_sqlalchemy.pagination import SelectPagination
+from sqlalchemy import select
+from app.extensions import db
+from app.models.entry import Entry
+from app.models.registration import Registration
+
+
+class EntryRow(namedtuple('EntryRow', ['id', 'value', 'created_at'])):
+    """An entry as listed by the demo page and the entries API."""
+
+    __slots__ = ()
+    COLUMNS = (Entry.id, Entry.value, Entry.created_at)
+
+    def to_dict(self):
+        """Convert to the same dictionary as Entry.to_dict()."""
+        return {
+            'id': self.id,
+            'value': self.value,
+            'created_at': self.created_at.isoformat()
+        }
+
+
+class RegistrationRow(namedtuple('RegistrationRow',
+                                 ['id', 'name', 'email', 'company', 'job_title', 'created_at'])):
+    """A registration as listed by the admin page and the CSV export."""
+
+    __slots__ = ()
+    COLUMNS = (Registration.id, Registration.name, Registration.email, Registration.company,
+               Registration.job_title, Registration.created_at)
+
+    def to_dict(self):
+        """Convert to the same dictionary as Registration.to_dict()."""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'email': self.email,
+            'company': self.company,
+            'job_title': self.job_title,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+
+def select_rows(row_type):
+    """Core SELECT of a row type's columns, ready for where/order_by/limit."""
+    return select(*row_type.COLUMNS)
+
+
+def fetch_rows(row_type, query):
+    """Execute a select_rows() query and return a list of row objects."""
+    return list(map(row_type._make, db.session.execute(query)))
+
+
+def iter_rows(row_type, query, batch_size=1000):
+    """Execute a select_rows() query and yield row objects in batches.
+
+    Uses ``yield_per`` (a server-side cursor on PostgreSQL and SQL Server),
+    so memory is bounded by ``batch_size`` rows.
+    """
+    result = db.session.execute(query.execution_options(yield_per=batch_size))
+    for partition in result.partitions():
+        yield from map(row_type._make, partition)
+
+
+class RowPagination(SelectPagination):
+    """Flask-SQLAlchemy pagination whose items are row objects."""
+
+    def _query_items(self):
+        query = self._query_args['select'].limit(self.per_page).offset(self._query_offset)
+        return fetch_rows(self._query_args['row_type'], query)
+
+    def _query_count(self):
+        total = self._query_args.get('total')
+        return super()._query_count() if total is None else total
+
+
+def paginate_rows(row_type, query, page, per_page, max_per_page=None, total=None):
+    """Paginate a select_rows() query like db.paginate, without ORM instances.
+
+    Args:
+        total: Number of rows the query matches, if the caller already
+            knows it; skips the COUNT query
+
+    Returns:
+        RowPagination: Same interface as db.paginate's result
+    """
+    return RowPagination(select=query, session=db.session(), row_type=row_type,
+                         page=page, per_page=per_page, max_per_page=max_per_page,
+                         error_out=False, total=total)
@@ -5,39 +5,140 @@ Protected by @login_required - requires admin authentication.
 from datetime import datetime
 import csv
 import io
-from flask import Blueprint, render_template, request, Response
+import zlib
+from flask import (Blueprint, abort, redirect, render_template, request, Response, current_app,
+                   jsonify, stream_with_context, url_for)
 from flask_login import login_required
+from app.live_stats import LiveStatsBusyError
+from app.services.auth_service import AuthService
 from app.services.registration_service import RegistrationService
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
 
+# Milliseconds a browser waits before reopening a closed live stats stream
+LIVE_STATS_RETRY_MS = 2000
+
 
 @admin_bp.route('/attendees')
 @login_required
 def attendees():
-    """Display list of all webinar registrations with sorting.
+    """Display a page of webinar registrations with sorting, or search results.
 
     Query parameters:
+        q: Search text; shows the top ADMIN_SEARCH_LIMIT full-text matches
+            instead of the sorted page
         sort: Field to sort by (name, email, company, job_title, created_at)
         order: Sort order (asc, desc)
+        page: Page number (default 1)
+        size: Registrations per page (default ADMIN_ATTENDEES_PAGE_SIZE)
     """
+    query = request.args.get('q', '').strip()
+    if query:
+        limit = current_app.config['ADMIN_SEARCH_LIMIT']
+        return render_template('admin/attendees.html',
+                              registrations=RegistrationService.search_registrations(query, limit),
+                              query=query,
+                              search_limit=limit,
+                              stats=RegistrationService.get_registration_stats(),
+                              analytics=RegistrationService.get_attendee_analytics())
+
     sort_by = request.args.get('sort', 'created_at')
     order = request.args.get('order', 'desc')
+    page = request.args.get('page', 1, type=int)
+    size = request.args.get('size', current_app.config['ADMIN_ATTENDEES_PAGE_SIZE'], type=int)
 
-    registrations = RegistrationService.get_registrations_sorted(sort_by, order)
+    # The rollup's total doubles as the pagination count, so the page
+    # never counts the registrations table
     stats = RegistrationService.get_registration_stats()
+    pagination = RegistrationService.get_registrations_page(
+        page=page,
+        per_page=size,
+        sort_by=sort_by,
+        order=order,
+        max_per_page=current_app.config['ADMIN_ATTENDEES_MAX_PAGE_SIZE'],
+        total=stats['total']
+    )
+    # Past the end (e.g. a stale link after deletions): go to the last page
+    if page > pagination.pages > 0:
+        return redirect(url_for('admin.attendees', sort=sort_by, order=order,
+                                size=pagination.per_page, page=pagination.pages))
+    analytics = RegistrationService.get_attendee_analytics()
 
     # Toggle order for column headers
     next_order = 'asc' if order == 'desc' else 'desc'
 
     return render_template('admin/attendees.html',
-                          registrations=registrations,
+                          registrations=pagination.items,
+                          pagination=pagination,
                           stats=stats,
+                          analytics=analytics,
                           current_sort=sort_by,
                           current_order=order,
                           next_order=next_order)
 
 
+@admin_bp.route('/attendees/live')
+@login_required
+def live_stats():
+    """Stream the registration total and today's count as Server-Sent Events.
+
+    Sends a ``stats`` event with the current counts at once and again
+    whenever a registration is committed by any worker (see
+    app.live_stats), plus a comment every LIVE_STATS_KEEPALIVE_SECONDS.
+    The stream ends after LIVE_STATS_STREAM_SECONDS; the browser's
+    EventSource reconnects by itself.
+
+    Each stream holds the thread serving it until it ends, so a server
+    that handles one request at a time per worker (gunicorn sync workers,
+    the Flask development server without threads) gets 503 rather than
+    tying up its workers; gunicorn.conf.py runs gthread workers when live
+    stats are on.
+
+    Returns:
+        text/event-stream response, 404 when LIVE_STATS_ENABLED is off, or
+        503 when the server is single-threaded or this worker already
+        serves LIVE_STATS_MAX_LISTENERS streams
+    """
+    feed = current_app.extensions.get('live_stats')
+    if feed is None:
+        abort(404)
+    if not request.environ.get('wsgi.multithread'):
+        return jsonify({'error': 'Live stats need a multithreaded server '
+                                 '(e.g. gunicorn gthread workers)'}), 503
+    try:
+        subscription = feed.subscribe()
+    except LiveStatsBusyError as e:
+        return jsonify({'error': str(e)}), 503
+
+    try:
+        counts = RegistrationService.get_live_counts()
+    except Exception:
+        subscription.close()
+        raise
+    dumps = current_app.json.dumps
+    duration = current_app.config['LIVE_STATS_STREAM_SECONDS']
+    keepalive = current_app.config['LIVE_STATS_KEEPALIVE_SECONDS']
+
+    def generate():
+        try:
+            yield f'retry: {LIVE_STATS_RETRY_MS}\nevent: stats\ndata: {dumps(counts)}\n\n'
+            for payload in subscription.events(duration, keepalive):
+                if payload is None:
+                    yield ': keepalive\n\n'
+                else:
+                    yield f'event: stats\ndata: {dumps(payload)}\n\n'
+        finally:
+            subscription.close()
+
+    # No stream_with_context: the request (and its database session) ends
+    # here, not when the stream does
+    response = Response(generate(), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    # Runs even if the client disconnects before the first chunk
+    response.call_on_close(subscription.close)
+    return response
+
+
 @admin_bp.route('/export/csv')
 @login_required
 def export_csv():
@@ -45,10 +146,64 @@ def export_csv():
 
     Returns a downloadable CSV file with all registration data.
     Filename includes current date for easy identification.
+
+    The file is streamed: rows are read from a server-side cursor in
+    batches of EXPORT_CSV_BATCH_SIZE and written to the client as each
+    batch is formatted, so worker memory does not grow with the table.
+    When EXPORT_CSV_GZIP is enabled and the client accepts gzip, the
+    stream is compressed on the fly.
     """
-    registrations = RegistrationService.get_all_registrations()
+    batch_size = current_app.config['EXPORT_CSV_BATCH_SIZE']
+    use_gzip = (current_app.config['EXPORT_CSV_GZIP']
+                and 'gzip' in request.accept_encodings)
+
+    date_str = datetime.now().strftime('%Y%m%d')
+    filename = f'webinar-registrations-{date_str}.csv'
+    headers = {'Content-Disposition': f'attachment; filename={filename}'}
+
+    body = _generate_csv(batch_size)
+    if use_gzip:
+        body = _gzip_stream(body)
+        headers['Content-Encoding'] = 'gzip'
+        headers['Vary'] = 'Accept-Encoding'
+
+    return Response(
+        stream_with_context(body),
+        mimetype='text/csv',
+        headers=headers
+    )
+
 
-    # Create CSV in memory
+@admin_bp.route('/cache-stats')
+@login_required
+def cache_stats():
+    """Report in-process cache statistics for this worker as JSON."""
+    return jsonify({
+        'user_loader': AuthService.user_cache_stats(),
+        'pages': current_app.extensions['page_cache'].stats()
+    })
+
+
+@admin_bp.route('/pool-stats')
+@login_required
+def pool_stats():
+    """Report database connection pool statistics for this worker as JSON."""
+    return jsonify(current_app.extensions['pool_monitor'].stats())
+
+
+@admin_bp.route('/write-buffer-stats')
+@login_required
+def write_buffer_stats():
+    """Report entry write buffer flush statistics for this worker as JSON."""
+    buffer = current_app.extensions.get('entry_buffer')
+    if buffer is None:
+        return jsonify({'enabled': False})
+    return jsonify({'enabled': True, **buffer.stats()})
+
+
+def _generate_csv(batch_size):
+    """Yield the registrations CSV in chunks of ``batch_size`` rows."""
+    # Reuse one small buffer; it is emptied after every chunk
     output = io.StringIO()
     writer = csv.writer(output)
 
@@ -56,7 +211,7 @@ def export_csv():
     writer.writerow(['ID', 'Name', 'Email', 'Company', 'Job Title', 'Registered At'])
 
     # Write data rows
-    for reg in registrations:
+    for i, reg in enumerate(RegistrationService.iter_registrations(batch_size), start=1):
         writer.writerow([
             reg.id,
             reg.name,
@@ -65,14 +220,19 @@ def export_csv():
             reg.job_title,
             reg.created_at.strftime('%Y-%m-%d %H:%M:%S') if reg.created_at else ''
         ])
-
-    # Prepare response
-    output.seek(0)
-    date_str = datetime.now().strftime('%Y%m%d')
-    filename = f'webinar-registrations-{date_str}.csv'
-
-    return Response(
-        output.getvalue(),
-        mimetype='text/csv',
-        headers={'Content-Disposition': f'attachment; filename={filename}'}
-    )
+        if i % batch_size == 0:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate(0)
+
+    yield output.getvalue()
+
+
+def _gzip_stream(chunks):
+    """Compress an iterable of text chunks into a gzip byte stream."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31: gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
@@ -1,20 +1,196 @@
 """API blueprint for JSON endpoints."""
 
-from flask import Blueprint, jsonify
-from app.services.entry_service import EntryService
+import hashlib
+import json
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context, url_for
+from app.services.entry_service import EntryService, InvalidCursorError
 
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 
 
 @api_bp.route('/entries')
 def get_entries():
-    """Get all entries as JSON.
+    """Get entries as JSON, newest first.
+
+    Results are paginated with a keyset cursor on (created_at, id). The body
+    is a JSON array; when more entries exist the response carries the
+    cursor for the next page in ``X-Next-Cursor`` and a ``Link`` header.
+
+    Query parameters:
+        limit: Page size (default API_ENTRIES_PAGE_SIZE, max API_ENTRIES_MAX_PAGE_SIZE)
+        after: Cursor from a previous response's X-Next-Cursor header
+        stream: 'json' or 'ndjson' to stream every entry after the cursor
+            in a single response instead of returning one page
+
+    Responses carry an ETag and Last-Modified derived from the table
+    watermark (see EntryService.get_watermark). A client whose copy is
+    current gets 304 Not Modified without any rows being read.
 
     Returns:
         JSON array of entry objects with id, value, and created_at fields.
     """
-    entries = EntryService.get_all_entries()
-    return jsonify([entry.to_dict() for entry in entries])
+    watermark = EntryService.get_watermark()
+    etag = _entries_etag(watermark)
+    last_modified = watermark['last_modified']
+
+    if _client_is_current(etag, last_modified):
+        response = Response(status=304)
+    else:
+        response = current_app.make_response(_entries_response())
+        if response.status_code != 200:
+            return response
+
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    # Let clients store the response but revalidate before every reuse
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def _entries_etag(watermark):
+    """ETag for this request's parameters at the given table state."""
+    key = f"{watermark['max_id']}:{watermark['count']}:{request.full_path}"
+    return hashlib.sha256(key.encode()).hexdigest()[:32]
+
+
+def _client_is_current(etag, last_modified):
+    """Check the conditional request headers against the current state."""
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        return last_modified.replace(microsecond=0) <= request.if_modified_since
+    return False
+
+
+def _entries_response():
+    """Build the page or stream response for /api/entries."""
+    after = request.args.get('after')
+    stream = request.args.get('stream')
+
+    if stream:
+        return _stream_entries(stream, after)
+
+    max_limit = current_app.config['API_ENTRIES_MAX_PAGE_SIZE']
+    try:
+        limit = int(request.args.get('limit', current_app.config['API_ENTRIES_PAGE_SIZE']))
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= max_limit:
+        return jsonify({'error': f'limit must be between 1 and {max_limit}'}), 400
+
+    try:
+        entries, next_cursor = EntryService.get_entries_page(limit, after=after)
+    except InvalidCursorError as e:
+        return jsonify({'error': str(e)}), 400
+
+    response = jsonify(entries)
+    if next_cursor:
+        next_url = url_for('api.get_entries', limit=limit, after=next_cursor)
+        response.headers['X-Next-Cursor'] = next_cursor
+        response.headers['Link'] = f'<{next_url}>; rel="next"'
+    return response
+
+
+def _stream_entries(stream, after):
+    """Stream all entries after the cursor as a JSON array or NDJSON.
+
+    Rows from EntryService.iter_entries are encoded in chunks by
+    app.json.iter_encode, so the full result set never exists in memory.
+    """
+    if stream not in ('json', 'ndjson'):
+        return jsonify({'error': "stream must be 'json' or 'ndjson'"}), 400
+
+    batch_size = current_app.config['API_ENTRIES_STREAM_BATCH_SIZE']
+    try:
+        # Decode up front so a bad cursor is a 400, not a broken stream
+        if after:
+            EntryService.decode_cursor(after)
+    except InvalidCursorError as e:
+        return jsonify({'error': str(e)}), 400
+
+    ndjson = stream == 'ndjson'
+    body = current_app.json.iter_encode(
+        EntryService.iter_entries(after=after, batch_size=batch_size), ndjson=ndjson
+    )
+    mimetype = 'application/x-ndjson' if ndjson else 'application/json'
+    return Response(stream_with_context(body), mimetype=mimetype)
+
+
+@api_bp.route('/entries', methods=['POST'])
+def create_entries():
+    """Create many entries in one request.
+
+    The body is either a JSON array (``Content-Type: application/json``)
+    or NDJSON (``application/x-ndjson``, one object per line) of objects
+    with a non-empty string ``value``. The batch is all-or-nothing: if any
+    item is invalid nothing is inserted and every problem is reported.
+
+    Limits: at most API_ENTRIES_MAX_BATCH entries and
+    API_ENTRIES_MAX_BODY_BYTES bytes per request.
+
+    Returns:
+        201 with ``{"ids": [...], "count": n}`` (ids in request order),
+        400 for malformed or invalid items, 413 when a limit is exceeded,
+        415 for other content types.
+    """
+    max_bytes = current_app.config['API_ENTRIES_MAX_BODY_BYTES']
+    max_batch = current_app.config['API_ENTRIES_MAX_BATCH']
+
+    if request.mimetype not in ('application/json', 'application/x-ndjson'):
+        return jsonify({'error': 'Content-Type must be application/json or '
+                                 'application/x-ndjson'}), 415
+    if request.content_length is not None and request.content_length > max_bytes:
+        return jsonify({'error': f'body exceeds {max_bytes} bytes'}), 413
+    # Read at most one byte past the limit, also for chunked uploads
+    body = request.stream.read(max_bytes + 1)
+    if len(body) > max_bytes:
+        return jsonify({'error': f'body exceeds {max_bytes} bytes'}), 413
+
+    try:
+        items = _parse_entries_body(body, request.mimetype == 'application/x-ndjson')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if not items:
+        return jsonify({'error': 'no entries in request body'}), 400
+    if len(items) > max_batch:
+        return jsonify({'error': f'at most {max_batch} entries per request'}), 413
+
+    values, errors = [], []
+    for index, item in enumerate(items):
+        value = item.get('value') if isinstance(item, dict) else None
+        if not isinstance(value, str) or not value.strip():
+            errors.append({'index': index, 'error': "'value' must be a non-empty string"})
+        else:
+            values.append(value)
+    if errors:
+        return jsonify({'error': 'invalid entries', 'details': errors}), 400
+
+    ids = EntryService.create_entries(values)
+    return jsonify({'ids': ids, 'count': len(ids)}), 201
+
+
+def _parse_entries_body(body, ndjson):
+    """Decode a JSON array or NDJSON body into a list of items.
+
+    Raises:
+        ValueError: If the body is not valid JSON/NDJSON or not an array
+    """
+    try:
+        text = body.decode('utf-8')
+        loads = current_app.json.loads
+        if ndjson:
+            return [loads(line) for line in text.splitlines() if line.strip()]
+        items = loads(text)
+    except UnicodeDecodeError:
+        raise ValueError('body must be UTF-8')
+    except json.JSONDecodeError as e:
+        raise ValueError(f'invalid JSON: {e}')
+    if not isinstance(items, list):
+        raise ValueError('body must be a JSON array')
+    return items
 
 
 @api_bp.route('/health')
@@ -6,7 +6,7 @@ for session management.
 from flask import Blueprint, render_template, redirect, url_for, flash, request
 from flask_login import login_user, logout_user, current_user
 from app.forms.login import LoginForm
-from app.services.auth_service import AuthService
+from app.services.auth_service import AuthService, PasswordVerifierBusyError
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
 
@@ -27,7 +27,11 @@ def login():
     form = LoginForm()
 
     if form.validate_on_submit():
-        user = AuthService.authenticate(form.username.data, form.password.data)
+        try:
+            user = AuthService.authenticate(form.username.data, form.password.data)
+        except PasswordVerifierBusyError:
+            flash('The server is busy. Please try logging in again in a moment.', 'error')
+            return render_template('auth/login.html', form=form), 503
         if user:
             login_user(user, remember=form.remember_me.data)
             flash('Login successful!', 'success')
@@ -5,8 +5,9 @@ at the root route. It demonstrates basic CRUD operations with the database.
 """
 
 import os
-from flask import Blueprint, request, render_template, redirect, url_for
+from flask import Blueprint, abort, flash, request, render_template, redirect, url_for
 from app.services.entry_service import EntryService
+from app.write_buffer import WriteBufferFullError
 
 demo_bp = Blueprint('demo', __name__, url_prefix='/demo')
 
@@ -16,14 +17,29 @@ def index():
     """Handle the demo page with entry form and list.
 
     GET: Display the form and recent entries.
-    POST: Create a new entry and redirect to avoid form resubmission.
+    POST: Create a new entry and redirect to avoid form resubmission. If
+    the write buffer does not confirm the commit in time, the page is
+    shown with 503 and a warning that the entry may still be saved, so
+    the visitor checks the list instead of submitting a duplicate.
     """
     if request.method == 'POST':
         value = request.form.get('value')
         if value:
-            EntryService.create_entry(value)
+            try:
+                EntryService.submit_entry(value)
+            except WriteBufferFullError:
+                abort(503)
+            except TimeoutError:
+                # The batch may still commit after the wait gave up
+                flash('Your entry was not confirmed in time and may still be saved. '
+                      'Check the list below before submitting it again.', 'error')
+                return _render_index(), 503
         return redirect(url_for('demo.index'))
 
+    return _render_index()
+
+
+def _render_index():
     entries = EntryService.get_recent_entries(limit=10)
     count = EntryService.get_entry_count()
     db_type = 'PostgreSQL' if os.environ.get('DATABASE_URL') else 'SQLite (local)'
@@ -5,12 +5,14 @@ form for the webinar signup feature.
 """
 from flask import Blueprint, render_template, redirect, url_for, flash
 from app.forms.registration import RegistrationForm
+from app.page_cache import cached_page
 from app.services.registration_service import RegistrationService, DuplicateEmailError
 
 main_bp = Blueprint('main', __name__)
 
 
 @main_bp.route('/')
+@cached_page('base.html', 'landing.html')
 def index():
     """Render the landing page."""
     return render_template('landing.html')
@@ -42,12 +44,14 @@ def register():
 
 
 @main_bp.route('/thank-you')
+@cached_page('base.html', 'thank_you.html')
 def thank_you():
     """Display registration confirmation."""
     return render_template('thank_you.html')
 
 
 @main_bp.route('/webinar')
+@cached_page('base.html', 'webinar_info.html')
 def webinar_info():
     """Display webinar information page.
 
@@ -0,0 +1,287 @@
+"""Full-text search index over registrations.
+
+The admin search box matches words in name, company, job_title and email
+against a full-text index, so a lookup reads the index entries for the
+search words instead of scanning the table with LIKE '%...%'. Each
+backend uses its native engine:
+
+- SQLite: an FTS5 external-content table (registrations_fts) that mirrors
+  the registrations table, kept in sync by INSERT/UPDATE/DELETE triggers.
+- PostgreSQL: a generated tsvector column (registrations.search_vector)
+  with a GIN index. Name weighs most, then company and job title, then
+  email.
+- SQL Server: a full-text index in its own catalog with automatic change
+  tracking.
+
+Because the database maintains the index, rows written by
+RegistrationService.create_registration, the bulk import and flask seed
+are all searchable without extra work in the service layer. SQL Server
+populates its index asynchronously, so a new row can take a moment to
+show up there.
+
+Every word of the query must match (AND), and each word also matches as
+a prefix, so "ann fab" finds "Anna Berg, Fabrikam". Results are the top
+``limit`` rows by the backend's relevance rank. Scoring every match of a
+broad query ("dev" on a million rows) dominates the lookup, so SQLite and
+PostgreSQL rank only the newest RANK_CANDIDATES matches.
+"""
+import re
+from sqlalchemy import Float, Integer, text
+
+TABLE = 'registrations'
+COLUMNS = ('name', 'company', 'job_title', 'email')
+
+FTS_TABLE = 'registrations_fts'
+SEARCH_VECTOR = 'search_vector'
+SEARCH_VECTOR_INDEX = 'ix_registrations_search_vector'
+FULLTEXT_CATALOG = 'registrations_catalog'
+
+# SQLite and PostgreSQL split on anything that is not a letter or digit;
+# search words are split the same way so "anna.berg@" becomes anna, berg
+WORD_RE = re.compile(r'[^\W_]+')
+
+# Most words looked up per query; longer input is truncated
+MAX_WORDS = 8
+
+# Matches scored per query; beyond this, newer registrations win
+RANK_CANDIDATES = 2000
+
+# bm25 weights for name, company, job_title and email (higher is better)
+SQLITE_WEIGHTS = (4.0, 2.0, 2.0, 1.0)
+
+SQLITE_INSERT_TRIGGER = (
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, {', '.join(COLUMNS)}) "
+    f"VALUES (new.id, {', '.join('new.' + c for c in COLUMNS)}); END"
+)
+
+SQLITE_CREATE = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"{', '.join(COLUMNS)}, content='{TABLE}', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    SQLITE_INSERT_TRIGGER,
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {', '.join(COLUMNS)}) "
+    f"VALUES ('delete', old.id, {', '.join('old.' + c for c in COLUMNS)}); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON {TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {', '.join(COLUMNS)}) "
+    f"VALUES ('delete', old.id, {', '.join('old.' + c for c in COLUMNS)}); "
+    f"INSERT INTO {FTS_TABLE}(rowid, {', '.join(COLUMNS)}) "
+    f"VALUES (new.id, {', '.join('new.' + c for c in COLUMNS)}); END",
+]
+
+SQLITE_DROP = [
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ai',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_au',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+
+# 'simple' does no stemming or stop words, which suits names and companies.
+# The email's punctuation is replaced so its parts are separate words.
+POSTGRES_CREATE = [
+    f"ALTER TABLE {TABLE} ADD COLUMN IF NOT EXISTS {SEARCH_VECTOR} tsvector "
+    "GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('simple'::regconfig, coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(company, '')), 'B') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(job_title, '')), 'B') || "
+    "setweight(to_tsvector('simple'::regconfig, "
+    "translate(coalesce(email, ''), '@.+_-', '     ')), 'C')) STORED",
+    f'CREATE INDEX IF NOT EXISTS {SEARCH_VECTOR_INDEX} ON {TABLE} USING GIN ({SEARCH_VECTOR})',
+]
+
+POSTGRES_DROP = [
+    f'DROP INDEX IF EXISTS {SEARCH_VECTOR_INDEX}',
+    f'ALTER TABLE {TABLE} DROP COLUMN IF EXISTS {SEARCH_VECTOR}',
+]
+
+# Full-text DDL cannot run inside a transaction; callers use AUTOCOMMIT.
+# The index is keyed on the primary key, whose name SQL Server generates.
+MSSQL_CREATE = [
+    f"IF NOT EXISTS (SELECT 1 FROM sys.fulltext_catalogs WHERE name = '{FULLTEXT_CATALOG}') "
+    f"CREATE FULLTEXT CATALOG {FULLTEXT_CATALOG}",
+    f"IF NOT EXISTS (SELECT 1 FROM sys.fulltext_indexes WHERE object_id = OBJECT_ID('{TABLE}')) "
+    "BEGIN "
+    "DECLARE @pk sysname = (SELECT name FROM sys.indexes "
+    f"WHERE object_id = OBJECT_ID('{TABLE}') AND is_primary_key = 1); "
+    f"EXEC('CREATE FULLTEXT INDEX ON {TABLE} ({', '.join(COLUMNS)}) KEY INDEX ' "
+    f"+ QUOTENAME(@pk) + ' ON {FULLTEXT_CATALOG} WITH CHANGE_TRACKING AUTO'); "
+    "END",
+]
+
+MSSQL_DROP = [
+    f"IF EXISTS (SELECT 1 FROM sys.fulltext_indexes WHERE object_id = OBJECT_ID('{TABLE}')) "
+    f"DROP FULLTEXT INDEX ON {TABLE}",
+    f"IF EXISTS (SELECT 1 FROM sys.fulltext_catalogs WHERE name = '{FULLTEXT_CATALOG}') "
+    f"DROP FULLTEXT CATALOG {FULLTEXT_CATALOG}",
+]
+
+CREATE_STATEMENTS = {'sqlite': SQLITE_CREATE, 'postgresql': POSTGRES_CREATE,
+                     'mssql': MSSQL_CREATE}
+DROP_STATEMENTS = {'sqlite': SQLITE_DROP, 'postgresql': POSTGRES_DROP, 'mssql': MSSQL_DROP}
+
+
+def is_supported(dialect_name):
+    """Return True if the backend has a full-text index implementation."""
+    return dialect_name in CREATE_STATEMENTS
+
+
+def create_search_index(connection):
+    """Create the search index if it does not exist yet.
+
+    Existing registrations are indexed as part of the creation (SQLite
+    rebuilds the FTS table, PostgreSQL computes the generated column, SQL
+    Server starts a background population).
+
+    Args:
+        connection: SQLAlchemy connection; must be in AUTOCOMMIT mode on
+            SQL Server
+
+    Returns:
+        bool: False if the backend has no full-text support here
+    """
+    dialect = connection.dialect.name
+    if not is_supported(dialect):
+        return False
+    created = dialect == 'sqlite' and not _sqlite_index_exists(connection)
+    for statement in CREATE_STATEMENTS[dialect]:
+        connection.execute(text(statement))
+    if created:
+        rebuild_search_index(connection)
+    return True
+
+
+def drop_search_index(connection):
+    """Drop the search index (table rows are not touched).
+
+    Args:
+        connection: SQLAlchemy connection; must be in AUTOCOMMIT mode on
+            SQL Server
+    """
+    for statement in DROP_STATEMENTS.get(connection.dialect.name, []):
+        connection.execute(text(statement))
+
+
+def rebuild_search_index(connection):
+    """Re-index every registration from the table.
+
+    PostgreSQL's generated column cannot drift, so this is a no-op there.
+
+    Args:
+        connection: SQLAlchemy connection
+    """
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    elif dialect == 'mssql':
+        connection.execute(text(f'ALTER FULLTEXT INDEX ON {TABLE} START FULL POPULATION'))
+
+
+def suspend_insert_indexing(connection):
+    """Stop indexing inserted rows one by one, for a bulk insert.
+
+    SQLite's insert trigger indexes every row as it is written, which makes
+    a bulk insert several times slower. This drops the trigger; after the
+    load resume_insert_indexing() recreates it and indexes the new rows
+    with one INSERT ... SELECT. Rows must only be inserted in between:
+    updates and deletes would not reach the index. The dropped trigger is
+    committed with the first batch, so a process killed mid-load leaves
+    later registrations unindexed until the index is rebuilt; only use it
+    for fresh loads such as flask seed into an empty table. Other backends
+    are not affected (PostgreSQL computes the generated column per row
+    anyway, SQL Server populates its index in the background).
+
+    Args:
+        connection: SQLAlchemy connection
+
+    Returns:
+        int or None: Highest registration id before the load, to pass to
+        resume_insert_indexing(); None if nothing was suspended
+    """
+    if connection.dialect.name != 'sqlite' or not _sqlite_index_exists(connection):
+        return None
+    last_id = connection.execute(text(f'SELECT coalesce(max(id), 0) FROM {TABLE}')).scalar()
+    connection.execute(text(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ai'))
+    return last_id
+
+
+def resume_insert_indexing(connection, last_id):
+    """Recreate the insert trigger and index the rows added after ``last_id``.
+
+    Args:
+        connection: SQLAlchemy connection
+        last_id: Value returned by suspend_insert_indexing(); None does nothing
+    """
+    if last_id is None:
+        return
+    connection.execute(text(SQLITE_INSERT_TRIGGER))
+    connection.execute(
+        text(f"INSERT INTO {FTS_TABLE}(rowid, {', '.join(COLUMNS)}) "
+             f"SELECT id, {', '.join(COLUMNS)} FROM {TABLE} WHERE id > :last_id"),
+        {'last_id': last_id}
+    )
+
+
+def _sqlite_index_exists(connection):
+    return connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {'name': FTS_TABLE}
+    ).first() is not None
+
+
+def search_words(query):
+    """Split a search box query into index words.
+
+    Args:
+        query: Text as typed by the user
+
+    Returns:
+        list: Lowercased words, at most MAX_WORDS
+    """
+    return [word.lower() for word in WORD_RE.findall(query or '')][:MAX_WORDS]
+
+
+def match_subquery(dialect_name, words, limit):
+    """Build a subquery of the best matching registration ids.
+
+    Args:
+        dialect_name: Backend name (sqlite, postgresql or mssql)
+        words: Words from search_words(); each must match as a prefix
+        limit: Maximum number of matches
+
+    Returns:
+        Subquery with ``id`` and ``rank`` columns (higher rank is better),
+        already limited to the top ``limit`` matches
+    """
+    params = {'limit': limit, 'candidates': max(limit, RANK_CANDIDATES)}
+    if dialect_name == 'sqlite':
+        # FTS5 query syntax: quoted string followed by * is a prefix search
+        params['query'] = ' AND '.join(f'"{word}"*' for word in words)
+        weights = ', '.join(str(w) for w in SQLITE_WEIGHTS)
+        statement = text(
+            f'SELECT id, rank FROM ('
+            f'SELECT rowid AS id, -bm25({FTS_TABLE}, {weights}) AS rank FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH :query ORDER BY rowid DESC LIMIT :candidates'
+            f') ORDER BY rank DESC LIMIT :limit'
+        )
+    elif dialect_name == 'postgresql':
+        params['query'] = ' & '.join(f'{word}:*' for word in words)
+        statement = text(
+            f'SELECT id, ts_rank({SEARCH_VECTOR}, query) AS rank FROM ('
+            f'SELECT id, {SEARCH_VECTOR} FROM {TABLE} '
+            f"WHERE {SEARCH_VECTOR} @@ to_tsquery('simple', :query) "
+            f'ORDER BY id DESC LIMIT :candidates'
+            f") AS candidates, to_tsquery('simple', :query) AS query "
+            f'ORDER BY rank DESC LIMIT :limit'
+        )
+    elif dialect_name == 'mssql':
+        # CONTAINSTABLE's top_n_by_rank already limits the scoring
+        params.pop('candidates')
+        params['query'] = ' AND '.join(f'"{word}*"' for word in words)
+        statement = text(
+            f'SELECT [KEY] AS id, [RANK] AS rank FROM CONTAINSTABLE({TABLE}, '
+            f'({", ".join(COLUMNS)}), :query, :limit)'
+        )
+    else:
+        raise ValueError(f"No full-text search for the '{dialect_name}' backend.")
+    return statement.bindparams(**params).columns(id=Integer, rank=Float).subquery('matches')
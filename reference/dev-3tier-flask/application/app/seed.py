@@ -0,0 +1,328 @@
+"""Deterministic synthetic data for load tests (flask seed).
+
+Rows are generated a batch at a time from a random.Random seeded with the
+given seed, so the same seed, end date and starting database always
+produce the same rows. Emails and usernames carry a running number that
+continues after the rows already in the table, which keeps them unique
+when seeding twice.
+
+Rows are generated as plain tuples and handed to the driver's bulk path
+(app.bulk: COPY on PostgreSQL, sqlite3 executemany on SQLite), committed
+every COMMIT_EVERY rows, bypassing the ORM and the per-row services
+entirely. On SQLite the load runs with PRAGMA synchronous=OFF and an
+in-memory rollback journal, and a load into an empty registrations table
+suspends the full-text trigger and indexes the new rows in one statement
+at the end. Large registration loads also drop the secondary indexes (and the
+PostgreSQL search column) and rebuild them afterwards; into an empty
+table that includes the unique email index, since the generated emails
+cannot collide. The rebuild is timed separately from the inserts. The
+registration rollup, the analytics sketches and the entry count are
+rebuilt once at the end.
+
+benchmarks/seed.py measures the throughput, for a fresh load and for a
+top-up of a filled database.
+"""
+import random
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from flask import current_app
+from sqlalchemy import func, select
+from werkzeug.security import generate_password_hash
+from app.bulk import insert_rows
+from app.extensions import db
+from app.models.entry import Entry
+from app.models.registration import Registration
+from app.models.user import User
+from app.search import (create_search_index, drop_search_index, resume_insert_indexing,
+                        suspend_insert_indexing)
+from app.services.registration_service import BULK_COLUMNS, RegistrationService
+
+COMMIT_EVERY = 100_000
+
+# seed_database() timing key for rebuilding the registration indexes
+REGISTRATION_INDEXES = 'registration indexes'
+
+# Above this many registrations the non-unique registration indexes are
+# dropped for the load and rebuilt afterwards; building an index once is
+# far cheaper than maintaining it row by row
+INDEX_REBUILD_THRESHOLD = 100_000
+
+FIRST_NAMES = (
+    'Alex', 'Anna', 'Ben', 'Carla', 'David', 'Elin', 'Erik', 'Fatima', 'Gustav', 'Hanna',
+    'Ibrahim', 'Ida', 'Johan', 'Karin', 'Lars', 'Lena', 'Maja', 'Mohammed', 'Nils', 'Olivia',
+    'Oscar', 'Sara', 'Sofia', 'Tobias', 'Wei', 'William', 'Yusuf', 'Zara',
+)
+LAST_NAMES = (
+    'Andersson', 'Berg', 'Chen', 'Dahl', 'Ek', 'Eriksson', 'Garcia', 'Holm', 'Johansson',
+    'Karlsson', 'Larsson', 'Lind', 'Lundqvist', 'Nilsson', 'Nguyen', 'Olsson', 'Persson',
+    'Sandberg', 'Svensson', 'Wallin',
+)
+COMPANIES = (
+    'Contoso', 'Fabrikam', 'Northwind Traders', 'Tailspin Toys', 'Woodgrove Bank',
+    'Litware', 'Adventure Works', 'Proseware', 'Wide World Importers', 'Coho Winery',
+    'Alpine Ski House', 'Lucerne Publishing', 'Humongous Insurance', 'Trey Research',
+)
+JOB_TITLES = (
+    'Developer', 'Senior Developer', 'DevOps Engineer', 'Platform Engineer', 'Architect',
+    'Project Manager', 'Product Owner', 'Tester', 'Student', 'CTO', 'Consultant',
+    'Site Reliability Engineer', 'Data Engineer', 'IT Operations',
+)
+EMAIL_DOMAINS = ('example.com', 'example.org', 'example.net')
+ENTRY_WORDS = (
+    'deploy', 'pipeline', 'container', 'database', 'cache', 'latency', 'scale', 'request',
+    'worker', 'network', 'storage', 'monitor', 'release', 'rollback', 'cluster', 'queue',
+)
+
+
+def _timestamps(rng, offset, count, total, start, span):
+    """Spread ``total`` timestamps evenly over ``span`` with per-row jitter.
+
+    Values increase with the row number, so later batches are newer.
+    """
+    step = span / total
+    return [start + step * (i + rng.random()) for i in range(offset, offset + count)]
+
+
+def generate_registrations(count, seed, start, span, number_from=0, batch_size=10_000):
+    """Yield batches of registration tuples.
+
+    Args:
+        count: Number of registrations
+        seed: Random seed
+        start: Naive UTC datetime of the first registration
+        span: timedelta the registrations are spread over
+        number_from: First running number used in emails
+        batch_size: Rows per yielded batch
+
+    Yields:
+        list: (name, email, company, job_title, created_at) tuples
+    """
+    rng = random.Random(f'registrations:{seed}')
+    for offset in range(0, count, batch_size):
+        n = min(batch_size, count - offset)
+        firsts = rng.choices(FIRST_NAMES, k=n)
+        lasts = rng.choices(LAST_NAMES, k=n)
+        domains = rng.choices(EMAIL_DOMAINS, k=n)
+        companies = rng.choices(COMPANIES, k=n)
+        titles = rng.choices(JOB_TITLES, k=n)
+        created = _timestamps(rng, offset, n, count, start, span)
+        number = number_from + offset
+        yield [
+            (f'{first} {last}', f'{first.lower()}.{last.lower()}{i}@{domain}',
+             company, title, created_at)
+            for i, first, last, domain, company, title, created_at
+            in zip(range(number, number + n), firsts, lasts, domains, companies, titles,
+                   created)
+        ]
+
+
+def generate_entries(count, seed, start, span, batch_size=10_000):
+    """Yield batches of entry tuples with short generated sentences.
+
+    Args:
+        count: Number of entries
+        seed: Random seed
+        start: Naive UTC datetime of the first entry
+        span: timedelta the entries are spread over
+        batch_size: Rows per yielded batch
+
+    Yields:
+        list: (value, created_at) tuples
+    """
+    rng = random.Random(f'entries:{seed}')
+    for offset in range(0, count, batch_size):
+        n = min(batch_size, count - offset)
+        words = rng.choices(ENTRY_WORDS, k=n * 3)
+        created = _timestamps(rng, offset, n, count, start, span)
+        yield [(' '.join(words[i * 3:i * 3 + 3]), created[i]) for i in range(n)]
+
+
+def generate_users(count, password_hash, number_from=0, batch_size=10_000):
+    """Yield batches of user tuples sharing one password hash.
+
+    Args:
+        count: Number of users
+        password_hash: Precomputed hash stored for every user
+        number_from: First running number used in usernames
+        batch_size: Rows per yielded batch
+
+    Yields:
+        list: (username, password_hash, is_active) tuples
+    """
+    for offset in range(0, count, batch_size):
+        n = min(batch_size, count - offset)
+        yield [(f'loadtest{number_from + offset + i}', password_hash, True)
+               for i in range(n)]
+
+
+def _write(batches, insert_batch):
+    """Insert batches, committing every COMMIT_EVERY rows; return the row count."""
+    written = uncommitted = 0
+    for batch in batches:
+        insert_batch(batch)
+        written += len(batch)
+        uncommitted += len(batch)
+        if uncommitted >= COMMIT_EVERY:
+            db.session.commit()
+            uncommitted = 0
+    db.session.commit()
+    return written
+
+
+@contextmanager
+def _sqlite_fast_writes():
+    """Skip fsync and the on-disk rollback journal on SQLite for the block.
+
+    A crash during the block can corrupt the database file, which is
+    acceptable for the load test databases flask seed is meant for. WAL
+    databases keep their journal; both settings are restored afterwards.
+    """
+    connection = db.session.connection()
+    if connection.dialect.name != 'sqlite':
+        yield
+        return
+    synchronous = connection.exec_driver_sql('PRAGMA synchronous').scalar()
+    journal_mode = connection.exec_driver_sql('PRAGMA journal_mode').scalar()
+    connection.exec_driver_sql('PRAGMA synchronous=OFF')
+    if journal_mode != 'wal':
+        connection.exec_driver_sql('PRAGMA journal_mode=MEMORY')
+    try:
+        yield
+    finally:
+        db.session.commit()
+        connection = db.session.connection()
+        connection.exec_driver_sql(f'PRAGMA journal_mode={journal_mode}')
+        connection.exec_driver_sql(f'PRAGMA synchronous={synchronous}')
+
+
+@contextmanager
+def _indexes_deferred(table, enabled, search_index=False, unique=False):
+    """Drop the table's non-unique indexes for the block and recreate them after.
+
+    With ``unique`` the unique indexes are dropped too; only safe when the
+    block cannot insert duplicates. With ``search_index`` the registration
+    full-text index is deferred as well: on SQLite its insert trigger is
+    suspended and the new rows indexed at the end, whatever the size (see
+    app.search.suspend_insert_indexing, fresh loads only); on PostgreSQL
+    large loads drop and rebuild the search column. SQL Server populates
+    its index in the background anyway.
+    """
+    indexes = [index for index in table.indexes if unique or not index.unique] if enabled else []
+    connection = db.session.connection()
+    rebuild_search = enabled and search_index and connection.dialect.name == 'postgresql'
+    for index in indexes:
+        index.drop(connection)
+    if rebuild_search:
+        drop_search_index(connection)
+    last_id = suspend_insert_indexing(connection) if search_index else None
+    try:
+        yield
+    except Exception:
+        db.session.rollback()
+        raise
+    finally:
+        connection = db.session.connection()
+        for index in indexes:
+            index.create(connection, checkfirst=True)
+        if rebuild_search:
+            create_search_index(connection)
+        resume_insert_indexing(connection, last_id)
+        db.session.commit()
+
+
+def _write_registrations(count, seed, start, span, batch_size):
+    """Insert registrations; return (rows, insert seconds, index seconds).
+
+    The index seconds are None when no index was deferred.
+    """
+    number_from = db.session.execute(select(func.count(Registration.id))).scalar()
+    # Emails continue after the existing rows, so only a load into an empty
+    # table is known to be free of duplicates. Top-ups keep the search
+    # trigger: an interrupted top-up must not leave later rows unindexed.
+    fresh = number_from == 0
+    large = count >= INDEX_REBUILD_THRESHOLD
+    with _indexes_deferred(Registration.__table__, large, search_index=fresh, unique=fresh):
+        began = time.perf_counter()
+        rows = _write(
+            generate_registrations(count, seed, start, span, number_from, batch_size),
+            _bulk_insert(Registration.__table__, BULK_COLUMNS)
+        )
+        inserted = time.perf_counter()
+    index_seconds = time.perf_counter() - inserted if fresh or large else None
+    return rows, inserted - began, index_seconds
+
+
+def _bulk_insert(table, columns):
+    def insert_batch(batch):
+        insert_rows(db.session.connection(), table, columns, batch)
+    return insert_batch
+
+
+def seed_database(registrations=0, entries=0, users=0, seed=0, days=90, end=None,
+                  user_password='loadtest-password', batch_size=10_000):
+    """Insert synthetic registrations, entries and users.
+
+    Must run inside an application context.
+
+    Args:
+        registrations: Number of registrations to insert
+        entries: Number of entries to insert
+        users: Number of admin users to insert (all share user_password)
+        seed: Random seed; the same seed gives the same rows
+        days: Number of days the created_at values are spread over
+        end: Naive UTC datetime of the newest row (default: today at midnight)
+        user_password: Password for the seeded users, hashed once
+        batch_size: Rows generated and inserted per executemany
+
+    Returns:
+        dict: {table name: (rows inserted, seconds)}, plus
+        REGISTRATION_INDEXES: (rows indexed, seconds) when registration
+        indexes were deferred, for their rebuild and the full-text
+        indexing, which are not part of the registrations time
+    """
+    if end is None:
+        end = datetime.now(timezone.utc).replace(
+            tzinfo=None, hour=0, minute=0, second=0, microsecond=0
+        )
+    span = timedelta(days=days)
+    start = end - span
+    timings = {}
+
+    def timed(name, write):
+        began = time.perf_counter()
+        rows = write()
+        timings[name] = (rows, time.perf_counter() - began)
+
+    with _sqlite_fast_writes():
+        if registrations:
+            rows, insert_seconds, index_seconds = _write_registrations(
+                registrations, seed, start, span, batch_size
+            )
+            timings[Registration.__tablename__] = (rows, insert_seconds)
+            if index_seconds is not None:
+                timings[REGISTRATION_INDEXES] = (rows, index_seconds)
+
+        if entries:
+            timed(Entry.__tablename__, lambda: _write(
+                generate_entries(entries, seed, start, span, batch_size),
+                _bulk_insert(Entry.__table__, ('value', 'created_at'))
+            ))
+
+    if registrations:
+        RegistrationService.rebuild_daily_stats()
+        RegistrationService.rebuild_sketches()
+    if entries:
+        current_app.extensions['entry_count'].invalidate()
+
+    if users:
+        number_from = db.session.execute(select(func.count(User.id))).scalar()
+        password_hash = generate_password_hash(
+            user_password, method=current_app.config['PASSWORD_HASH_METHOD']
+        )
+        timed(User.__tablename__, lambda: _write(
+            generate_users(users, password_hash, number_from, batch_size),
+            _bulk_insert(User.__table__, ('username', 'password_hash', 'is_active'))
+        ))
+
+    return timings
@@ -4,9 +4,9 @@ Services encapsulate business logic and database operations,
 keeping routes thin and focused on request/response handling.
 """
 
-from app.services.entry_service import EntryService
+from app.services.entry_service import EntryService, InvalidCursorError
 from app.services.registration_service import RegistrationService, DuplicateEmailError
-from app.services.auth_service import AuthService, DuplicateUsernameError
+from app.services.auth_service import AuthService, DuplicateUsernameError, PasswordVerifierBusyError
 
-__all__ = ['EntryService', 'RegistrationService', 'DuplicateEmailError',
-           'AuthService', 'DuplicateUsernameError']
+__all__ = ['EntryService', 'InvalidCursorError', 'RegistrationService', 'DuplicateEmailError',
+           'AuthService', 'DuplicateUsernameError', 'PasswordVerifierBusyError']
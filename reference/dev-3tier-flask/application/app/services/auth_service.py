@@ -1,7 +1,12 @@
 """Business logic for user authentication."""
+from flask import current_app, has_app_context
+from flask_login import UserMixin
+from sqlalchemy import event
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, object_session
 from app.extensions import db
 from app.models.user import User
+from app.passwords import PasswordVerifierBusyError  # noqa: F401 (re-exported)
 
 
 class DuplicateUsernameError(Exception):
@@ -9,6 +14,29 @@ class DuplicateUsernameError(Exception):
     pass
 
 
+class UserSnapshot(UserMixin):
+    """Read-only copy of a User for Flask-Login's current_user.
+
+    Holds plain values rather than an ORM instance, so it can be cached
+    and shared between requests without being bound to any session.
+    """
+
+    __slots__ = ('id', 'username', 'is_active')
+
+    def __init__(self, id, username, is_active):
+        self.id = id
+        self.username = username
+        self.is_active = is_active
+
+    @classmethod
+    def from_user(cls, user):
+        """Create a snapshot from a User model instance."""
+        return cls(user.id, user.username, bool(user.is_active))
+
+    def __repr__(self):
+        return f'<UserSnapshot {self.username}>'
+
+
 class AuthService:
     """Service layer for authentication operations."""
 
@@ -20,13 +48,29 @@ class AuthService:
             username: User's username
             password: Plain text password to verify
 
+        The hash check runs on the app's bounded PasswordVerifier pool. If
+        the stored hash was made with different parameters than the
+        configured PASSWORD_HASH_METHOD, it is replaced with a fresh hash
+        after a successful login.
+
         Returns:
             User: The authenticated user, or None if authentication fails
+
+        Raises:
+            PasswordVerifierBusyError: If too many logins are being verified
         """
         user = User.query.filter_by(username=username).first()
-        if user and user.is_active and user.check_password(password):
-            return user
-        return None
+        if not (user and user.is_active):
+            return None
+
+        verifier = current_app.extensions['password_verifier']
+        if not verifier.verify(user.password_hash, password):
+            return None
+
+        if verifier.needs_rehash(user.password_hash):
+            user.password_hash = verifier.hash(password)
+            db.session.commit()
+        return user
 
     @staticmethod
     def create_user(username, password):
@@ -43,7 +87,7 @@ class AuthService:
             DuplicateUsernameError: If username already exists
         """
         user = User(username=username)
-        user.set_password(password)
+        user.set_password(password, method=current_app.config['PASSWORD_HASH_METHOD'])
         try:
             db.session.add(user)
             db.session.commit()
@@ -64,6 +108,46 @@ class AuthService:
         """
         return db.session.get(User, int(user_id))
 
+    @staticmethod
+    def load_user(user_id):
+        """Load a user snapshot for Flask-Login, using the per-process cache.
+
+        Every authenticated request calls this, so snapshots are kept in a
+        TTL+LRU cache (USER_CACHE_TTL / USER_CACHE_SIZE) to skip the
+        primary-key query. Entries are invalidated when a User row is
+        inserted, updated or deleted and the transaction commits; changes
+        made by other workers are picked up when the TTL expires.
+
+        Args:
+            user_id: User's database ID (string from the session)
+
+        Returns:
+            UserSnapshot: The user, or None if not found
+        """
+        try:
+            user_id = int(user_id)
+        except (TypeError, ValueError):
+            return None
+
+        cache = current_app.extensions['user_cache']
+        snapshot = cache.get(user_id)
+        if snapshot is None:
+            user = AuthService.get_user_by_id(user_id)
+            if user is None:
+                return None
+            snapshot = UserSnapshot.from_user(user)
+            cache.set(user_id, snapshot)
+        return snapshot
+
+    @staticmethod
+    def user_cache_stats():
+        """Get hit/miss counters for the user loader cache.
+
+        Returns:
+            dict: Cache statistics for this worker process
+        """
+        return current_app.extensions['user_cache'].stats()
+
     @staticmethod
     def get_user_by_username(username):
         """Get user by username.
@@ -75,3 +159,30 @@ class AuthService:
             User: The user object, or None if not found
         """
         return User.query.filter_by(username=username).first()
+
+
+# Cache invalidation: collect changed user ids at flush time and evict them
+# only once the transaction commits, so a concurrent request cannot re-cache
+# the old row between the flush and the commit.
+@event.listens_for(User, 'after_insert')
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _queue_user_invalidation(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault('changed_user_ids', set()).add(target.id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_committed_users(session):
+    user_ids = session.info.pop('changed_user_ids', None)
+    if user_ids and has_app_context():
+        cache = current_app.extensions.get('user_cache')
+        if cache is not None:
+            for user_id in user_ids:
+                cache.invalidate(user_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_user_invalidation(session):
+    session.info.pop('changed_user_ids', None)
@@ -0,0 +1,103 @@
+"""Entry count provider with exact, cached and estimated modes."""
+
+import threading
+import time
+from sqlalchemy import func, select, text
+from app.extensions import db
+from app.models.entry import Entry
+
+
+class EntryCountProvider:
+    """Supplies the number of entries without a COUNT(*) on every request.
+
+    Modes (ENTRY_COUNT_MODE):
+        exact: Run SELECT COUNT(*) on every call.
+        cached: Keep an in-process counter, incremented by
+            EntryService.create_entry and reconciled with an exact count
+            every ``reconcile_interval`` seconds. Entries created by other
+            workers show up after the next reconcile.
+        estimated: On PostgreSQL, use the planner's row estimate from
+            pg_class.reltuples once it reaches ``estimate_threshold``; below
+            that, or on other databases, behave like cached.
+    """
+
+    MODES = ('exact', 'cached', 'estimated')
+
+    def __init__(self, mode='cached', reconcile_interval=60, estimate_threshold=100000,
+                 clock=time.monotonic):
+        """Create a provider.
+
+        Args:
+            mode: One of MODES
+            reconcile_interval: Seconds between exact counts in cached mode
+            estimate_threshold: Minimum estimated rows before the PostgreSQL
+                estimate is used instead of the cached count
+            clock: Monotonic time source (injectable for tests)
+
+        Raises:
+            ValueError: If mode is not one of MODES
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"ENTRY_COUNT_MODE must be one of {', '.join(self.MODES)}.")
+        self.mode = mode
+        self.reconcile_interval = reconcile_interval
+        self.estimate_threshold = estimate_threshold
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._value = None
+        self._reconciled_at = None
+
+    def count(self):
+        """Get the entry count according to the configured mode.
+
+        Returns:
+            int: Number of entries (approximate in cached/estimated modes)
+        """
+        if self.mode == 'exact':
+            return self._exact_count()
+        if self.mode == 'estimated':
+            estimate = self._estimated_count()
+            if estimate is not None and estimate >= self.estimate_threshold:
+                return estimate
+        return self._cached_count()
+
+    def increment(self, amount=1):
+        """Record entries committed by this process.
+
+        Args:
+            amount: Number of entries created
+        """
+        with self._lock:
+            if self._value is not None:
+                self._value += amount
+
+    def invalidate(self):
+        """Force an exact count on the next call."""
+        with self._lock:
+            self._value = None
+
+    def _cached_count(self):
+        with self._lock:
+            now = self._clock()
+            if self._value is None or now - self._reconciled_at >= self.reconcile_interval:
+                self._value = self._exact_count()
+                self._reconciled_at = now
+            return self._value
+
+    @staticmethod
+    def _exact_count():
+        return db.session.execute(select(func.count()).select_from(Entry)).scalar()
+
+    @staticmethod
+    def _estimated_count():
+        """Planner row estimate on PostgreSQL, or None when unavailable."""
+        if db.session.get_bind().dialect.name != 'postgresql':
+            return None
+        estimate = db.session.execute(
+            text('SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)'),
+            {'table': Entry.__tablename__}
+        ).scalar()
+        # -1 means the table has never been vacuumed or analyzed
+        if estimate is None or estimate < 0:
+            return None
+        return int(estimate)
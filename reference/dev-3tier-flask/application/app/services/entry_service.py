@@ -1,7 +1,18 @@
 """Entry service for business logic and database operations."""
 
+import base64
+import binascii
+from datetime import datetime, timezone
+from flask import current_app
+from sqlalchemy import and_, func, insert, or_, select
 from app.extensions import db
 from app.models.entry import Entry
+from app.projections import EntryRow, fetch_rows, iter_rows, select_rows
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+    pass
 
 
 class EntryService:
@@ -20,16 +31,176 @@ class EntryService:
         entry = Entry(value=value)
         db.session.add(entry)
         db.session.commit()
+        current_app.extensions['entry_count'].increment()
         return entry
 
+    @staticmethod
+    def create_entries(values):
+        """Create many entries in one transaction.
+
+        All rows are written with a single executemany INSERT (batched
+        INSERT ... RETURNING where the driver supports it) and one commit,
+        so the cost per entry is a fraction of create_entry's.
+
+        Args:
+            values: List of text values, already validated.
+
+        Returns:
+            list: Ids of the created entries, in the order of ``values``.
+        """
+        if not values:
+            return []
+        created_at = datetime.now(timezone.utc)
+        ids = db.session.execute(
+            insert(Entry).returning(Entry.id, sort_by_parameter_order=True),
+            [{'value': value, 'created_at': created_at} for value in values]
+        ).scalars().all()
+        db.session.commit()
+        current_app.extensions['entry_count'].increment(len(ids))
+        return ids
+
+    @staticmethod
+    def submit_entry(value):
+        """Save an entry through the write buffer when it is enabled.
+
+        With ENTRY_WRITE_BUFFER the entry is committed together with other
+        pending entries (see app.write_buffer); whether this returns before
+        or after that commit depends on ENTRY_BUFFER_DURABILITY. Otherwise
+        this is create_entry.
+
+        Args:
+            value: The text value for the entry.
+
+        Raises:
+            WriteBufferFullError: If the buffer's queue limit is reached
+            TimeoutError: If the commit is not confirmed in time ('flush'
+                durability); the entry may still be written afterwards
+        """
+        buffer = current_app.extensions.get('entry_buffer')
+        if buffer is None:
+            EntryService.create_entry(value)
+            return
+        buffer.submit({'value': value, 'created_at': datetime.now(timezone.utc)})
+
     @staticmethod
     def get_all_entries():
         """Get all entries ordered by creation date (newest first).
 
         Returns:
-            List of all Entry instances.
+            List of EntryRow (read-only, see app.projections).
+        """
+        return fetch_rows(EntryRow, select_rows(EntryRow).order_by(Entry.created_at.desc()))
+
+    @staticmethod
+    def get_entries_page(limit, after=None):
+        """Get one page of entries using keyset pagination.
+
+        Entries are ordered newest first on (created_at, id). Instead of an
+        OFFSET, the cursor of the last row seen is used to seek directly to
+        the next page, so every page costs the same regardless of depth.
+
+        Args:
+            limit: Maximum number of entries to return.
+            after: Opaque cursor returned by a previous call, or None for
+                the first page.
+
+        Returns:
+            tuple: (list of EntryRow, cursor for the next page or None)
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        entries = fetch_rows(EntryRow, EntryService._keyset_query(after).limit(limit + 1))
+
+        next_cursor = None
+        if len(entries) > limit:
+            entries = entries[:limit]
+            next_cursor = EntryService.encode_cursor(entries[-1])
+        return entries, next_cursor
+
+    @staticmethod
+    def iter_entries(after=None, batch_size=1000):
+        """Iterate over entries without loading the whole table.
+
+        Rows are fetched from the database in batches of ``batch_size``
+        using ``yield_per`` (a server-side cursor on PostgreSQL), so memory
+        use stays flat no matter how many entries exist.
+
+        Args:
+            after: Optional cursor to start after.
+            batch_size: Number of rows fetched per round trip.
+
+        Yields:
+            EntryRow objects, newest first.
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        yield from iter_rows(EntryRow, EntryService._keyset_query(after), batch_size)
+
+    @staticmethod
+    def _keyset_query(after=None):
+        """Build the ordered entries query, seeking past ``after`` if given."""
+        query = select_rows(EntryRow).order_by(Entry.created_at.desc(), Entry.id.desc())
+        if after:
+            created_at, entry_id = EntryService.decode_cursor(after)
+            # Expanded row-value comparison; SQL Server has no (a, b) < (x, y)
+            query = query.where(or_(
+                Entry.created_at < created_at,
+                and_(Entry.created_at == created_at, Entry.id < entry_id)
+            ))
+        return query
+
+    @staticmethod
+    def encode_cursor(entry):
+        """Encode an entry's sort key as an opaque URL-safe cursor.
+
+        Args:
+            entry: The last entry (Entry or EntryRow) on the current page.
+
+        Returns:
+            str: Cursor string for the ``after`` query parameter.
         """
-        return Entry.query.order_by(Entry.created_at.desc()).all()
+        raw = f'{entry.created_at.replace(tzinfo=None).isoformat()}|{entry.id}'
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """Decode a cursor produced by encode_cursor.
+
+        Args:
+            cursor: Cursor string from the client.
+
+        Returns:
+            tuple: (created_at datetime, entry id)
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            raw = base64.urlsafe_b64decode(padded.encode()).decode()
+            created_at, entry_id = raw.split('|')
+            return datetime.fromisoformat(created_at), int(entry_id)
+        except (binascii.Error, UnicodeError, ValueError):
+            raise InvalidCursorError(f"Invalid cursor '{cursor}'.")
+
+    @staticmethod
+    def get_watermark():
+        """Get a cheap fingerprint of the entries table's current state.
+
+        One aggregate query: the highest id changes whenever an entry is
+        added, and the count also catches deletions. No rows are loaded.
+
+        Returns:
+            dict: max_id, count and last_modified (aware UTC datetime or None)
+        """
+        max_id, count, last_created = db.session.execute(
+            select(func.max(Entry.id), func.count(Entry.id), func.max(Entry.created_at))
+        ).one()
+        if last_created is not None and last_created.tzinfo is None:
+            last_created = last_created.replace(tzinfo=timezone.utc)
+        return {'max_id': max_id or 0, 'count': count, 'last_modified': last_created}
 
     @staticmethod
     def get_recent_entries(limit=10):
@@ -39,15 +210,21 @@ class EntryService:
             limit: Maximum number of entries to return.
 
         Returns:
-            List of Entry instances.
+            List of EntryRow (read-only, see app.projections).
         """
-        return Entry.query.order_by(Entry.created_at.desc()).limit(limit).all()
+        return fetch_rows(
+            EntryRow, select_rows(EntryRow).order_by(Entry.created_at.desc()).limit(limit)
+        )
 
     @staticmethod
     def get_entry_count():
         """Get the total count of entries.
 
+        Uses the app's EntryCountProvider, so depending on ENTRY_COUNT_MODE
+        the result may be cached or a planner estimate rather than an
+        exact COUNT(*).
+
         Returns:
             Integer count of entries.
         """
-        return Entry.query.count()
+        return current_app.extensions['entry_count'].count()
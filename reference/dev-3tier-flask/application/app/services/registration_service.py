@@ -1,8 +1,21 @@
 """Business logic for webinar registrations."""
+from collections import Counter
+from datetime import datetime, timezone
+from flask import current_app
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import func
+from sqlalchemy import and_, case, delete, exists, func, insert, or_, select, update
 from app.extensions import db
+from app import search
+from app.bulk import insert_rows
 from app.models.registration import Registration
+from app.models.registration_sketch import RegistrationSketch, RegistrationSketchDelta
+from app.models.registration_stat import RegistrationDailyStat
+from app.projections import RegistrationRow, fetch_rows, iter_rows, paginate_rows, select_rows
+from app.sketches import ColumnSketch
+
+
+# Columns written by _bulk_insert, in tuple order
+BULK_COLUMNS = ('name', 'email', 'company', 'job_title', 'created_at')
 
 
 class DuplicateEmailError(Exception):
@@ -31,22 +44,349 @@ class RegistrationService:
         """
         registration = Registration(
             name=name,
-            email=email.lower().strip(),  # Normalize email
+            email=RegistrationService.normalize_email(email),
             company=company,
             job_title=job_title
         )
         try:
             db.session.add(registration)
-            db.session.commit()
-            return registration
+            db.session.flush()
         except IntegrityError:
             db.session.rollback()
             raise DuplicateEmailError(f"Email '{email}' is already registered.")
 
+        # Same transaction: the rollups can never count a rolled-back row
+        RegistrationService._increment_daily_stat(registration.created_at.date())
+        RegistrationService._add_sketch_deltas([{
+            column: getattr(registration, column)
+            for column in RegistrationService.SKETCH_COLUMNS
+        }])
+        db.session.commit()
+        RegistrationService._publish_change()
+        return registration
+
+    @staticmethod
+    def normalize_email(email):
+        """Normalize an email address for storage and comparison.
+
+        Args:
+            email: Email address as entered
+
+        Returns:
+            str: Lowercased email without surrounding whitespace
+        """
+        return email.lower().strip()
+
+    @staticmethod
+    def import_registrations(rows, batch_size=1000):
+        """Bulk-insert registrations from an iterable of dicts.
+
+        Rows are consumed lazily and written in batches, one transaction
+        per batch. Within a batch, emails are normalized and de-duplicated,
+        and emails already in the database are found with one IN query, so
+        there is no round trip per row. Each batch is written with the
+        fastest path the driver offers (see _bulk_insert) and the daily
+        statistics rollup is updated in the same transaction. The search
+        index stays live, so every committed batch is searchable even if
+        the import is interrupted.
+
+        Args:
+            rows: Iterable of dicts with name, email, company, job_title and
+                optionally created_at (datetime or ISO 8601 string)
+            batch_size: Rows per INSERT batch and transaction
+
+        Returns:
+            dict: Counts of 'inserted', 'duplicates' and 'invalid' rows
+        """
+        result = {'inserted': 0, 'duplicates': 0, 'invalid': 0}
+        batch = {}
+
+        for row in rows:
+            record = RegistrationService._clean_import_row(row)
+            if record is None:
+                result['invalid'] += 1
+            elif record['email'] in batch:
+                result['duplicates'] += 1
+            else:
+                batch[record['email']] = record
+
+            if len(batch) >= batch_size:
+                RegistrationService._import_batch(batch, result)
+                batch = {}
+
+        if batch:
+            RegistrationService._import_batch(batch, result)
+        return result
+
+    @staticmethod
+    def _clean_import_row(row):
+        """Validate and normalize one import row, or return None if invalid."""
+        try:
+            record = {
+                'name': (row.get('name') or '').strip(),
+                'email': RegistrationService.normalize_email(row.get('email') or ''),
+                'company': (row.get('company') or '').strip(),
+                'job_title': (row.get('job_title') or '').strip(),
+            }
+            created_at = row.get('created_at')
+            if isinstance(created_at, str):
+                created_at = datetime.fromisoformat(created_at) if created_at.strip() else None
+        except ValueError:
+            return None
+
+        if not all(record.values()) or '@' not in record['email']:
+            return None
+        for column in ('name', 'email', 'company', 'job_title'):
+            if len(record[column]) > Registration.__table__.c[column].type.length:
+                return None
+
+        if created_at is None:
+            created_at = datetime.now(timezone.utc)
+        # Stored naive in UTC, like rows created through the ORM
+        if created_at.tzinfo is not None:
+            created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+        record['created_at'] = created_at
+        return record
+
+    @staticmethod
+    def _import_batch(batch, result):
+        """Insert one de-duplicated batch, skipping emails already stored."""
+        existing = set(db.session.execute(
+            select(Registration.email).where(Registration.email.in_(list(batch)))
+        ).scalars())
+        records = [r for email, r in batch.items() if email not in existing]
+
+        if records:
+            RegistrationService._bulk_insert(records)
+            days = Counter(r['created_at'].date() for r in records)
+            for day, amount in days.items():
+                RegistrationService._increment_daily_stat(day, amount)
+            RegistrationService._add_sketch_deltas(records)
+        db.session.commit()
+        if records:
+            RegistrationService._publish_change()
+
+        result['inserted'] += len(records)
+        result['duplicates'] += len(existing)
+
+    @staticmethod
+    def _bulk_insert(records):
+        """Write a batch of registration dicts using the driver's fastest path (app.bulk)."""
+        insert_rows(db.session.connection(), Registration.__table__, BULK_COLUMNS,
+                    [(r['name'], r['email'], r['company'], r['job_title'], r['created_at'])
+                     for r in records])
+
+    @staticmethod
+    def _increment_daily_stat(day, amount=1):
+        """Add ``amount`` to the rollup row for ``day``, creating it if needed.
+
+        Must be called inside the transaction that inserted the
+        registrations. The UPDATE is tried first because the row for today
+        almost always exists; the INSERT runs in a savepoint so that losing
+        a race with another worker falls back to the UPDATE instead of
+        aborting the registration.
+        """
+        increment = update(RegistrationDailyStat).where(
+            RegistrationDailyStat.day == day
+        ).values(count=RegistrationDailyStat.count + amount).execution_options(
+            synchronize_session=False
+        )
+        if db.session.execute(increment).rowcount:
+            return
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(RegistrationDailyStat).values(day=day, count=amount))
+        except IntegrityError:
+            # Another worker created the row between our UPDATE and INSERT
+            db.session.execute(increment)
+
+    # Columns summarized by the attendee analytics sketches
+    SKETCH_COLUMNS = ('company', 'job_title')
+
+    # Deltas read and deleted per statement when folding (SQL Server
+    # accepts at most 2100 parameters per statement)
+    SKETCH_FOLD_BATCH = 1000
+
+    @staticmethod
+    def _add_sketch_deltas(records):
+        """Queue registrations for the analytics sketches (see app.sketches).
+
+        Must be called inside the transaction that inserted the
+        registrations, so a rollback discards the deltas too. Only inserts
+        rows (one per distinct value and column), so concurrent writers do
+        not lock each other; get_attendee_analytics folds them in.
+
+        Args:
+            records: Dicts (or mappings) with the SKETCH_COLUMNS values
+        """
+        db.session.execute(insert(RegistrationSketchDelta), [
+            {'name': column, 'value': value, 'amount': amount}
+            for column in RegistrationService.SKETCH_COLUMNS
+            for value, amount in Counter(r[column] for r in records).items()
+        ])
+
+    @staticmethod
+    def fold_sketch_deltas():
+        """Fold the queued deltas into the sketches and delete them.
+
+        The sketch rows are locked (FOR UPDATE) for the fold, so concurrent
+        folds take turns and each delta is counted once; registrations
+        never take this lock.
+
+        Returns:
+            dict: {column: ColumnSketch} after the fold, for each of
+            SKETCH_COLUMNS
+        """
+        columns = RegistrationService.SKETCH_COLUMNS
+        rows = {row.name: row for row in db.session.execute(
+            select(RegistrationSketch)
+            .where(RegistrationSketch.name.in_(columns))
+            .order_by(RegistrationSketch.name)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        ).scalars()}
+        sketches = {column: ColumnSketch.from_bytes(rows[column].data) if column in rows
+                    else ColumnSketch() for column in columns}
+
+        folded = False
+        while True:
+            deltas = db.session.execute(
+                select(RegistrationSketchDelta.id, RegistrationSketchDelta.name,
+                       RegistrationSketchDelta.value, RegistrationSketchDelta.amount)
+                .order_by(RegistrationSketchDelta.id)
+                .limit(RegistrationService.SKETCH_FOLD_BATCH)
+            ).all()
+            for _, column, value, amount in deltas:
+                if column in sketches:
+                    sketches[column].add(value, amount)
+            if deltas:
+                # By id, not by range: a delta committed later with a lower
+                # id stays queued for the next fold
+                db.session.execute(delete(RegistrationSketchDelta).where(
+                    RegistrationSketchDelta.id.in_([delta.id for delta in deltas])
+                ))
+                folded = True
+            if len(deltas) < RegistrationService.SKETCH_FOLD_BATCH:
+                break
+
+        if folded:
+            for column in columns:
+                row = rows.get(column) or RegistrationService._create_sketch_row(column)
+                row.data = sketches[column].to_bytes()
+        db.session.commit()
+        return sketches
+
+    @staticmethod
+    def _create_sketch_row(column):
+        """Insert an empty sketch row, or lock the one another worker just created."""
+        try:
+            with db.session.begin_nested():
+                row = RegistrationSketch(name=column, data=ColumnSketch().to_bytes())
+                db.session.add(row)
+            return row
+        except IntegrityError:
+            return db.session.execute(
+                select(RegistrationSketch).where(RegistrationSketch.name == column)
+                .with_for_update().execution_options(populate_existing=True)
+            ).scalar_one()
+
+    @staticmethod
+    def get_attendee_analytics(top=10):
+        """Get distinct counts and most common values for companies and job titles.
+
+        Reads the persisted sketches (one row per column) with one query
+        that also checks for queued deltas. Only when deltas are queued is
+        the fold run (a locking write); without sketch rows or deltas the
+        analytics are empty and nothing is written. The cost does not
+        depend on the number of registrations.
+        Distinct counts are estimates within about 2%; top counts are upper
+        bounds, exact unless a value's ``error`` is non-zero.
+
+        Args:
+            top: Number of most common values per column
+
+        Returns:
+            dict: {column: {'distinct': int, 'top': [{'name', 'count',
+            'error'}, ...]}} for each of SKETCH_COLUMNS
+        """
+        pending = exists(select(RegistrationSketchDelta.id)).label('pending')
+        rows = db.session.execute(
+            select(RegistrationSketch.name, RegistrationSketch.data, pending)
+        ).all()
+        if rows:
+            has_deltas = rows[0].pending
+        else:
+            has_deltas = db.session.execute(select(pending)).scalar()
+        if has_deltas:
+            sketches = RegistrationService.fold_sketch_deltas()
+        else:
+            sketches = {row.name: ColumnSketch.from_bytes(row.data) for row in rows}
+
+        analytics = {}
+        for column in RegistrationService.SKETCH_COLUMNS:
+            sketch = sketches.get(column) or ColumnSketch()
+            analytics[column] = {
+                'distinct': sketch.distinct.count(),
+                'top': sketch.frequent.top(top),
+            }
+        return analytics
+
+    @staticmethod
+    def rebuild_sketches(batch_size=10_000):
+        """Recompute the analytics sketches from the registrations table.
+
+        Groups each column once, largest groups first, and drops the queued
+        deltas, which the table already includes. Memory grows with the
+        number of distinct values; the top values are exact afterwards.
+
+        Args:
+            batch_size: Groups fetched per round trip
+
+        Returns:
+            dict: Estimated distinct values per column
+        """
+        db.session.execute(delete(RegistrationSketchDelta))
+        sketches = {}
+        for column in RegistrationService.SKETCH_COLUMNS:
+            field = getattr(Registration, column)
+            count = func.count(Registration.id)
+            counts = db.session.execute(
+                select(field, count).group_by(field).order_by(count.desc())
+                .execution_options(yield_per=batch_size)
+            )
+            sketches[column] = ColumnSketch.from_counts(counts)
+
+        db.session.execute(delete(RegistrationSketch))
+        db.session.add_all(RegistrationSketch(name=column, data=sketch.to_bytes())
+                           for column, sketch in sketches.items())
+        db.session.commit()
+        return {column: sketch.distinct.count() for column, sketch in sketches.items()}
+
     @staticmethod
     def get_all_registrations():
-        """Get all registrations ordered by creation date."""
-        return Registration.query.order_by(Registration.created_at.desc()).all()
+        """Get all registrations ordered by creation date, as RegistrationRow."""
+        return fetch_rows(RegistrationRow, select_rows(RegistrationRow).order_by(
+            Registration.created_at.desc()
+        ))
+
+    @staticmethod
+    def iter_registrations(batch_size=1000):
+        """Iterate over all registrations without loading the whole table.
+
+        Rows are fetched in batches of ``batch_size`` using ``yield_per``,
+        which uses a server-side cursor on PostgreSQL and SQL Server, so
+        memory use is bounded by the batch size rather than the table size.
+
+        Args:
+            batch_size: Number of rows fetched per round trip
+
+        Yields:
+            RegistrationRow objects ordered by creation date (newest first)
+        """
+        query = select_rows(RegistrationRow).order_by(
+            Registration.created_at.desc(), Registration.id.desc()
+        )
+        yield from iter_rows(RegistrationRow, query, batch_size)
 
     @staticmethod
     def get_registration_count():
@@ -63,53 +403,202 @@ class RegistrationService:
         Returns:
             bool: True if email exists, False otherwise
         """
-        normalized_email = email.lower().strip()
+        normalized_email = RegistrationService.normalize_email(email)
         return Registration.query.filter_by(email=normalized_email).first() is not None
 
+    # Sortable columns for the admin view. Each is backed by an index;
+    # email is unique, the others are indexed together with id so the id
+    # tie-breaker is served by the same index.
+    SORTABLE_COLUMNS = ['name', 'email', 'company', 'job_title', 'created_at']
+
     @staticmethod
-    def get_registrations_sorted(sort_by='created_at', order='desc'):
-        """Get registrations with sorting options.
+    def sorted_query(sort_by='created_at', order='desc'):
+        """Build a SELECT for registrations ordered by an indexed column.
 
         Args:
             sort_by: Field to sort by (name, email, company, job_title, created_at)
             order: Sort order ('asc' or 'desc')
 
         Returns:
-            List of Registration objects
+            Select: Ordered query of RegistrationRow columns, not yet executed
         """
-        valid_columns = ['name', 'email', 'company', 'job_title', 'created_at']
-        if sort_by not in valid_columns:
+        if sort_by not in RegistrationService.SORTABLE_COLUMNS:
             sort_by = 'created_at'
 
-        column = getattr(Registration, sort_by)
+        columns = [getattr(Registration, sort_by)]
+        if sort_by != 'email':
+            columns.append(Registration.id)
+
         if order == 'asc':
-            return Registration.query.order_by(column.asc()).all()
-        return Registration.query.order_by(column.desc()).all()
+            return select_rows(RegistrationRow).order_by(*[c.asc() for c in columns])
+        return select_rows(RegistrationRow).order_by(*[c.desc() for c in columns])
+
+    @staticmethod
+    def get_registrations_sorted(sort_by='created_at', order='desc'):
+        """Get registrations with sorting options.
+
+        Args:
+            sort_by: Field to sort by (name, email, company, job_title, created_at)
+            order: Sort order ('asc' or 'desc')
+
+        Returns:
+            List of RegistrationRow (read-only, see app.projections)
+        """
+        return fetch_rows(RegistrationRow, RegistrationService.sorted_query(sort_by, order))
+
+    @staticmethod
+    def get_registrations_page(page=1, per_page=50, sort_by='created_at', order='desc',
+                               max_per_page=None, total=None):
+        """Get one page of sorted registrations.
+
+        Only ``per_page`` rows are read, walking the index for the sort
+        column instead of sorting the whole table. Pass ``total`` (e.g.
+        get_registration_stats()['total'], read from the daily rollup) to
+        skip counting the table.
+
+        Args:
+            page: 1-based page number
+            per_page: Number of registrations per page
+            sort_by: Field to sort by (name, email, company, job_title, created_at)
+            order: Sort order ('asc' or 'desc')
+            max_per_page: Upper bound applied to per_page
+            total: Number of registrations, if already known; None counts them
+
+        Returns:
+            Pagination: Flask-SQLAlchemy pagination object of RegistrationRow
+        """
+        return paginate_rows(
+            RegistrationRow,
+            RegistrationService.sorted_query(sort_by, order),
+            page=page,
+            per_page=per_page,
+            max_per_page=max_per_page,
+            total=total
+        )
+
+    @staticmethod
+    def search_registrations(query, limit=50):
+        """Find registrations matching a search box query.
+
+        Uses the full-text index (see app.search): every word must match a
+        word in name, company, job_title or email, as a whole word or a
+        prefix. Only the top ``limit`` index matches are loaded. Backends
+        without a full-text index fall back to a LIKE scan.
+
+        Args:
+            query: Search text as typed
+            limit: Maximum number of registrations returned
+
+        Returns:
+            list: RegistrationRow objects, best match first (empty if the
+            query has no searchable words)
+        """
+        words = search.search_words(query)
+        if not words:
+            return []
+
+        dialect = db.session.get_bind().dialect.name
+        if not search.is_supported(dialect):
+            columns = [getattr(Registration, c) for c in search.COLUMNS]
+            query = select_rows(RegistrationRow).where(and_(*[
+                or_(*[column.ilike(f'%{word}%') for column in columns]) for word in words
+            ])).order_by(Registration.created_at.desc(), Registration.id.desc()).limit(limit)
+            return fetch_rows(RegistrationRow, query)
+
+        matches = search.match_subquery(dialect, words, limit)
+        query = select_rows(RegistrationRow).join(
+            matches, Registration.id == matches.c.id
+        ).order_by(matches.c.rank.desc(), Registration.id.desc())
+        return fetch_rows(RegistrationRow, query)
 
     @staticmethod
     def get_registration_stats():
         """Get registration statistics.
 
+        Reads the daily rollup table in one query (the total rides along
+        with the last seven days as a subquery), so the cost is
+        proportional to the number of days with registrations, not the
+        number of registrations.
+
         Returns:
-            dict: Statistics including total count and registrations by date
+            dict: Statistics including total count, today's count (UTC) and
+            registrations by date
         """
-        total = Registration.query.count()
-
-        # Registrations grouped by date
-        # Use CAST for SQL Server compatibility instead of func.date()
-        try:
-            by_date = db.session.query(
-                func.cast(Registration.created_at, db.Date).label('date'),
-                func.count(Registration.id).label('count')
-            ).group_by(func.cast(Registration.created_at, db.Date)).order_by(
-                func.cast(Registration.created_at, db.Date).desc()
-            ).limit(7).all()
-            by_date_result = [{'date': str(d.date), 'count': d.count} for d in by_date]
-        except Exception:
-            # Fallback if date grouping fails
-            by_date_result = []
+        total = select(
+            func.coalesce(func.sum(RegistrationDailyStat.count), 0)
+        ).correlate(None).scalar_subquery()
+        by_date = db.session.execute(
+            select(RegistrationDailyStat.day, RegistrationDailyStat.count, total.label('total'))
+            .order_by(RegistrationDailyStat.day.desc()).limit(7)
+        ).all()
+        by_date_result = [{'date': str(d.day), 'count': d.count} for d in by_date]
+        today = str(datetime.now(timezone.utc).date())
 
         return {
-            'total': total,
+            'total': by_date[0].total if by_date else 0,
+            'today': next((d['count'] for d in by_date_result if d['date'] == today), 0),
             'by_date': by_date_result
         }
+
+    @staticmethod
+    def get_live_counts():
+        """Get the counts pushed to open admin pages (see app.live_stats).
+
+        One query over the daily rollup table.
+
+        Returns:
+            dict: 'total' registrations and 'today' (UTC day)
+        """
+        today = datetime.now(timezone.utc).date()
+        total, today_count = db.session.execute(select(
+            func.coalesce(func.sum(RegistrationDailyStat.count), 0),
+            func.coalesce(func.sum(case(
+                (RegistrationDailyStat.day == today, RegistrationDailyStat.count), else_=0
+            )), 0)
+        )).one()
+        return {'total': total, 'today': today_count}
+
+    @staticmethod
+    def _publish_change():
+        """Tell open admin pages that the counts changed, after a commit."""
+        feed = current_app.extensions.get('live_stats')
+        if feed is not None:
+            feed.publish()
+
+    @staticmethod
+    def _created_day():
+        """SQL expression for the calendar day of Registration.created_at.
+
+        SQLite stores datetimes as text, where CAST(... AS DATE) yields a
+        number; date() returns the 'YYYY-MM-DD' string SQLAlchemy's Date
+        type expects. Other backends use CAST for SQL Server compatibility.
+        """
+        if db.session.get_bind().dialect.name == 'sqlite':
+            return func.date(Registration.created_at)
+        return func.cast(Registration.created_at, db.Date)
+
+    @staticmethod
+    def rebuild_daily_stats():
+        """Recompute the daily rollup from the registrations table.
+
+        Replaces every rollup row with a fresh GROUP BY over registrations.
+        Use it to repair drift, e.g. after rows were changed outside the
+        service layer.
+
+        Returns:
+            int: Number of days in the rebuilt rollup
+        """
+        day = RegistrationService._created_day()
+        db.session.execute(delete(RegistrationDailyStat))
+        db.session.execute(
+            insert(RegistrationDailyStat).from_select(
+                ['day', 'count'],
+                select(day, func.count(Registration.id))
+                .where(Registration.created_at.isnot(None))
+                .group_by(day)
+            )
+        )
+        db.session.commit()
+        RegistrationService._publish_change()
+        return db.session.execute(select(func.count()).select_from(RegistrationDailyStat)).scalar()
+
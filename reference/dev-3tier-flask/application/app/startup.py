@@ -0,0 +1,242 @@
+"""One-time startup tasks (table creation, admin bootstrap).
+
+Every gunicorn worker builds its own app, so work done in create_app runs
+once per worker and per boot. Startup tasks instead run once per schema
+version: the first process takes a database lock, runs the tasks, and
+records the version and step timings in the startup_markers table. Other
+workers read that marker with one query and skip the tasks entirely. A
+failed task or a lock wait that times out raises instead of letting the
+worker serve traffic; the marker is only written after every task succeeded.
+
+The version is a fingerprint of the model metadata plus the names of the
+enabled tasks, so adding a column or setting ADMIN_PASSWORD on an existing
+deployment triggers a new run.
+"""
+import hashlib
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from app.extensions import db
+from app.models.startup_marker import StartupMarker
+from app.search import create_search_index
+
+MARKER_NAME = 'startup'
+
+# Arbitrary constant identifying this application's advisory lock
+ADVISORY_LOCK_KEY = 4_240_117_301
+
+STARTUP_TASKS = []
+
+
+class StartupError(Exception):
+    """Raised when the startup tasks could neither run nor be confirmed done."""
+    pass
+
+
+def startup_task(name, enabled=None):
+    """Register a function as a startup task, run in registration order.
+
+    Args:
+        name: Step name used in logs and recorded timings
+        enabled: Optional callable taking the app; the task is skipped (and
+            left out of the version) when it returns False
+
+    Returns:
+        Decorator registering the task function
+    """
+    def decorator(func):
+        STARTUP_TASKS.append((name, func, enabled))
+        return func
+    return decorator
+
+
+def _enabled_tasks(app):
+    return [(name, func) for name, func, enabled in STARTUP_TASKS
+            if enabled is None or enabled(app)]
+
+
+def schema_version(app):
+    """Fingerprint of the model schema and the enabled startup tasks.
+
+    Args:
+        app: Flask application
+
+    Returns:
+        str: 16-character hex digest
+    """
+    digest = hashlib.sha256()
+    for table in sorted(db.metadata.tables.values(), key=lambda t: t.name):
+        digest.update(f'table {table.name}\n'.encode())
+        for column in table.columns:
+            digest.update(
+                f'{column.name} {column.type} {column.nullable} {column.primary_key}\n'.encode()
+            )
+        for index in sorted(table.indexes, key=lambda i: i.name):
+            columns = ','.join(column.name for column in index.columns)
+            digest.update(f'index {index.name} {columns} {index.unique}\n'.encode())
+    for name, _ in _enabled_tasks(app):
+        digest.update(f'task {name}\n'.encode())
+    return digest.hexdigest()[:16]
+
+
+def applied_version():
+    """Version recorded by the last completed run, or None."""
+    try:
+        return db.session.execute(
+            db.select(StartupMarker.version).where(StartupMarker.name == MARKER_NAME)
+        ).scalar()
+    except DBAPIError:
+        # The marker table does not exist before the first run
+        db.session.rollback()
+        return None
+
+
+@contextmanager
+def _startup_lock(timeout):
+    """Hold a database-wide lock so only one process runs the tasks.
+
+    PostgreSQL uses a session advisory lock and SQL Server an application
+    lock, both on a dedicated connection. Other databases (SQLite in
+    development) run unlocked.
+
+    Yields:
+        bool: True if the lock was acquired within ``timeout`` seconds
+    """
+    dialect = db.engine.dialect.name
+    if dialect not in ('postgresql', 'mssql'):
+        yield True
+        return
+
+    with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+        if dialect == 'postgresql':
+            deadline = time.monotonic() + timeout
+            acquired = False
+            while True:
+                acquired = connection.execute(
+                    text('SELECT pg_try_advisory_lock(:key)'), {'key': ADVISORY_LOCK_KEY}
+                ).scalar()
+                if acquired or time.monotonic() >= deadline:
+                    break
+                time.sleep(0.5)
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    connection.execute(
+                        text('SELECT pg_advisory_unlock(:key)'), {'key': ADVISORY_LOCK_KEY}
+                    )
+        else:
+            result = connection.execute(
+                text("DECLARE @result int; "
+                     "EXEC @result = sp_getapplock @Resource = :resource, "
+                     "@LockMode = 'Exclusive', @LockOwner = 'Session', @LockTimeout = :ms; "
+                     "SELECT @result"),
+                {'resource': f'app-{MARKER_NAME}', 'ms': int(timeout * 1000)}
+            ).scalar()
+            acquired = result is not None and result >= 0
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    connection.execute(
+                        text("EXEC sp_releaseapplock @Resource = :resource, "
+                             "@LockOwner = 'Session'"),
+                        {'resource': f'app-{MARKER_NAME}'}
+                    )
+
+
+def run_startup_tasks(app, force=False):
+    """Run the startup tasks unless this schema version was already applied.
+
+    Args:
+        app: Flask application (an app context must be active)
+        force: Run even if the recorded version matches
+
+    A failing task rolls back and propagates without recording the
+    marker, so the next process to start retries the tasks.
+
+    Returns:
+        dict: Step name -> duration in ms, or None if the tasks were
+        skipped (already applied, possibly by the process that held the
+        lock while this one waited)
+
+    Raises:
+        StartupError: If the lock was not acquired within
+            STARTUP_LOCK_TIMEOUT and the tasks are still not applied
+    """
+    version = schema_version(app)
+    if not force and applied_version() == version:
+        app.logger.debug('Startup tasks already applied for version %s', version)
+        return None
+
+    with _startup_lock(app.config['STARTUP_LOCK_TIMEOUT']) as acquired:
+        # Another process may have finished while we waited for the lock
+        if applied_version() == version and (not force or not acquired):
+            return None
+        if not acquired:
+            # Serving traffic before the tables and admin exist is worse
+            # than failing to boot (gunicorn restarts the worker)
+            raise StartupError(
+                f"Startup lock not acquired within {app.config['STARTUP_LOCK_TIMEOUT']} s "
+                f'and version {version} is not applied yet.'
+            )
+
+        timings = {}
+        started = time.perf_counter()
+        for name, func in _enabled_tasks(app):
+            step_started = time.perf_counter()
+            try:
+                func(app)
+            except Exception:
+                db.session.rollback()
+                app.logger.exception('Startup task %s failed; marker not recorded', name)
+                raise
+            timings[name] = round((time.perf_counter() - step_started) * 1000, 1)
+            app.logger.info('Startup task %s took %.1f ms', name, timings[name])
+
+        marker = db.session.get(StartupMarker, MARKER_NAME) or StartupMarker(name=MARKER_NAME)
+        marker.version = version
+        marker.completed_at = datetime.now(timezone.utc)
+        marker.duration_ms = int((time.perf_counter() - started) * 1000)
+        marker.steps = json.dumps(timings)
+        db.session.add(marker)
+        db.session.commit()
+        app.logger.info('Startup tasks for version %s completed in %d ms',
+                        version, marker.duration_ms)
+        return timings
+
+
+@startup_task('create_tables')
+def create_tables(app):
+    """Create missing tables (existing tables are not modified)."""
+    db.create_all()
+
+
+@startup_task('search_index')
+def search_index(app):
+    """Create the registration full-text index if it is missing (see app.search)."""
+    # Outside a transaction: SQL Server refuses full-text DDL inside one
+    with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+        create_search_index(connection)
+
+
+@startup_task('bootstrap_admin', enabled=lambda app: bool(app.config.get('ADMIN_PASSWORD')))
+def bootstrap_admin(app):
+    """Create the 'admin' user from ADMIN_PASSWORD if it does not exist.
+
+    Any other failure propagates, so the run is not recorded and is retried.
+    """
+    from app.models import User
+    from app.services.auth_service import AuthService, DuplicateUsernameError
+
+    if db.session.execute(db.select(User.id).filter_by(username='admin')).first():
+        return
+    try:
+        AuthService.create_user('admin', app.config['ADMIN_PASSWORD'])
+        app.logger.info('Default admin user created')
+    except DuplicateUsernameError:
+        # Created concurrently (e.g. by flask create-admin); nothing to do
+        db.session.rollback()
@@ -0,0 +1,263 @@
+"""Group commit: buffer inserts in-process and write them in batches.
+
+Committing every row on its own costs one transaction (and one fsync on
+the database server) per row. A GroupCommitBuffer collects rows from all
+threads of a worker and writes them with one executemany INSERT and one
+commit when either ``max_rows`` are pending or the oldest pending row has
+waited ``flush_interval`` seconds.
+
+Durability is a choice per buffer:
+
+- 'flush': submit() returns once the row is committed, and raises if the
+  batch failed. Rows from concurrent requests share a commit, so this
+  pays off with threaded workers or batch ingestion.
+- 'enqueue': submit() returns as soon as the row is queued. Fastest, but
+  rows still pending when a worker is killed (not shut down) are lost.
+
+The flusher thread is started on the first submit, so nothing runs before
+gunicorn forks workers. Pending rows are flushed by close(), which runs at
+interpreter exit and from gunicorn's worker_exit hook.
+"""
+import atexit
+import logging
+import threading
+import time
+from sqlalchemy import insert
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+
+DURABILITY_LEVELS = ('flush', 'enqueue')
+
+# Histogram buckets for flush sizes (rows) in the Prometheus metrics
+FLUSH_ROW_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+FLUSH_SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+class WriteBufferFullError(Exception):
+    """Raised when too many rows are already waiting to be written."""
+    pass
+
+
+class _Waiter:
+    """Lets a 'flush' submitter wait for its batch to be committed."""
+
+    __slots__ = ('done', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.error = None
+
+
+class GroupCommitBuffer:
+    """Buffers rows for one table and inserts them in batched transactions."""
+
+    def __init__(self, app, table, flush_interval=0.05, max_rows=500, durability='flush',
+                 queue_limit=10000, timeout=10, on_flush=None, metrics=None, name=None):
+        """Create a buffer.
+
+        Args:
+            app: Flask application, used for an app context in the flusher
+            table: SQLAlchemy Table the rows are inserted into
+            flush_interval: Maximum seconds a row waits before a flush
+            max_rows: Rows that trigger an immediate flush (and batch size)
+            durability: 'flush' or 'enqueue', see the module docstring
+            queue_limit: Maximum pending rows; submit() raises
+                WriteBufferFullError beyond it
+            timeout: Seconds a 'flush' submitter waits for its commit
+            on_flush: Optional callable taking the number of rows committed,
+                called after each successful flush
+            metrics: Optional MetricsRegistry receiving flush size/latency
+            name: Label for metrics and logs (defaults to the table name)
+
+        Raises:
+            ValueError: If durability is not a known level
+        """
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"durability must be one of {DURABILITY_LEVELS}, "
+                             f"not '{durability}'")
+        self.app = app
+        self.table = table
+        self.flush_interval = flush_interval
+        self.max_rows = max_rows
+        self.durability = durability
+        self.queue_limit = queue_limit
+        self.timeout = timeout
+        self.on_flush = on_flush
+        self.metrics = metrics
+        self.name = name or table.name
+
+        self._cond = threading.Condition()
+        self._pending = []  # (row, waiter or None)
+        self._oldest = None  # monotonic time the oldest pending row arrived
+        self._flush_lock = threading.Lock()  # one flush at a time
+        self._thread = None
+        self._closed = False
+
+        self.flushes = 0
+        self.rows_written = 0
+        self.rows_failed = 0
+        self.max_batch = 0
+        self.flush_seconds_total = 0.0
+        self.flush_seconds_max = 0.0
+        self.last_error = None
+
+    def _start(self):
+        # Called with self._cond held
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True,
+                                            name=f'write-buffer-{self.name}')
+            self._thread.start()
+            atexit.register(self.close)
+
+    def submit(self, row):
+        """Queue one row for insertion.
+
+        In 'flush' mode this blocks until the row's batch is committed.
+
+        Args:
+            row: Dict of column values
+
+        Raises:
+            WriteBufferFullError: If queue_limit rows are already pending
+            RuntimeError: If the buffer is closed
+            TimeoutError: If the commit does not happen within ``timeout``
+            Exception: Whatever the batch INSERT raised ('flush' mode)
+        """
+        waiter = _Waiter() if self.durability == 'flush' else None
+        with self._cond:
+            if self._closed:
+                raise RuntimeError(f'Write buffer {self.name} is closed.')
+            if len(self._pending) >= self.queue_limit:
+                raise WriteBufferFullError(f'{len(self._pending)} rows already pending.')
+            self._start()
+            if not self._pending:
+                self._oldest = time.monotonic()
+            self._pending.append((row, waiter))
+            # Wake the flusher to start the interval, or to flush a full batch
+            if len(self._pending) == 1 or len(self._pending) >= self.max_rows:
+                self._cond.notify()
+
+        if waiter is None:
+            return
+        if not waiter.done.wait(self.timeout):
+            raise TimeoutError(f'Write buffer {self.name} did not commit within '
+                               f'{self.timeout}s.')
+        if waiter.error is not None:
+            raise waiter.error
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed:
+                    if len(self._pending) >= self.max_rows:
+                        break
+                    if self._pending:
+                        remaining = self._oldest + self.flush_interval - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                    else:
+                        self._cond.wait()
+                if self._closed and not self._pending:
+                    return
+            self.flush()
+
+    def _take_batch(self):
+        with self._cond:
+            batch = self._pending[:self.max_rows]
+            del self._pending[:self.max_rows]
+            self._oldest = time.monotonic() if self._pending else None
+            return batch
+
+    def flush(self):
+        """Write every pending row now, in batches of max_rows.
+
+        Returns:
+            int: Number of rows committed
+        """
+        written = 0
+        with self._flush_lock:
+            while True:
+                batch = self._take_batch()
+                if not batch:
+                    return written
+                written += self._write(batch)
+
+    def _write(self, batch):
+        rows = [row for row, _ in batch]
+        start = time.perf_counter()
+        error = None
+        with self.app.app_context():
+            try:
+                db.session.execute(insert(self.table), rows)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                error = e
+                logger.exception('Write buffer %s failed to write %d rows', self.name, len(rows))
+            finally:
+                db.session.remove()
+        elapsed = time.perf_counter() - start
+
+        with self._cond:
+            self.flushes += 1
+            self.flush_seconds_total += elapsed
+            self.flush_seconds_max = max(self.flush_seconds_max, elapsed)
+            self.max_batch = max(self.max_batch, len(rows))
+            if error is None:
+                self.rows_written += len(rows)
+            else:
+                self.rows_failed += len(rows)
+                self.last_error = repr(error)
+
+        if self.metrics is not None:
+            labels = (('buffer', self.name),)
+            self.metrics.observe('write_buffer_flush_rows', labels, len(rows), FLUSH_ROW_BUCKETS)
+            self.metrics.observe('write_buffer_flush_seconds', labels, elapsed,
+                                 FLUSH_SECONDS_BUCKETS)
+        if error is None and self.on_flush is not None:
+            self.on_flush(len(rows))
+
+        for _, waiter in batch:
+            if waiter is not None:
+                waiter.error = error
+                waiter.done.set()
+        return 0 if error else len(rows)
+
+    def close(self):
+        """Stop accepting rows, flush what is pending and stop the flusher."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(self.timeout)
+        self.flush()
+
+    def stats(self):
+        """Return flush counters and sizes for this worker.
+
+        Returns:
+            dict: Settings, pending rows, flush count, rows written/failed,
+            batch sizes and flush latency (average and max, in ms)
+        """
+        with self._cond:
+            return {
+                'durability': self.durability,
+                'flush_interval_ms': round(self.flush_interval * 1000, 3),
+                'max_rows': self.max_rows,
+                'pending': len(self._pending),
+                'flushes': self.flushes,
+                'rows_written': self.rows_written,
+                'rows_failed': self.rows_failed,
+                'batch_avg': round((self.rows_written + self.rows_failed) / self.flushes, 2)
+                if self.flushes else 0.0,
+                'batch_max': self.max_batch,
+                'flush_ms_avg': round(self.flush_seconds_total * 1000 / self.flushes, 3)
+                if self.flushes else 0.0,
+                'flush_ms_max': round(self.flush_seconds_max * 1000, 3),
+                'last_error': self.last_error,
+            }
@@ -0,0 +1,160 @@
+"""Compare ORM instances with read-only row projections for listing queries.
+
+Reads every registration and every entry twice, once as ORM instances
+(the path the list, export and API code used before app.projections) and
+once as RegistrationRow / EntryRow tuples, both fully materialized in a
+list and streamed with yield_per. Reports rows per second and the peak
+Python memory allocated while reading (tracemalloc), as JSON.
+
+Example usage (from the application directory):
+    python -m benchmarks.projections
+    python -m benchmarks.projections --size 1000000 --repeat 5 --output projections.json
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from sqlalchemy import select
+
+from app import create_app
+from app.extensions import db
+from app.models.entry import Entry
+from app.models.registration import Registration
+from app.projections import EntryRow, RegistrationRow, fetch_rows, iter_rows, select_rows
+from benchmarks.run import _git_commit, seed
+
+DEFAULT_SIZE = 100000
+BATCH_SIZE = 1000
+
+
+def _orm_list(model):
+    return db.session.execute(select(model).order_by(model.id)).scalars().all()
+
+
+def _orm_stream(model):
+    query = select(model).order_by(model.id).execution_options(yield_per=BATCH_SIZE)
+    return db.session.execute(query).scalars()
+
+
+def _rows_list(row_type, model):
+    return fetch_rows(row_type, select_rows(row_type).order_by(model.id))
+
+
+def _rows_stream(row_type, model):
+    return iter_rows(row_type, select_rows(row_type).order_by(model.id), BATCH_SIZE)
+
+
+CASES = [
+    ('registrations', 'list', 'orm', lambda: _orm_list(Registration)),
+    ('registrations', 'list', 'rows', lambda: _rows_list(RegistrationRow, Registration)),
+    ('registrations', 'stream', 'orm', lambda: _orm_stream(Registration)),
+    ('registrations', 'stream', 'rows', lambda: _rows_stream(RegistrationRow, Registration)),
+    ('entries', 'list', 'orm', lambda: _orm_list(Entry)),
+    ('entries', 'list', 'rows', lambda: _rows_list(EntryRow, Entry)),
+    ('entries', 'stream', 'orm', lambda: _orm_stream(Entry)),
+    ('entries', 'stream', 'rows', lambda: _rows_stream(EntryRow, Entry)),
+]
+
+
+def measure(read, repeat=3):
+    """Read all rows ``repeat`` times, touching every attribute like a serializer.
+
+    Args:
+        read: Callable returning an iterable of rows or instances
+        repeat: Timed runs; the fastest is reported
+
+    Returns:
+        dict: rows, rows_per_second (best run) and peak_memory_mb (tracemalloc)
+    """
+    best = None
+    for _ in range(repeat):
+        db.session.expunge_all()
+        gc.collect()
+        start = time.perf_counter()
+        rows = sum(1 for item in read() if item.to_dict())
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    # Memory is measured in a separate run; tracemalloc slows allocation down
+    db.session.expunge_all()
+    gc.collect()
+    tracemalloc.start()
+    for item in read():
+        item.to_dict()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    db.session.expunge_all()
+
+    return {
+        'rows': rows,
+        'rows_per_second': round(rows / best) if best else 0,
+        'peak_memory_mb': round(peak / 1024 / 1024, 2),
+    }
+
+
+def run_projection_benchmarks(app, size, repeat=3):
+    """Seed ``size`` rows and measure every case.
+
+    Args:
+        app: Flask application (its database is dropped and recreated)
+        size: Number of entries and of registrations
+        repeat: Timed runs per case
+
+    Returns:
+        list: One result dict per (table, mode, path), with the speedup of
+        the rows path over the ORM path
+    """
+    results = []
+    with app.app_context():
+        seed(size)
+        db.session.remove()
+        for table, mode, path, read in CASES:
+            result = {'table': table, 'mode': mode, 'path': path, **measure(read, repeat)}
+            results.append(result)
+            print(f"{table:<14} {mode:<7} {path:<5} {result['rows_per_second']:>10} rows/s "
+                  f"{result['peak_memory_mb']:>8.2f} MB", file=sys.stderr)
+        db.session.remove()
+
+    orm = {(r['table'], r['mode']): r for r in results if r['path'] == 'orm'}
+    for result in results:
+        baseline = orm[(result['table'], result['mode'])]
+        if result['path'] == 'rows' and baseline['rows_per_second']:
+            result['speedup'] = round(result['rows_per_second'] / baseline['rows_per_second'], 2)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare ORM and projection listing reads.')
+    parser.add_argument('--size', type=int, default=DEFAULT_SIZE,
+                        help='Entries and registrations to seed (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Timed runs per case, best is reported (default: %(default)s)')
+    parser.add_argument('--output', '-o', help='Write the JSON report to this file')
+    args = parser.parse_args(argv)
+
+    app = create_app('benchmark')
+    with app.app_context():
+        database = db.engine.dialect.name
+    report = {
+        'commit': _git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'database': database,
+        'python': platform.python_version(),
+        'size': args.size,
+        'results': run_projection_benchmarks(app, args.size, args.repeat),
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
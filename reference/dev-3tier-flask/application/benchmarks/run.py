@@ -0,0 +1,277 @@
+"""Route benchmarks for the dev-3tier application.
+
+Seeds the database with N entries and N registrations for each requested
+size, then drives each benchmarked route through the Flask test client and
+reports latency percentiles, peak RSS and SQL statements per request as
+JSON. The commit is recorded with the results, so two runs can be compared
+with --baseline.
+
+The database comes from BenchmarkConfig: a SQLite file in this directory,
+or a local PostgreSQL when BENCHMARK_DATABASE_URL is set. All tables are
+dropped and recreated for every size.
+
+Example usage (from the application directory):
+    python -m benchmarks.run
+    python -m benchmarks.run --sizes 1000,100000,1000000 --output results.json
+    python -m benchmarks.run --baseline results-main.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from sqlalchemy import event
+
+from app import create_app
+from app.extensions import db
+from app.seed import seed_database
+from app.services.auth_service import AuthService
+
+DEFAULT_SIZES = (1000, 100000, 1000000)
+SEED = 0
+SEED_END = datetime(2025, 1, 1)
+
+BENCHMARK_ROUTES = [
+    ('GET', '/admin/attendees'),
+    ('GET', '/admin/export/csv'),
+    ('GET', '/api/entries'),
+    ('GET', '/demo/'),
+    ('POST', '/register'),
+]
+
+
+def seed(size):
+    """Recreate all tables and insert ``size`` entries and registrations.
+
+    Uses the flask seed generator with a fixed seed and end date, so every
+    run measures the same data.
+
+    Args:
+        size: Number of entries and of registrations to insert
+    """
+    db.drop_all()
+    db.create_all()
+    seed_database(registrations=size, entries=size, seed=SEED, end=SEED_END)
+    AuthService.create_user('benchmark', 'benchmark-password')
+
+
+def _rss_kb():
+    """Current resident set size in KiB (peak RSS where /proc is unavailable)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except OSError:
+        return _peak_rss_kb()
+
+
+def _peak_rss_kb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak  # Bytes on macOS
+
+
+def _percentile(sorted_ms, pct):
+    index = min(len(sorted_ms) - 1, max(0, round(pct / 100 * len(sorted_ms)) - 1))
+    return round(sorted_ms[index], 3)
+
+
+def _request(client, method, path, i):
+    if method == 'POST':
+        return client.post(path, data={
+            'name': f'Benchmark {i}',
+            'email': f'benchmark{i}@example.com',
+            'company': 'Benchmark Corp',
+            'job_title': 'Tester',
+        })
+    response = client.get(path)
+    response.get_data()  # Drain streamed bodies
+    return response
+
+
+def measure_route(app, client, route, iterations, warmup=3):
+    """Time ``iterations`` requests to one route.
+
+    Args:
+        app: Flask application
+        client: Logged-in test client
+        route: Tuple of (method, path)
+        iterations: Measured requests
+        warmup: Unmeasured requests made first
+
+    Returns:
+        dict: Latency percentiles in ms, queries per request, errors and RSS
+    """
+    method, path = route
+    rss_before = _rss_kb()
+    queries = [0]
+
+    def count_query(*args):
+        queries[0] += 1
+
+    for i in range(warmup):
+        _request(client, method, path, f'warmup{i}')
+
+    timings = []
+    errors = 0
+    event.listen(db.engine, 'after_cursor_execute', count_query)
+    try:
+        for i in range(iterations):
+            start = time.perf_counter()
+            response = _request(client, method, path, i)
+            timings.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+    finally:
+        event.remove(db.engine, 'after_cursor_execute', count_query)
+
+    timings.sort()
+    peak_rss = _peak_rss_kb()
+    return {
+        'route': f'{method} {path}',
+        'iterations': iterations,
+        'errors': errors,
+        'p50_ms': _percentile(timings, 50),
+        'p95_ms': _percentile(timings, 95),
+        'p99_ms': _percentile(timings, 99),
+        'mean_ms': round(statistics.fmean(timings), 3),
+        'queries_per_request': round(queries[0] / iterations, 2),
+        'peak_rss_mb': round(peak_rss / 1024, 1),
+        'rss_growth_mb': round(max(0, peak_rss - rss_before) / 1024, 1),
+    }
+
+
+def _measure_in_child(app, client, route, iterations, results):
+    db.engine.dispose(close=False)  # Don't share the parent's connections
+    with app.app_context():
+        results.put(measure_route(app, client, route, iterations))
+
+
+def _measure_isolated(app, client, route, iterations):
+    """Run measure_route in a forked child so peak RSS belongs to this route."""
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    child = context.Process(target=_measure_in_child,
+                            args=(app, client, route, iterations, results))
+    child.start()
+    result = results.get()
+    child.join()
+    return result
+
+
+def run_benchmarks(app, sizes, routes, iterations, isolate=True):
+    """Seed each size and measure every route against it.
+
+    Args:
+        app: Flask application (its database is dropped and recreated)
+        sizes: Row counts to seed
+        routes: List of (method, path) tuples
+        iterations: Measured requests per route
+        isolate: Measure each route in a forked process so peak RSS is not
+            inflated by earlier routes (ignored where fork is unavailable)
+
+    Returns:
+        list: One result dict per (size, route)
+    """
+    isolate = isolate and 'fork' in multiprocessing.get_all_start_methods()
+    results = []
+    for size in sizes:
+        with app.app_context():
+            start = time.perf_counter()
+            seed(size)
+            seed_seconds = round(time.perf_counter() - start, 2)
+            db.session.remove()
+
+            client = app.test_client()
+            client.post('/auth/login', data={
+                'username': 'benchmark', 'password': 'benchmark-password'
+            })
+            for route in routes:
+                if isolate:
+                    result = _measure_isolated(app, client, route, iterations)
+                else:
+                    result = measure_route(app, client, route, iterations)
+                result.update(size=size, seed_seconds=seed_seconds)
+                results.append(result)
+                print(f"{size:>9} {result['route']:<24} p50 {result['p50_ms']:>8.2f} ms  "
+                      f"p95 {result['p95_ms']:>8.2f} ms  p99 {result['p99_ms']:>8.2f} ms  "
+                      f"{result['queries_per_request']:>5} q/req  "
+                      f"{result['peak_rss_mb']:>7.1f} MB", file=sys.stderr)
+            db.session.remove()
+    return results
+
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline):
+    """Print the p95 change of every (size, route) found in both runs to stderr."""
+    previous = {(r['size'], r['route']): r for r in baseline['results']}
+    print(f"{'size':>9} {'route':<24} {'p95 before':>11} {'p95 now':>9} {'change':>8}",
+          file=sys.stderr)
+    for result in results:
+        before = previous.get((result['size'], result['route']))
+        if before is None or not before['p95_ms']:
+            continue
+        change = (result['p95_ms'] - before['p95_ms']) / before['p95_ms'] * 100
+        print(f"{result['size']:>9} {result['route']:<24} {before['p95_ms']:>11.2f} "
+              f"{result['p95_ms']:>9.2f} {change:>+7.1f}%", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the dev-3tier routes.')
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help='Comma-separated row counts to seed (default: %(default)s)')
+    parser.add_argument('--iterations', type=int, default=50,
+                        help='Measured requests per route (default: %(default)s)')
+    parser.add_argument('--route', action='append', dest='routes',
+                        help='Only benchmark this route, e.g. "GET /api/entries" (repeatable)')
+    parser.add_argument('--output', '-o', help='Write the JSON report to this file')
+    parser.add_argument('--baseline', help='JSON report of an earlier run to compare against')
+    parser.add_argument('--no-isolate', action='store_true',
+                        help='Measure all routes in one process (peak RSS becomes cumulative)')
+    args = parser.parse_args(argv)
+
+    routes = BENCHMARK_ROUTES
+    if args.routes:
+        routes = [tuple(r.split(' ', 1)) for r in args.routes]
+
+    app = create_app('benchmark')
+    with app.app_context():
+        database = db.engine.dialect.name
+    results = run_benchmarks(app, [int(s) for s in args.sizes.split(',')], routes,
+                             args.iterations, isolate=not args.no_isolate)
+    report = {
+        'commit': _git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'database': database,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'iterations': args.iterations,
+        'results': results,
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
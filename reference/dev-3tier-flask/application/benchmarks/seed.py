@@ -0,0 +1,133 @@
+"""Measure flask seed throughput.
+
+Runs seed_database against the benchmark database (recreated first) in
+two scenarios:
+
+- fresh: ``size`` registrations and ``size`` entries into empty tables
+  (large loads defer the indexes, see app.seed)
+- top-up: ``top_up`` more registrations and entries into the tables the
+  fresh run filled, which keeps every index and the search triggers
+
+For each table it reports rows per second for the inserts alone (what
+seed_database times), for the registration index rebuild and full-text
+indexing, and for the whole call, which also rebuilds the registration
+rollup and sketches. Reported as JSON.
+
+On SQLite the fresh inserts must reach TARGET_ROWS_PER_SECOND for both
+tables; otherwise the report is still written and the exit status is 1.
+
+Example usage (from the application directory):
+    python -m benchmarks.seed
+    python -m benchmarks.seed --size 1000000 --top-up 50000 --output seed.json
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+
+from app import create_app
+from app.extensions import db
+from app.seed import REGISTRATION_INDEXES, seed_database
+from benchmarks.run import SEED, SEED_END, _git_commit
+
+DEFAULT_SIZE = 200000
+DEFAULT_TOP_UP = 50000
+
+# Fresh-load insert rate both tables must reach on a local SQLite file
+TARGET_ROWS_PER_SECOND = 100_000
+
+
+def measure(scenario, size, seed):
+    """Seed ``size`` registrations and entries and time each table.
+
+    Args:
+        scenario: Label for the results
+        size: Rows per table
+        seed: Random seed passed to seed_database
+
+    Returns:
+        list: One result dict per table
+    """
+    started = time.perf_counter()
+    timings = seed_database(registrations=size, entries=size, seed=seed, end=SEED_END)
+    total = time.perf_counter() - started
+
+    results = []
+    for table, (rows, seconds) in timings.items():
+        result = {'scenario': scenario, 'table': table, 'rows': rows,
+                  'insert_seconds': round(seconds, 3),
+                  'rows_per_second': round(rows / seconds) if seconds else 0}
+        results.append(result)
+        print(f"{scenario:<8} {table:<20} {rows:>9} rows {result['rows_per_second']:>9} rows/s",
+              file=sys.stderr)
+    print(f'{scenario:<8} {"(whole call)":<20} {2 * size:>9} rows '
+          f'{round(2 * size / total):>9} rows/s', file=sys.stderr)
+    results.append({'scenario': scenario, 'table': 'all', 'rows': 2 * size,
+                    'insert_seconds': round(total, 3),
+                    'rows_per_second': round(2 * size / total)})
+    return results
+
+
+def below_target(results):
+    """Return the fresh-load insert results slower than TARGET_ROWS_PER_SECOND."""
+    return [result for result in results
+            if result['scenario'] == 'fresh'
+            and result['table'] not in ('all', REGISTRATION_INDEXES)
+            and result['rows_per_second'] < TARGET_ROWS_PER_SECOND]
+
+
+def run_seed_benchmarks(size, top_up):
+    """Recreate the tables, then run the fresh and top-up scenarios.
+
+    Must run inside an application context.
+
+    Returns:
+        list: Result dicts from measure()
+    """
+    db.drop_all()
+    db.create_all()
+    results = measure('fresh', size, SEED)
+    if top_up:
+        results += measure('top-up', top_up, SEED + 1)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure flask seed throughput.')
+    parser.add_argument('--size', type=int, default=DEFAULT_SIZE,
+                        help='Rows per table for the fresh run (default: %(default)s)')
+    parser.add_argument('--top-up', type=int, default=DEFAULT_TOP_UP,
+                        help='Rows per table added afterwards, 0 to skip (default: %(default)s)')
+    parser.add_argument('--output', '-o', help='Write the JSON report to this file')
+    args = parser.parse_args(argv)
+
+    app = create_app('benchmark')
+    with app.app_context():
+        report = {
+            'commit': _git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'database': db.engine.dialect.name,
+            'results': run_seed_benchmarks(args.size, args.top_up),
+        }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if report['database'] == 'sqlite':
+        slow = below_target(report['results'])
+        for result in slow:
+            print(f"{result['table']}: {result['rows_per_second']} rows/s is below the "
+                  f"{TARGET_ROWS_PER_SECOND} rows/s target", file=sys.stderr)
+        if slow:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""Compare JSON encoding of entries and registrations.
+
+Encodes ``size`` in-memory rows (no database) as a JSON array three ways:
+Flask's default provider over to_dict() (the path before app.json_provider),
+FastJSONProvider with the standard library json, and FastJSONProvider with
+orjson when it is installed. Also measures iter_encode(), which the
+streaming API uses. Reports rows per second for each, as JSON.
+
+Example usage (from the application directory):
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --size 500000 --output serialization.json
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from flask.json.provider import DefaultJSONProvider
+
+from app import create_app
+from app.json_provider import FastJSONProvider, orjson
+from app.models.registration import Registration
+from app.projections import EntryRow, RegistrationRow
+from benchmarks.run import _git_commit
+
+DEFAULT_SIZE = 100000
+
+
+def _rows(size):
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return {
+        'entries': [EntryRow(i, f'Benchmark entry {i}', now) for i in range(size)],
+        'registrations': [
+            RegistrationRow(i, f'Attendee {i}', f'attendee{i}@example.com', 'Contoso',
+                            'Engineer', now) for i in range(size)
+        ],
+        'registrations (orm)': [
+            Registration(id=i, name=f'Attendee {i}', email=f'attendee{i}@example.com',
+                         company='Contoso', job_title='Engineer', created_at=now)
+            for i in range(size)
+        ],
+    }
+
+
+def _best(encode, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encode()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_serialization_benchmarks(app, size, repeat=3):
+    """Encode ``size`` rows of each kind with every available encoder.
+
+    Args:
+        app: Flask application
+        size: Rows per kind
+        repeat: Timed runs per case; the fastest is reported
+
+    Returns:
+        list: One result dict per (rows, encoder), with the speedup over
+        Flask's default provider
+    """
+    encoders = {'flask-default': DefaultJSONProvider(app),
+                'json': FastJSONProvider(app, backend='json')}
+    if orjson is not None:
+        encoders['orjson'] = FastJSONProvider(app, backend='orjson')
+    for provider in encoders.values():
+        if isinstance(provider, FastJSONProvider):
+            provider.register(Registration, EntryRow, RegistrationRow)
+
+    results = []
+    with app.app_context():
+        for kind, rows in _rows(size).items():
+            cases = [('flask-default', lambda: encoders['flask-default'].dumps(
+                [row.to_dict() for row in rows]))]
+            for name, provider in encoders.items():
+                if name != 'flask-default':
+                    cases.append((name, lambda p=provider: p.dumps(rows)))
+                    cases.append((f'{name} iter_encode',
+                                  lambda p=provider: b''.join(p.iter_encode(rows))))
+            baseline = None
+            for name, encode in cases:
+                elapsed = _best(encode, repeat)
+                baseline = baseline or elapsed
+                result = {'rows': kind, 'encoder': name, 'size': size,
+                          'rows_per_second': round(size / elapsed) if elapsed else 0,
+                          'speedup': round(baseline / elapsed, 2) if elapsed else 0}
+                results.append(result)
+                print(f"{kind:<20} {name:<20} {result['rows_per_second']:>10} rows/s "
+                      f"{result['speedup']:>6.2f}x", file=sys.stderr)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare JSON encoders for listing rows.')
+    parser.add_argument('--size', type=int, default=DEFAULT_SIZE,
+                        help='Rows per kind (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Timed runs per case, best is reported (default: %(default)s)')
+    parser.add_argument('--output', '-o', help='Write the JSON report to this file')
+    args = parser.parse_args(argv)
+
+    app = create_app('benchmark')
+    report = {
+        'commit': _git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'orjson': getattr(orjson, '__version__', None),
+        'size': args.size,
+        'results': run_serialization_benchmarks(app, args.size, args.repeat),
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,7 @@
 """Application configuration classes for different environments."""
 
 import os
+import tempfile
 
 
 class Config:
@@ -10,6 +11,104 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     WTF_CSRF_ENABLED = True
 
+    # Connection pool, per worker process. Azure PostgreSQL and Azure SQL drop
+    # idle connections, so recycle them and test each one on checkout.
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 5)),
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true',
+    }
+
+    # One-time startup tasks (app.startup): run from create_app in production
+    # unless disabled, e.g. when the deployment runs `flask startup` itself
+    STARTUP_TASKS_ON_BOOT = os.environ.get('STARTUP_TASKS_ON_BOOT', 'true').lower() == 'true'
+    STARTUP_LOCK_TIMEOUT = int(os.environ.get('STARTUP_LOCK_TIMEOUT', 60))
+    ADMIN_PASSWORD = os.environ.get('ADMIN_PASSWORD')  # Bootstraps the 'admin' user
+
+    # Prometheus metrics on /metrics, served to direct local requests only
+    # unless METRICS_TOKEN is set (then to requests sending it as a bearer
+    # token). Production requires the token.
+    # METRICS_DIR is shared by all gunicorn workers so every scrape reports
+    # all of them; gunicorn.conf.py sets and empties it on each boot.
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+    METRICS_DIR = os.environ.get('METRICS_DIR') or None
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN') or None
+    METRICS_ALLOW_LOCAL = True
+    METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', 5))
+
+    # Password hashing (Werkzeug method string) and verification pool.
+    # Changing the method rehashes stored passwords on their next login.
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    PASSWORD_VERIFY_WORKERS = int(os.environ.get('PASSWORD_VERIFY_WORKERS', 2))
+    PASSWORD_VERIFY_QUEUE_LIMIT = int(os.environ.get('PASSWORD_VERIFY_QUEUE_LIMIT', 8))
+    PASSWORD_VERIFY_TIMEOUT = float(os.environ.get('PASSWORD_VERIFY_TIMEOUT', 10))
+
+    # Flask-Login user loader cache (per worker process); TTL 0 disables it
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 60))
+    USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', 256))
+
+    # Rendered-page cache for the landing, webinar and thank-you pages;
+    # PAGE_CACHE_MAX_AGE is the s-maxage for shared caches (browsers revalidate)
+    PAGE_CACHE_ENABLED = os.environ.get('PAGE_CACHE_ENABLED', 'true').lower() == 'true'
+    PAGE_CACHE_MAX_AGE = int(os.environ.get('PAGE_CACHE_MAX_AGE', 300))
+
+    # Demo page entry count: 'exact', 'cached' or 'estimated' (PostgreSQL planner estimate)
+    ENTRY_COUNT_MODE = os.environ.get('ENTRY_COUNT_MODE', 'cached')
+    ENTRY_COUNT_RECONCILE_SECONDS = int(os.environ.get('ENTRY_COUNT_RECONCILE_SECONDS', 60))
+    ENTRY_COUNT_ESTIMATE_THRESHOLD = int(os.environ.get('ENTRY_COUNT_ESTIMATE_THRESHOLD', 100000))
+
+    # JSON encoding (app.json_provider): 'auto' uses orjson when installed,
+    # 'json' forces the standard library
+    JSON_BACKEND = os.environ.get('JSON_BACKEND', 'auto')
+
+    # /api/entries pagination
+    API_ENTRIES_PAGE_SIZE = int(os.environ.get('API_ENTRIES_PAGE_SIZE', 100))
+    API_ENTRIES_MAX_PAGE_SIZE = int(os.environ.get('API_ENTRIES_MAX_PAGE_SIZE', 1000))
+    API_ENTRIES_STREAM_BATCH_SIZE = int(os.environ.get('API_ENTRIES_STREAM_BATCH_SIZE', 1000))
+
+    # POST /api/entries batch ingestion limits
+    API_ENTRIES_MAX_BATCH = int(os.environ.get('API_ENTRIES_MAX_BATCH', 1000))
+    API_ENTRIES_MAX_BODY_BYTES = int(os.environ.get('API_ENTRIES_MAX_BODY_BYTES', 1024 * 1024))
+
+    # Group-commit buffer for new entries (app.write_buffer): flush every
+    # ENTRY_BUFFER_FLUSH_MS or ENTRY_BUFFER_MAX_ROWS rows. Durability 'flush'
+    # answers after the commit, 'enqueue' as soon as the entry is queued.
+    ENTRY_WRITE_BUFFER = os.environ.get('ENTRY_WRITE_BUFFER', 'false').lower() == 'true'
+    ENTRY_BUFFER_FLUSH_MS = int(os.environ.get('ENTRY_BUFFER_FLUSH_MS', 50))
+    ENTRY_BUFFER_MAX_ROWS = int(os.environ.get('ENTRY_BUFFER_MAX_ROWS', 500))
+    ENTRY_BUFFER_DURABILITY = os.environ.get('ENTRY_BUFFER_DURABILITY', 'flush')
+    ENTRY_BUFFER_QUEUE_LIMIT = int(os.environ.get('ENTRY_BUFFER_QUEUE_LIMIT', 10000))
+
+    # Live counts on /admin/attendees over Server-Sent Events (app.live_stats).
+    # LIVE_STATS_CHANNEL is a file shared by all workers on the host. Every
+    # open admin page holds one worker thread, at most LIVE_STATS_MAX_LISTENERS
+    # per worker; streams end after LIVE_STATS_STREAM_SECONDS (keep it below
+    # GUNICORN_TIMEOUT) and the browser reconnects. Single-threaded servers
+    # get 503. Opt-in: enabling it makes gunicorn.conf.py switch to gthread
+    # workers.
+    LIVE_STATS_ENABLED = os.environ.get('LIVE_STATS_ENABLED', 'false').lower() == 'true'
+    LIVE_STATS_CHANNEL = os.environ.get('LIVE_STATS_CHANNEL') or os.path.join(
+        tempfile.gettempdir(), 'registrations-live-stats'
+    )
+    LIVE_STATS_POLL_SECONDS = float(os.environ.get('LIVE_STATS_POLL_SECONDS', 0.5))
+    LIVE_STATS_MIN_INTERVAL_SECONDS = float(os.environ.get('LIVE_STATS_MIN_INTERVAL_SECONDS', 1))
+    LIVE_STATS_MAX_LISTENERS = int(os.environ.get('LIVE_STATS_MAX_LISTENERS', 8))
+    LIVE_STATS_STREAM_SECONDS = int(os.environ.get('LIVE_STATS_STREAM_SECONDS', 60))
+    LIVE_STATS_KEEPALIVE_SECONDS = int(os.environ.get('LIVE_STATS_KEEPALIVE_SECONDS', 15))
+
+    # /admin/attendees pagination
+    ADMIN_ATTENDEES_PAGE_SIZE = int(os.environ.get('ADMIN_ATTENDEES_PAGE_SIZE', 50))
+    ADMIN_ATTENDEES_MAX_PAGE_SIZE = int(os.environ.get('ADMIN_ATTENDEES_MAX_PAGE_SIZE', 500))
+
+    # /admin/attendees?q= full-text search: number of ranked matches shown
+    ADMIN_SEARCH_LIMIT = int(os.environ.get('ADMIN_SEARCH_LIMIT', 50))
+
+    # /admin/export/csv streaming
+    EXPORT_CSV_BATCH_SIZE = int(os.environ.get('EXPORT_CSV_BATCH_SIZE', 1000))
+    EXPORT_CSV_GZIP = os.environ.get('EXPORT_CSV_GZIP', 'true').lower() == 'true'
+
 
 class DevelopmentConfig(Config):
     """Development configuration with SQLite fallback."""
@@ -28,6 +127,7 @@ class ProductionConfig(Config):
     DEBUG = False
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
     SECRET_KEY = os.environ.get('SECRET_KEY')  # Must be set in production
+    METRICS_ALLOW_LOCAL = False  # nginx proxies from 127.0.0.1; require METRICS_TOKEN
 
 
 class TestingConfig(Config):
@@ -35,4 +135,32 @@ class TestingConfig(Config):
 
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SQLALCHEMY_ENGINE_OPTIONS = {}  # In-memory SQLite uses a single static connection
     WTF_CSRF_ENABLED = False  # Disable CSRF for testing
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'  # Cheap hashes keep tests fast
+    ADMIN_PASSWORD = None
+    METRICS_DIR = None
+    JSON_BACKEND = 'json'  # The default install; orjson is tested explicitly
+    LIVE_STATS_ENABLED = True
+    LIVE_STATS_CHANNEL = None  # In-process channel, nothing shared between test runs
+    LIVE_STATS_POLL_SECONDS = 0.01
+    LIVE_STATS_MIN_INTERVAL_SECONDS = 0
+
+
+class BenchmarkConfig(Config):
+    """Configuration for the benchmark suite (benchmarks/run.py).
+
+    Uses a SQLite file next to the benchmarks unless BENCHMARK_DATABASE_URL
+    points at a local PostgreSQL. The benchmark drops and recreates all
+    tables, so never point it at a database you care about.
+    """
+
+    basedir = os.path.abspath(os.path.dirname(__file__))
+    SQLALCHEMY_DATABASE_URI = os.environ.get(
+        'BENCHMARK_DATABASE_URL',
+        f'sqlite:///{os.path.join(basedir, "benchmarks", "benchmark.db")}'
+    )
+    WTF_CSRF_ENABLED = False  # The benchmark posts forms directly
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'  # Logging in is not what is measured
+    ADMIN_PASSWORD = None
+    METRICS_ENABLED = False
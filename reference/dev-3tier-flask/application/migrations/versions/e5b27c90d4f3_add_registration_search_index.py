@@ -0,0 +1,101 @@
+"""Add registration full-text search index
+
+Revision ID: e5b27c90d4f3
+Revises: d2f4a8c61e97
+Create Date: 2026-10-16 23:02:41.385116
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b27c90d4f3'
+down_revision = 'd2f4a8c61e97'
+branch_labels = None
+depends_on = None
+
+# The DDL as of this revision (app.search builds the same statements today);
+# kept literal so later changes to the app cannot alter this migration.
+SQLITE_UPGRADE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS registrations_fts USING fts5("
+    "name, company, job_title, email, content='registrations', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS registrations_fts_ai AFTER INSERT ON registrations BEGIN "
+    "INSERT INTO registrations_fts(rowid, name, company, job_title, email) "
+    "VALUES (new.id, new.name, new.company, new.job_title, new.email); END",
+    "CREATE TRIGGER IF NOT EXISTS registrations_fts_ad AFTER DELETE ON registrations BEGIN "
+    "INSERT INTO registrations_fts(registrations_fts, rowid, name, company, job_title, email) "
+    "VALUES ('delete', old.id, old.name, old.company, old.job_title, old.email); END",
+    "CREATE TRIGGER IF NOT EXISTS registrations_fts_au AFTER UPDATE ON registrations BEGIN "
+    "INSERT INTO registrations_fts(registrations_fts, rowid, name, company, job_title, email) "
+    "VALUES ('delete', old.id, old.name, old.company, old.job_title, old.email); "
+    "INSERT INTO registrations_fts(rowid, name, company, job_title, email) "
+    "VALUES (new.id, new.name, new.company, new.job_title, new.email); END",
+    # Index the existing registrations
+    "INSERT INTO registrations_fts(registrations_fts) VALUES ('rebuild')",
+]
+
+POSTGRES_UPGRADE = [
+    "ALTER TABLE registrations ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('simple'::regconfig, coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(company, '')), 'B') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(job_title, '')), 'B') || "
+    "setweight(to_tsvector('simple'::regconfig, "
+    "translate(coalesce(email, ''), '@.+_-', '     ')), 'C')) STORED",
+    'CREATE INDEX IF NOT EXISTS ix_registrations_search_vector '
+    'ON registrations USING GIN (search_vector)',
+]
+
+MSSQL_UPGRADE = [
+    "IF NOT EXISTS (SELECT 1 FROM sys.fulltext_catalogs WHERE name = 'registrations_catalog') "
+    "CREATE FULLTEXT CATALOG registrations_catalog",
+    "IF NOT EXISTS (SELECT 1 FROM sys.fulltext_indexes "
+    "WHERE object_id = OBJECT_ID('registrations')) "
+    "BEGIN "
+    "DECLARE @pk sysname = (SELECT name FROM sys.indexes "
+    "WHERE object_id = OBJECT_ID('registrations') AND is_primary_key = 1); "
+    "EXEC('CREATE FULLTEXT INDEX ON registrations (name, company, job_title, email) "
+    "KEY INDEX ' + QUOTENAME(@pk) + ' ON registrations_catalog WITH CHANGE_TRACKING AUTO'); "
+    "END",
+]
+
+DOWNGRADE = {
+    'sqlite': [
+        'DROP TRIGGER IF EXISTS registrations_fts_ai',
+        'DROP TRIGGER IF EXISTS registrations_fts_ad',
+        'DROP TRIGGER IF EXISTS registrations_fts_au',
+        'DROP TABLE IF EXISTS registrations_fts',
+    ],
+    'postgresql': [
+        'DROP INDEX IF EXISTS ix_registrations_search_vector',
+        'ALTER TABLE registrations DROP COLUMN IF EXISTS search_vector',
+    ],
+    'mssql': [
+        "IF EXISTS (SELECT 1 FROM sys.fulltext_indexes "
+        "WHERE object_id = OBJECT_ID('registrations')) DROP FULLTEXT INDEX ON registrations",
+        "IF EXISTS (SELECT 1 FROM sys.fulltext_catalogs WHERE name = 'registrations_catalog') "
+        "DROP FULLTEXT CATALOG registrations_catalog",
+    ],
+}
+
+UPGRADE = {'sqlite': SQLITE_UPGRADE, 'postgresql': POSTGRES_UPGRADE, 'mssql': MSSQL_UPGRADE}
+
+
+def upgrade():
+    # FTS5 table and triggers, tsvector column and GIN index, or full-text
+    # catalog. SQL Server full-text DDL cannot run inside the migration
+    # transaction.
+    statements = UPGRADE.get(op.get_bind().dialect.name, [])
+    if statements:
+        with op.get_context().autocommit_block():
+            for statement in statements:
+                op.execute(statement)
+
+
+def downgrade():
+    statements = DOWNGRADE.get(op.get_bind().dialect.name, [])
+    if statements:
+        with op.get_context().autocommit_block():
+            for statement in statements:
+                op.execute(statement)
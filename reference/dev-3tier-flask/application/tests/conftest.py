@@ -1,10 +1,40 @@
 """Pytest fixtures for the Flask application tests."""
 
+import time
+from contextlib import contextmanager
+
 import pytest
+from sqlalchemy import event
 from app import create_app
 from app.extensions import db
 
 
+class QueryCounter:
+    """Records the SQL statements executed while it is active.
+
+    Attributes:
+        statements: List of (sql, seconds) tuples in execution order.
+    """
+
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self):
+        """Number of statements executed."""
+        return len(self.statements)
+
+    @property
+    def duration(self):
+        """Total seconds spent executing statements."""
+        return sum(seconds for _, seconds in self.statements)
+
+    def report(self):
+        """Return the executed statements, one per line, for failure messages."""
+        return '\n'.join(f'  {i}. ({seconds * 1000:.1f} ms) {sql}'
+                         for i, (sql, seconds) in enumerate(self.statements, 1))
+
+
 @pytest.fixture
 def app():
     """Create application instance for testing.
@@ -73,3 +103,67 @@ def authenticated_client(app, client):
         'password': 'testpassword123'
     })
     return client
+
+
+@pytest.fixture
+def count_queries(app):
+    """Context manager counting the SQL statements issued inside it.
+
+    Usage:
+        with count_queries() as queries:
+            client.get('/api/entries')
+        assert queries.count == 1
+
+    Args:
+        app: Flask application fixture.
+
+    Returns:
+        Function returning a context manager that yields a QueryCounter.
+    """
+    @contextmanager
+    def counting():
+        counter = QueryCounter()
+        started = {}
+
+        def before(conn, cursor, statement, parameters, context, executemany):
+            started[id(cursor)] = time.perf_counter()
+
+        def after(conn, cursor, statement, parameters, context, executemany):
+            start = started.pop(id(cursor), time.perf_counter())
+            counter.statements.append((statement, time.perf_counter() - start))
+
+        event.listen(db.engine, 'before_cursor_execute', before)
+        event.listen(db.engine, 'after_cursor_execute', after)
+        try:
+            yield counter
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before)
+            event.remove(db.engine, 'after_cursor_execute', after)
+
+    return counting
+
+
+@pytest.fixture
+def query_budget(count_queries):
+    """Context manager failing the test when a block exceeds its query budget.
+
+    Usage:
+        with query_budget(3, 'GET /admin/attendees'):
+            authenticated_client.get('/admin/attendees')
+
+    Args:
+        count_queries: Query counting fixture.
+
+    Returns:
+        Function taking the maximum statement count and an optional label.
+    """
+    @contextmanager
+    def budget(max_queries, label='block'):
+        with count_queries() as counter:
+            yield counter
+        assert counter.count <= max_queries, (
+            f'{label} issued {counter.count} SQL statements '
+            f'(budget {max_queries}, {counter.duration * 1000:.1f} ms):\n{counter.report()}'
+        )
+
+    return budget
@@ -1,5 +1,10 @@
 """Tests for application routes."""
 
+import os
+import tempfile
+import pytest
+from app.extensions import db
+from app.json_provider import orjson
 from app.models.entry import Entry
 
 
@@ -119,6 +124,530 @@ class TestEntriesAPI:
         assert 'created_at' in response.json[0]
 
 
+class TestEntriesAPIPagination:
+    """Tests for keyset pagination and streaming on /api/entries."""
+
+    def _create_entries(self, app, count):
+        from app.services.entry_service import EntryService
+        with app.app_context():
+            for i in range(count):
+                EntryService.create_entry(f'entry {i}')
+
+    def test_entries_limit_caps_page_size(self, app, client):
+        """limit should cap the number of entries returned."""
+        self._create_entries(app, 5)
+        response = client.get('/api/entries?limit=2')
+        assert len(response.json) == 2
+        assert 'X-Next-Cursor' in response.headers
+        assert 'rel="next"' in response.headers['Link']
+
+    def test_entries_last_page_has_no_cursor(self, app, client):
+        """The final page should not advertise a next cursor."""
+        self._create_entries(app, 2)
+        response = client.get('/api/entries?limit=5')
+        assert len(response.json) == 2
+        assert 'X-Next-Cursor' not in response.headers
+        assert 'Link' not in response.headers
+
+    def test_entries_cursor_walks_all_entries(self, app, client):
+        """Following cursors should return every entry exactly once, newest first."""
+        self._create_entries(app, 7)
+        seen = []
+        url = '/api/entries?limit=3'
+        while url:
+            response = client.get(url)
+            seen.extend(e['id'] for e in response.json)
+            cursor = response.headers.get('X-Next-Cursor')
+            url = f'/api/entries?limit=3&after={cursor}' if cursor else None
+        assert len(seen) == 7
+        assert len(set(seen)) == 7
+        assert seen == sorted(seen, reverse=True)
+
+    def test_entries_invalid_cursor_returns_400(self, client):
+        """A malformed cursor should be rejected."""
+        response = client.get('/api/entries?after=not-a-cursor')
+        assert response.status_code == 400
+        assert 'error' in response.json
+
+    def test_entries_invalid_limit_returns_400(self, client):
+        """Limits outside the allowed range should be rejected."""
+        assert client.get('/api/entries?limit=0').status_code == 400
+        assert client.get('/api/entries?limit=100000').status_code == 400
+        assert client.get('/api/entries?limit=abc').status_code == 400
+
+    def test_entries_stream_json(self, app, client):
+        """stream=json should return every entry as a JSON array."""
+        self._create_entries(app, 4)
+        response = client.get('/api/entries?stream=json')
+        assert response.status_code == 200
+        assert response.is_streamed
+        assert response.mimetype == 'application/json'
+        assert len(response.json) == 4
+
+    def test_entries_stream_json_empty(self, client):
+        """Streaming an empty table should produce an empty array."""
+        response = client.get('/api/entries?stream=json')
+        assert response.json == []
+
+    def test_entries_stream_ndjson(self, app, client):
+        """stream=ndjson should return one JSON object per line."""
+        import json
+        self._create_entries(app, 3)
+        response = client.get('/api/entries?stream=ndjson')
+        assert response.mimetype == 'application/x-ndjson'
+        lines = response.get_data(as_text=True).splitlines()
+        assert len(lines) == 3
+        assert all('value' in json.loads(line) for line in lines)
+
+    def test_entries_stream_after_cursor(self, app, client):
+        """Streaming should honour the after cursor."""
+        self._create_entries(app, 5)
+        first = client.get('/api/entries?limit=2')
+        cursor = first.headers['X-Next-Cursor']
+        response = client.get(f'/api/entries?stream=json&after={cursor}')
+        assert len(response.json) == 3
+
+    def test_entries_stream_invalid_mode_returns_400(self, client):
+        """Unknown stream modes should be rejected."""
+        response = client.get('/api/entries?stream=xml')
+        assert response.status_code == 400
+
+
+class TestEntriesAPIConditional:
+    """Tests for ETag/Last-Modified handling on /api/entries."""
+
+    def test_entries_have_validators(self, client):
+        """Responses should carry an ETag and ask clients to revalidate."""
+        client.post('/demo/', data={'value': 'validators'})
+        response = client.get('/api/entries')
+        assert 'ETag' in response.headers
+        assert 'Last-Modified' in response.headers
+        assert response.headers['Cache-Control'] == 'no-cache'
+
+    def test_matching_etag_returns_304(self, client):
+        """A current ETag should get 304 with an empty body."""
+        client.post('/demo/', data={'value': 'poll'})
+        etag = client.get('/api/entries').headers['ETag']
+        response = client.get('/api/entries', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+        assert response.headers['ETag'] == etag
+
+    def test_304_does_not_load_rows(self, client, monkeypatch):
+        """Revalidation should not read any entries."""
+        from app.services.entry_service import EntryService
+        etag = client.get('/api/entries').headers['ETag']
+        monkeypatch.setattr(EntryService, 'get_entries_page',
+                            staticmethod(lambda *a, **k: pytest.fail('rows loaded')))
+        response = client.get('/api/entries', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+
+    def test_new_entry_changes_etag(self, client):
+        """Creating an entry should invalidate the previous ETag."""
+        etag = client.get('/api/entries').headers['ETag']
+        client.post('/demo/', data={'value': 'fresh'})
+        response = client.get('/api/entries', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.json[0]['value'] == 'fresh'
+
+    def test_etag_depends_on_parameters(self, client):
+        """Different pages of the same data should have different ETags."""
+        client.post('/demo/', data={'value': 'params'})
+        first = client.get('/api/entries?limit=1').headers['ETag']
+        second = client.get('/api/entries?limit=2').headers['ETag']
+        assert first != second
+
+    def test_if_modified_since_returns_304(self, client):
+        """If-Modified-Since at or after the newest entry should get 304."""
+        client.post('/demo/', data={'value': 'dated'})
+        last_modified = client.get('/api/entries').headers['Last-Modified']
+        response = client.get('/api/entries', headers={'If-Modified-Since': last_modified})
+        assert response.status_code == 304
+
+    def test_if_none_match_takes_precedence(self, client):
+        """A stale ETag should get 200 even with a current If-Modified-Since."""
+        client.post('/demo/', data={'value': 'precedence'})
+        last_modified = client.get('/api/entries').headers['Last-Modified']
+        response = client.get('/api/entries', headers={
+            'If-None-Match': '"stale"', 'If-Modified-Since': last_modified
+        })
+        assert response.status_code == 200
+
+    def test_errors_not_conditional(self, client):
+        """Error responses should not carry validators."""
+        response = client.get('/api/entries?limit=0')
+        assert response.status_code == 400
+        assert 'ETag' not in response.headers
+
+
+class TestEntriesAPIBatchCreate:
+    """Tests for batch ingestion on POST /api/entries."""
+
+    def test_json_array_creates_entries(self, client):
+        """A JSON array should create every entry and return ids in order."""
+        response = client.post('/api/entries', json=[{'value': 'one'}, {'value': 'two'}])
+        assert response.status_code == 201
+        assert response.json['count'] == 2
+        ids = response.json['ids']
+        entries = {e['id']: e['value'] for e in client.get('/api/entries').json}
+        assert [entries[i] for i in ids] == ['one', 'two']
+
+    def test_ndjson_creates_entries(self, client):
+        """NDJSON bodies should be accepted, ignoring blank lines."""
+        body = '{"value": "first"}\n\n{"value": "second"}\n'
+        response = client.post('/api/entries', data=body,
+                               content_type='application/x-ndjson')
+        assert response.status_code == 201
+        assert response.json['count'] == 2
+
+    def test_invalid_item_rejects_whole_batch(self, client):
+        """Any invalid item should fail the batch and report each index."""
+        response = client.post('/api/entries', json=[
+            {'value': 'ok'}, {'value': '  '}, {'other': 1}, 'text'
+        ])
+        assert response.status_code == 400
+        assert [d['index'] for d in response.json['details']] == [1, 2, 3]
+        assert client.get('/api/entries').json == []
+
+    def test_malformed_json_rejected(self, client):
+        """Unparseable or non-array bodies should get 400."""
+        response = client.post('/api/entries', data='[{"value": ',
+                               content_type='application/json')
+        assert response.status_code == 400
+        response = client.post('/api/entries', json={'value': 'not a list'})
+        assert response.status_code == 400
+
+    def test_empty_batch_rejected(self, client):
+        """An empty array should get 400."""
+        response = client.post('/api/entries', json=[])
+        assert response.status_code == 400
+
+    def test_batch_size_limit(self, app, client):
+        """More than API_ENTRIES_MAX_BATCH items should get 413."""
+        app.config['API_ENTRIES_MAX_BATCH'] = 2
+        response = client.post('/api/entries', json=[{'value': str(i)} for i in range(3)])
+        assert response.status_code == 413
+        assert client.get('/api/entries').json == []
+
+    def test_body_size_limit(self, app, client):
+        """Bodies over API_ENTRIES_MAX_BODY_BYTES should get 413."""
+        app.config['API_ENTRIES_MAX_BODY_BYTES'] = 32
+        response = client.post('/api/entries', json=[{'value': 'x' * 64}])
+        assert response.status_code == 413
+
+    def test_unsupported_content_type(self, client):
+        """Form posts should get 415."""
+        response = client.post('/api/entries', data={'value': 'form'})
+        assert response.status_code == 415
+
+    def test_updates_cached_count(self, client, count_queries):
+        """The batch should be counted without re-counting the table."""
+        client.post('/api/entries', json=[{'value': 'a'}])
+        client.get('/demo/')
+        client.post('/api/entries', json=[{'value': 'b'}, {'value': 'c'}])
+        with count_queries() as queries:
+            response = client.get('/demo/')
+        assert b'(3 total)' in response.data
+        assert not any('count(' in sql.lower() for sql, _ in queries.statements)
+
+
+class TestProjections:
+    """Tests for the read-only row objects used by listing queries."""
+
+    def test_entry_row_matches_model(self, app):
+        """EntryRow exposes the same attributes and dict as Entry."""
+        from app.projections import EntryRow
+        from app.services.entry_service import EntryService
+        entry = EntryService.create_entry('projected')
+        row = EntryService.get_recent_entries()[0]
+        assert isinstance(row, EntryRow)
+        assert row.to_dict() == entry.to_dict()
+
+    def test_registration_row_matches_model(self, app):
+        """RegistrationRow exposes the same attributes and dict as Registration."""
+        from app.projections import RegistrationRow
+        from app.services.registration_service import RegistrationService
+        registration = RegistrationService.create_registration(
+            'Row Test', 'row@test.com', 'Row Corp', 'Tester'
+        )
+        row = RegistrationService.get_registrations_sorted()[0]
+        assert isinstance(row, RegistrationRow)
+        assert row.to_dict() == registration.to_dict()
+
+    def test_rows_are_not_tracked(self, app):
+        """Listing queries do not load instances into the session."""
+        from app.services.entry_service import EntryService
+        from app.services.registration_service import RegistrationService
+        for i in range(3):
+            EntryService.create_entry(f'entry {i}')
+            RegistrationService.create_registration(f'P {i}', f'p{i}@test.com', 'C', 'T')
+        db.session.expunge_all()
+
+        EntryService.get_all_entries()
+        list(EntryService.iter_entries(batch_size=2))
+        list(RegistrationService.iter_registrations(batch_size=2))
+        RegistrationService.get_registrations_page(per_page=2).items
+        assert len(db.session.identity_map) == 0
+
+    def test_rows_have_no_instance_dict(self):
+        """Row objects are slotted tuples without a per-row __dict__."""
+        from datetime import datetime
+        from app.projections import EntryRow
+        row = EntryRow(1, 'value', datetime(2025, 1, 1))
+        assert not hasattr(row, '__dict__')
+        with pytest.raises(AttributeError):
+            row.value = 'changed'
+
+    def test_paginated_rows(self, app):
+        """Row pagination keeps the Flask-SQLAlchemy pagination interface."""
+        from app.projections import RegistrationRow
+        from app.services.registration_service import RegistrationService
+        for i in range(5):
+            RegistrationService.create_registration(f'P {i}', f'p{i}@test.com', 'C', 'T')
+        page = RegistrationService.get_registrations_page(page=2, per_page=2, sort_by='email',
+                                                          order='asc')
+        assert page.total == 5
+        assert page.pages == 3
+        assert [r.email for r in page.items] == ['p2@test.com', 'p3@test.com']
+        assert all(isinstance(r, RegistrationRow) for r in page.items)
+
+    def test_paginated_rows_with_known_total(self, app, count_queries):
+        """A total passed in replaces the COUNT query."""
+        from app.services.registration_service import RegistrationService
+        for i in range(5):
+            RegistrationService.create_registration(f'P {i}', f'p{i}@test.com', 'C', 'T')
+        with count_queries() as queries:
+            page = RegistrationService.get_registrations_page(per_page=2, total=5)
+        assert queries.count == 1
+        assert (page.total, page.pages) == (5, 3)
+
+    def test_projection_benchmark(self, app):
+        """benchmarks/projections.py reports rows/s and memory for both paths."""
+        from benchmarks.projections import CASES, run_projection_benchmarks
+        results = run_projection_benchmarks(app, 30, repeat=1)
+        assert len(results) == len(CASES)
+        for result in results:
+            assert result['rows'] == 30
+            assert result['rows_per_second'] > 0
+            assert result['peak_memory_mb'] >= 0
+        assert all('speedup' in r for r in results if r['path'] == 'rows')
+
+
+
+class TestJSONProvider:
+    """Tests for the app.json provider and its compiled serializers."""
+
+    BACKENDS = ['json', pytest.param('orjson', marks=pytest.mark.skipif(
+        orjson is None, reason='orjson not installed'))]
+
+    def _provider(self, app, backend):
+        from app.json_provider import FastJSONProvider
+        from app.models import Registration
+        from app.projections import EntryRow, RegistrationRow
+        provider = FastJSONProvider(app, backend=backend)
+        provider.register(Entry, Registration, EntryRow, RegistrationRow)
+        return provider
+
+    def test_app_uses_provider(self, app):
+        """create_app installs the provider so jsonify uses it."""
+        from app.json_provider import FastJSONProvider
+        assert isinstance(app.json, FastJSONProvider)
+        assert app.json.backend == 'json'
+
+    @pytest.mark.parametrize('backend', BACKENDS)
+    def test_serializers_match_to_dict(self, app, backend):
+        """Compiled serializers encode models and rows like to_dict()."""
+        import json
+        from app.services.entry_service import EntryService
+        from app.services.registration_service import RegistrationService
+        provider = self._provider(app, backend)
+        entry = EntryService.create_entry('Grüße "quoted"')
+        registration = RegistrationService.create_registration(
+            'Zoë', 'zoe@test.com', 'Contoso', 'Engineer'
+        )
+        for obj in (entry, registration, EntryService.get_recent_entries()[0],
+                    RegistrationService.get_registrations_sorted()[0]):
+            assert json.loads(provider.dumps(obj)) == obj.to_dict()
+            assert json.loads(provider.dumps([obj])) == [obj.to_dict()]
+
+    @pytest.mark.parametrize('backend', BACKENDS)
+    def test_output_is_compact_unicode_and_ordered(self, app, backend):
+        """Keys keep insertion order, text stays UTF-8, datetimes are ISO 8601."""
+        from datetime import datetime
+        from app.projections import EntryRow
+        provider = self._provider(app, backend)
+        row = EntryRow(1, 'café', datetime(2025, 1, 2, 3, 4, 5))
+        assert provider.dumps(row, separators=(',', ':')) == \
+            '{"id":1,"value":"café","created_at":"2025-01-02T03:04:05"}'
+        assert provider.dumps({'at': datetime(2025, 1, 2)}, separators=(',', ':')) == \
+            '{"at":"2025-01-02T00:00:00"}'
+
+    def _nested_payload(self):
+        from datetime import datetime
+        from app.projections import EntryRow, RegistrationRow
+        entry = EntryRow(1, 'café', datetime(2025, 1, 2, 3, 4, 5))
+        registration = RegistrationRow(2, 'Zoë', 'zoe@test.com', 'Contoso', 'CTO',
+                                       datetime(2025, 1, 3))
+        return {'page': {'items': [entry, (entry,)], 'owner': registration},
+                'rows': (registration,), 'at': datetime(2025, 1, 4)}
+
+    @pytest.mark.parametrize('backend', BACKENDS)
+    def test_nested_rows_are_objects(self, app, backend):
+        """Registered rows nested in dicts, lists and tuples become objects."""
+        import json
+        provider = self._provider(app, backend)
+        payload = self._nested_payload()
+        entry, registration = payload['page']['items'][0], payload['page']['owner']
+        expected = {'page': {'items': [entry.to_dict(), [entry.to_dict()]],
+                             'owner': registration.to_dict()},
+                    'rows': [registration.to_dict()], 'at': '2025-01-04T00:00:00'}
+        assert json.loads(provider.dumps(payload)) == expected
+        assert json.loads(b''.join(provider.iter_encode([payload]))) == [expected]
+
+    @pytest.mark.skipif(orjson is None, reason='orjson not installed')
+    def test_backends_produce_identical_json(self, app):
+        """Both backends encode a nested payload to the same bytes."""
+        payload = self._nested_payload()
+        json_provider, orjson_provider = self._provider(app, 'json'), self._provider(app, 'orjson')
+        compact = {'separators': (',', ':')}
+        assert json_provider.dumps(payload, **compact) == orjson_provider.dumps(payload, **compact)
+        assert b''.join(json_provider.iter_encode([payload], ndjson=True)) == \
+            b''.join(orjson_provider.iter_encode([payload], ndjson=True))
+
+    @pytest.mark.parametrize('backend', BACKENDS)
+    @pytest.mark.parametrize('count', [0, 1, 5])
+    def test_iter_encode(self, app, backend, count):
+        """iter_encode yields a complete array or NDJSON across chunks."""
+        import json
+        from datetime import datetime
+        from app.projections import EntryRow
+        provider = self._provider(app, backend)
+        rows = [EntryRow(i, f'v{i}', datetime(2025, 1, 1)) for i in range(count)]
+        expected = [row.to_dict() for row in rows]
+
+        chunks = list(provider.iter_encode(iter(rows), chunk_size=2))
+        assert all(isinstance(chunk, bytes) for chunk in chunks)
+        assert json.loads(b''.join(chunks)) == expected
+
+        lines = b''.join(provider.iter_encode(iter(rows), ndjson=True, chunk_size=2))
+        assert [json.loads(line) for line in lines.splitlines()] == expected
+
+    @pytest.mark.parametrize('backend', BACKENDS)
+    def test_loads_errors_are_json_decode_errors(self, app, backend):
+        """Invalid input raises json.JSONDecodeError on either backend."""
+        import json
+        provider = self._provider(app, backend)
+        assert provider.loads(b'{"value": "x"}') == {'value': 'x'}
+        with pytest.raises(json.JSONDecodeError):
+            provider.loads('{not json')
+
+    def test_api_page_uses_serializers(self, client):
+        """The entries page encodes rows without to_dict()."""
+        from app.services.entry_service import EntryService
+        EntryService.create_entry('one')
+        response = client.get('/api/entries')
+        assert response.status_code == 200
+        assert response.json == [EntryService.get_recent_entries()[0].to_dict()]
+
+    def test_unknown_field_rejected(self):
+        """Serializers can only be compiled for existing columns."""
+        from app.json_provider import compile_serializer
+        serialize = compile_serializer(Entry, fields=['id', 'value'])
+        assert serialize(Entry(id=3, value='x')) == {'id': 3, 'value': 'x'}
+        with pytest.raises(ValueError):
+            compile_serializer(Entry, fields=['id', 'password'])
+
+    def test_invalid_backend(self, app):
+        """An unknown JSON_BACKEND is a configuration error."""
+        from app.json_provider import FastJSONProvider
+        with pytest.raises(ValueError):
+            FastJSONProvider(app, backend='simdjson')
+
+    def test_serialization_benchmark(self, app):
+        """benchmarks/serialization.py reports rows/s for each encoder."""
+        from benchmarks.serialization import run_serialization_benchmarks
+        results = run_serialization_benchmarks(app, 20, repeat=1)
+        assert {r['encoder'] for r in results} >= {'flask-default', 'json', 'json iter_encode'}
+        assert all(r['rows_per_second'] > 0 for r in results)
+
+class TestEntryCountProvider:
+    """Tests for exact, cached and estimated entry counts."""
+
+    def _insert_directly(self, count):
+        # Bypass EntryService, as another worker process would
+        for i in range(count):
+            db.session.add(Entry(value=f'direct {i}'))
+        db.session.commit()
+
+    def test_cached_count_tracks_create_entry(self, app):
+        """create_entry should keep the cached count current without recounting."""
+        with app.app_context():
+            from app.services.entry_service import EntryService
+            assert EntryService.get_entry_count() == 0
+            EntryService.create_entry('one')
+            EntryService.create_entry('two')
+            assert EntryService.get_entry_count() == 2
+
+    def test_cached_count_reconciles_after_interval(self, app):
+        """Rows written elsewhere should appear after the reconcile interval."""
+        from app.services.entry_count import EntryCountProvider
+        now = [0.0]
+        with app.app_context():
+            provider = EntryCountProvider('cached', reconcile_interval=60, clock=lambda: now[0])
+            assert provider.count() == 0
+            self._insert_directly(3)
+            assert provider.count() == 0
+            now[0] += 61
+            assert provider.count() == 3
+
+    def test_exact_mode_always_counts(self, app):
+        """exact mode should see rows immediately."""
+        from app.services.entry_count import EntryCountProvider
+        with app.app_context():
+            provider = EntryCountProvider('exact')
+            assert provider.count() == 0
+            self._insert_directly(2)
+            assert provider.count() == 2
+
+    def test_estimated_mode_falls_back_on_sqlite(self, app):
+        """Without pg_class, estimated mode should behave like cached."""
+        from app.services.entry_count import EntryCountProvider
+        with app.app_context():
+            self._insert_directly(2)
+            provider = EntryCountProvider('estimated')
+            assert provider.count() == 2
+
+    def test_estimated_mode_uses_estimate_above_threshold(self, app, monkeypatch):
+        """Large planner estimates should be returned without counting."""
+        from app.services.entry_count import EntryCountProvider
+        provider = EntryCountProvider('estimated', estimate_threshold=1000)
+        monkeypatch.setattr(provider, '_estimated_count', lambda: 5_000_000)
+        monkeypatch.setattr(provider, '_exact_count', lambda: pytest.fail('counted'))
+        assert provider.count() == 5_000_000
+
+    def test_estimated_mode_counts_small_tables(self, app, monkeypatch):
+        """Estimates below the threshold should fall back to the cached count."""
+        from app.services.entry_count import EntryCountProvider
+        with app.app_context():
+            self._insert_directly(4)
+            provider = EntryCountProvider('estimated', estimate_threshold=1000)
+            monkeypatch.setattr(provider, '_estimated_count', lambda: 10)
+            assert provider.count() == 4
+
+    def test_invalid_mode_rejected(self):
+        """Unknown modes should fail at startup."""
+        from app.services.entry_count import EntryCountProvider
+        with pytest.raises(ValueError):
+            EntryCountProvider('guess')
+
+    def test_demo_page_shows_cached_count(self, client):
+        """The demo page total should reflect entries created through it."""
+        client.get('/demo/')
+        client.post('/demo/', data={'value': 'counted'})
+        response = client.get('/demo/')
+        assert b'(1 total)' in response.data
+
+
 class TestRegistrationModel:
     """Tests for the Registration model."""
 
@@ -731,6 +1260,664 @@ class TestAdminSorting:
         assert b'Export CSV' in response.data
 
 
+class TestAdminPagination:
+    """Tests for server-side pagination of /admin/attendees."""
+
+    def _create_registrations(self, app, count):
+        from app.services.registration_service import RegistrationService
+        with app.app_context():
+            for i in range(count):
+                RegistrationService.create_registration(
+                    name=f'Person {i:02d}', email=f'person{i}@test.com',
+                    company='Corp', job_title='Dev'
+                )
+
+    def test_admin_attendees_limits_page_size(self, app, authenticated_client):
+        """Only `size` registrations should be rendered per page."""
+        self._create_registrations(app, 5)
+        response = authenticated_client.get('/admin/attendees?sort=name&order=asc&size=2')
+        assert b'Person 00' in response.data
+        assert b'Person 01' in response.data
+        assert b'Person 02' not in response.data
+        assert b'of 5 registrations' in response.data
+
+    def test_admin_attendees_second_page(self, app, authenticated_client):
+        """page=2 should show the next slice in sort order."""
+        self._create_registrations(app, 5)
+        response = authenticated_client.get('/admin/attendees?sort=name&order=asc&size=2&page=2')
+        assert b'Person 02' in response.data
+        assert b'Person 03' in response.data
+        assert b'Person 01' not in response.data
+
+    def test_admin_attendees_shows_page_links(self, app, authenticated_client):
+        """Pagination nav should appear when there is more than one page."""
+        self._create_registrations(app, 3)
+        response = authenticated_client.get('/admin/attendees?size=2')
+        assert b'class="pagination"' in response.data
+        assert b'page=2' in response.data
+
+    def test_admin_attendees_no_page_links_for_single_page(self, app, authenticated_client):
+        """Pagination nav should be hidden when everything fits on one page."""
+        self._create_registrations(app, 2)
+        response = authenticated_client.get('/admin/attendees')
+        assert b'class="pagination"' not in response.data
+
+    def test_admin_attendees_page_out_of_range(self, app, authenticated_client):
+        """A page past the end should redirect to the last page."""
+        self._create_registrations(app, 3)
+        response = authenticated_client.get('/admin/attendees?sort=name&order=asc&size=2&page=99')
+        assert response.status_code == 302
+        assert 'page=2' in response.location
+        assert 'sort=name' in response.location
+
+        response = authenticated_client.get('/admin/attendees?size=2&page=99',
+                                            follow_redirects=True)
+        assert b'Showing 3&ndash;3 of 3' in response.data
+        assert b'No registrations yet' not in response.data
+
+    def test_admin_attendees_empty_table_page(self, app, authenticated_client):
+        """With no registrations any page shows the empty state, not a redirect."""
+        response = authenticated_client.get('/admin/attendees?page=5')
+        assert response.status_code == 200
+        assert b'No registrations yet' in response.data
+
+    def test_admin_attendees_size_is_capped(self, app, authenticated_client):
+        """size should be clamped to ADMIN_ATTENDEES_MAX_PAGE_SIZE."""
+        app.config['ADMIN_ATTENDEES_MAX_PAGE_SIZE'] = 3
+        self._create_registrations(app, 5)
+        response = authenticated_client.get('/admin/attendees?size=1000')
+        assert b'Showing 1&ndash;3 of 5' in response.data
+
+
+def _paged_sort_query(sort_by, order):
+    from app.services.registration_service import RegistrationService
+    return RegistrationService.sorted_query(sort_by, order).limit(50).offset(100)
+
+
+SORT_CASES = [
+    (column, order)
+    for column in ['name', 'email', 'company', 'job_title', 'created_at']
+    for order in ['asc', 'desc']
+]
+
+
+class TestRegistrationSortIndexes:
+    """Each allowed sort key must be served by an index, not a full sort."""
+
+    @pytest.mark.parametrize('sort_by,order', SORT_CASES)
+    def test_sort_uses_index_sqlite(self, app, sort_by, order):
+        """SQLite should walk an index and never build a temp B-tree."""
+        from sqlalchemy import text
+        query = _paged_sort_query(sort_by, order)
+        sql = str(query.compile(db.engine, compile_kwargs={'literal_binds': True}))
+        plan = ' '.join(
+            row[-1] for row in db.session.execute(text(f'EXPLAIN QUERY PLAN {sql}'))
+        )
+        assert 'USING INDEX' in plan
+        assert 'TEMP B-TREE' not in plan
+
+    @pytest.mark.skipif(not os.environ.get('TEST_POSTGRES_URL'),
+                        reason='TEST_POSTGRES_URL not set')
+    @pytest.mark.parametrize('sort_by,order', SORT_CASES)
+    def test_sort_uses_index_postgresql(self, app, sort_by, order):
+        """PostgreSQL should plan an Index Scan with no Sort node."""
+        from sqlalchemy import create_engine, text
+        from app.models.registration import Registration
+        engine = create_engine(os.environ['TEST_POSTGRES_URL'])
+        table = Registration.__table__
+        table.create(engine, checkfirst=True)
+        try:
+            query = _paged_sort_query(sort_by, order)
+            sql = str(query.compile(engine, compile_kwargs={'literal_binds': True}))
+            with engine.connect() as conn:
+                # Empty test tables would otherwise always favour a seq scan
+                conn.execute(text('SET enable_seqscan = off'))
+                plan = '\n'.join(row[0] for row in conn.execute(text(f'EXPLAIN {sql}')))
+            assert 'Index Scan' in plan
+            assert 'Sort' not in plan
+        finally:
+            table.drop(engine, checkfirst=True)
+            engine.dispose()
+
+
+class TestRegistrationSearch:
+    """Tests for full-text search over registrations."""
+
+    def _register(self, name, email, company='Contoso', job_title='Developer'):
+        from app.services.registration_service import RegistrationService
+        return RegistrationService.create_registration(name, email, company, job_title)
+
+    def test_matches_words_and_prefixes(self, app):
+        """Every word must match a whole word or a prefix in any column."""
+        from app.services.registration_service import RegistrationService
+        self._register('Anna Berg', 'anna@example.com', 'Fabrikam', 'Architect')
+        self._register('Annika Holm', 'annika@example.com')
+        self._register('Ben Dahl', 'ben@example.com')
+
+        assert {r.name for r in RegistrationService.search_registrations('ann')} == \
+            {'Anna Berg', 'Annika Holm'}
+        assert [r.name for r in RegistrationService.search_registrations('ann fab')] == \
+            ['Anna Berg']
+        assert [r.name for r in RegistrationService.search_registrations('ARCHITECT')] == \
+            ['Anna Berg']
+        assert RegistrationService.search_registrations('zzz') == []
+
+    def test_matches_email_parts(self, app):
+        """Email addresses are searchable by their parts."""
+        from app.services.registration_service import RegistrationService
+        self._register('Anna Berg', 'anna.berg@woodgrove.example')
+        results = RegistrationService.search_registrations('berg@woodgrove')
+        assert [r.email for r in results] == ['anna.berg@woodgrove.example']
+
+    def test_name_match_ranks_first(self, app):
+        """A match in the name should outrank a match in the email."""
+        from app.services.registration_service import RegistrationService
+        self._register('Ben Dahl', 'lena@example.com')
+        self._register('Lena Ek', 'ek@example.com')
+        results = RegistrationService.search_registrations('lena')
+        assert [r.name for r in results] == ['Lena Ek', 'Ben Dahl']
+
+    def test_limit(self, app):
+        """Only the top ``limit`` matches are returned."""
+        from app.services.registration_service import RegistrationService
+        for i in range(5):
+            self._register(f'Sara {i}', f'sara{i}@example.com')
+        assert len(RegistrationService.search_registrations('sara', limit=3)) == 3
+
+    def test_punctuation_only_query(self, app):
+        """Queries without words (or with FTS syntax) should not error."""
+        from app.services.registration_service import RegistrationService
+        self._register('Anna Berg', 'anna@example.com')
+        assert RegistrationService.search_registrations('"*() -') == []
+        assert [r.name for r in RegistrationService.search_registrations('anna" OR "x')] == []
+
+    def test_index_follows_bulk_import_and_delete(self, app):
+        """Rows written outside create_registration are indexed too."""
+        from app.models import Registration
+        from app.services.registration_service import RegistrationService
+        RegistrationService.import_registrations([{
+            'name': 'Imported Person', 'email': 'imported@example.com',
+            'company': 'Litware', 'job_title': 'CTO',
+        }])
+        assert [r.name for r in RegistrationService.search_registrations('litware')] == \
+            ['Imported Person']
+
+        db.session.execute(db.delete(Registration))
+        db.session.commit()
+        assert RegistrationService.search_registrations('litware') == []
+
+    def test_failed_import_keeps_index_in_sync(self, app):
+        """Committed batches of a failed import are indexed and the trigger is back."""
+        from app.services.registration_service import RegistrationService
+
+        def rows():
+            for i in range(2):
+                yield {'name': f'Batch Person {i}', 'email': f'batch{i}@example.com',
+                       'company': 'Litware', 'job_title': 'CTO'}
+            raise OSError('file truncated')
+
+        with pytest.raises(OSError):
+            RegistrationService.import_registrations(rows(), batch_size=2)
+        assert len(RegistrationService.search_registrations('litware')) == 2
+
+        self._register('Anna Berg', 'anna@example.com')
+        assert [r.name for r in RegistrationService.search_registrations('anna')] == ['Anna Berg']
+
+    def test_import_keeps_insert_trigger(self, app):
+        """Imports never commit a batch without the search trigger in place."""
+        from app.services.registration_service import RegistrationService
+        triggers = []
+
+        def rows():
+            for i in range(4):
+                triggers.append(db.session.execute(db.text(
+                    "SELECT count(*) FROM sqlite_master WHERE name = 'registrations_fts_ai'"
+                )).scalar())
+                yield {'name': f'Live Person {i}', 'email': f'live{i}@example.com',
+                       'company': 'Litware', 'job_title': 'CTO'}
+
+        RegistrationService.import_registrations(rows(), batch_size=2)
+        assert triggers == [1, 1, 1, 1]
+
+    def test_create_index_indexes_existing_rows(self, app):
+        """Creating the index on a populated table should backfill it."""
+        from app.search import create_search_index, drop_search_index
+        from app.services.registration_service import RegistrationService
+        self._register('Anna Berg', 'anna@example.com')
+        drop_search_index(db.session.connection())
+        db.session.commit()
+        self._register('Ben Dahl', 'ben@example.com')
+        create_search_index(db.session.connection())
+        db.session.commit()
+        assert len(RegistrationService.search_registrations('example')) == 2
+
+    def test_admin_search(self, app, authenticated_client):
+        """The admin page should show ranked matches for ?q= without paging."""
+        self._register('Anna Berg', 'anna@example.com', 'Fabrikam')
+        self._register('Ben Dahl', 'ben@example.com', 'Contoso')
+        response = authenticated_client.get('/admin/attendees?q=fabrikam')
+        assert response.status_code == 200
+        assert b'Anna Berg' in response.data
+        assert b'Ben Dahl' not in response.data
+        assert b'1 match for' in response.data
+
+    def test_admin_search_no_results(self, authenticated_client):
+        """A search without matches should say so instead of the empty state."""
+        response = authenticated_client.get('/admin/attendees?q=nobody')
+        assert b'0 matches for' in response.data
+        assert b'No registrations yet' not in response.data
+
+    def test_admin_search_query_budget(self, app, authenticated_client, query_budget):
+        """Search costs one query for the matches plus the stats panel."""
+        self._register('Anna Berg', 'anna@example.com')
+        authenticated_client.get('/admin/attendees?q=anna')
+        with query_budget(4, 'admin search'):
+            authenticated_client.get('/admin/attendees?q=anna')
+
+
+class TestRegistrationStatsRollup:
+    """Tests for the incrementally maintained daily statistics."""
+
+    def test_create_registration_updates_rollup(self, app):
+        """Each registration should increment today's rollup row."""
+        with app.app_context():
+            from app.models.registration_stat import RegistrationDailyStat
+            from app.services.registration_service import RegistrationService
+            for i in range(3):
+                RegistrationService.create_registration(
+                    name='User', email=f'rollup{i}@test.com', company='C', job_title='Dev'
+                )
+            rows = RegistrationDailyStat.query.all()
+            assert len(rows) == 1
+            assert rows[0].count == 3
+
+    def test_duplicate_email_does_not_update_rollup(self, app):
+        """A rejected registration must not be counted."""
+        with app.app_context():
+            from app.services.registration_service import (
+                RegistrationService, DuplicateEmailError
+            )
+            RegistrationService.create_registration(
+                name='User', email='dup@test.com', company='C', job_title='Dev'
+            )
+            with pytest.raises(DuplicateEmailError):
+                RegistrationService.create_registration(
+                    name='User', email='dup@test.com', company='C', job_title='Dev'
+                )
+            assert RegistrationService.get_registration_stats()['total'] == 1
+
+    def test_stats_read_from_rollup(self, app):
+        """Stats should report totals and per-day counts from the rollup."""
+        with app.app_context():
+            from datetime import date
+            from app.models.registration_stat import RegistrationDailyStat
+            from app.services.registration_service import RegistrationService
+            db.session.add(RegistrationDailyStat(day=date(2026, 1, 1), count=4))
+            db.session.add(RegistrationDailyStat(day=date(2026, 1, 2), count=6))
+            db.session.commit()
+            stats = RegistrationService.get_registration_stats()
+            assert stats['total'] == 10
+            assert stats['by_date'][0] == {'date': '2026-01-02', 'count': 6}
+
+    def test_stats_limit_to_seven_days(self, app):
+        """by_date should only cover the seven most recent days."""
+        with app.app_context():
+            from datetime import date
+            from app.models.registration_stat import RegistrationDailyStat
+            from app.services.registration_service import RegistrationService
+            for day in range(1, 11):
+                db.session.add(RegistrationDailyStat(day=date(2026, 1, day), count=1))
+            db.session.commit()
+            stats = RegistrationService.get_registration_stats()
+            assert stats['total'] == 10
+            assert len(stats['by_date']) == 7
+
+    def test_rebuild_daily_stats_repairs_drift(self, app):
+        """rebuild_daily_stats should recompute counts from registrations."""
+        with app.app_context():
+            from datetime import datetime
+            from app.models.registration import Registration
+            from app.models.registration_stat import RegistrationDailyStat
+            from app.services.registration_service import RegistrationService
+            # Rows written outside the service, so the rollup never saw them
+            for i, day in enumerate([1, 1, 2]):
+                db.session.add(Registration(
+                    name='User', email=f'drift{i}@test.com', company='C', job_title='Dev',
+                    created_at=datetime(2026, 3, day, 12, 0)
+                ))
+            db.session.commit()
+            assert RegistrationService.get_registration_stats()['total'] == 0
+
+            assert RegistrationService.rebuild_daily_stats() == 2
+            stats = RegistrationService.get_registration_stats()
+            assert stats['total'] == 3
+            assert stats['by_date'] == [
+                {'date': '2026-03-02', 'count': 1},
+                {'date': '2026-03-01', 'count': 2},
+            ]
+            assert RegistrationDailyStat.query.count() == 2
+
+    def test_rebuild_stats_command(self, app, runner):
+        """flask rebuild-stats should rebuild and report the day count."""
+        with app.app_context():
+            from app.services.registration_service import RegistrationService
+            RegistrationService.create_registration(
+                name='User', email='cli@test.com', company='C', job_title='Dev'
+            )
+        result = runner.invoke(args=['rebuild-stats'])
+        assert result.exit_code == 0
+        assert 'rebuilt (1 days)' in result.output
+
+
+class TestAttendeeAnalytics:
+    """Tests for the distinct company and top value sketches."""
+
+    def _register(self, i, company, job_title='Developer'):
+        from app.services.registration_service import RegistrationService
+        RegistrationService.create_registration(f'Person {i}', f'p{i}@example.com',
+                                                company, job_title)
+
+    def test_hyperloglog_accuracy(self):
+        """Distinct estimates stay within a few percent, nearly exact for small sets."""
+        from app.sketches import HyperLogLog
+        small, large = HyperLogLog(), HyperLogLog()
+        for i in range(100):
+            small.add(f'company {i}')
+            small.add(f'company {i}')
+        for i in range(50_000):
+            large.add(f'company {i}')
+        assert abs(small.count() - 100) <= 2
+        assert abs(large.count() - 50_000) < 50_000 * 0.05
+
+    def test_space_saving_keeps_heavy_hitters(self):
+        """Frequent values survive evictions with counts as upper bounds."""
+        from app.sketches import SpaceSaving
+        top = SpaceSaving(capacity=5)
+        for i in range(200):
+            top.add('big', 'Big')
+            top.add(f'rare{i}', f'Rare {i}')
+        result = top.top(1)[0]
+        assert result['name'] == 'Big'
+        assert 200 <= result['count'] <= 200 + result['error']
+
+    def test_serialization_round_trip(self):
+        """Sketches survive to_bytes/from_bytes and stay small."""
+        from app.sketches import ColumnSketch
+        sketch = ColumnSketch()
+        for i in range(1000):
+            sketch.add(f'Company {i % 40}')
+        data = sketch.to_bytes()
+        restored = ColumnSketch.from_bytes(data)
+        assert restored.distinct.count() == sketch.distinct.count()
+        assert abs(restored.distinct.count() - 40) <= 2
+        assert restored.frequent.top(3) == sketch.frequent.top(3)
+        assert len(data) < 8192
+
+    def test_corrupt_data_rejected(self):
+        """Unreadable blobs raise ValueError."""
+        from app.sketches import ColumnSketch
+        with pytest.raises(ValueError):
+            ColumnSketch.from_bytes(b'not a sketch')
+
+    def test_updated_on_registration(self, app):
+        """create_registration counts companies case-insensitively."""
+        from app.services.registration_service import RegistrationService
+        self._register(1, 'Contoso')
+        self._register(2, ' contoso ', 'CTO')
+        self._register(3, 'Fabrikam')
+        analytics = RegistrationService.get_attendee_analytics()
+        assert analytics['company']['distinct'] == 2
+        assert analytics['company']['top'][0] == {'name': 'Contoso', 'count': 2, 'error': 0}
+        assert [t['name'] for t in analytics['job_title']['top']] == ['Developer', 'CTO']
+
+    def test_registrations_queue_deltas_until_read(self, app):
+        """Writers only append deltas; reading the analytics folds them once."""
+        from app.models import RegistrationSketch, RegistrationSketchDelta
+        from app.services.registration_service import RegistrationService
+        self._register(1, 'Contoso')
+        self._register(2, 'Contoso')
+        assert db.session.query(RegistrationSketchDelta).count() == 4
+        assert db.session.query(RegistrationSketch).count() == 0
+
+        first = RegistrationService.get_attendee_analytics()
+        assert db.session.query(RegistrationSketchDelta).count() == 0
+        assert RegistrationService.get_attendee_analytics() == first
+        assert first['company']['top'] == [{'name': 'Contoso', 'count': 2, 'error': 0}]
+
+    def test_fold_in_batches(self, app, monkeypatch):
+        """More deltas than one fold batch are all counted."""
+        from app.services.registration_service import RegistrationService
+        monkeypatch.setattr(RegistrationService, 'SKETCH_FOLD_BATCH', 3)
+        for i in range(5):
+            self._register(i, f'Company {i}')
+        assert RegistrationService.get_attendee_analytics()['company']['distinct'] == 5
+
+    def test_from_counts_normalizes_before_ranking(self):
+        """Spellings of one value are summed before the top values are chosen."""
+        from app.sketches import ColumnSketch
+        counts = [('Fabrikam', 4), ('Contoso', 3), (' contoso ', 2), ('CONTOSO', 1)]
+        sketch = ColumnSketch.from_counts(counts, capacity=1)
+        assert sketch.distinct.count() == 2
+        assert sketch.frequent.top() == [{'name': 'Contoso', 'count': 6, 'error': 0}]
+
+    def test_updated_on_import(self, app):
+        """Bulk imports update the sketches once per batch."""
+        from app.services.registration_service import RegistrationService
+        RegistrationService.import_registrations([
+            {'name': f'P {i}', 'email': f'i{i}@example.com', 'company': f'Co {i % 3}',
+             'job_title': 'Tester'} for i in range(9)
+        ])
+        analytics = RegistrationService.get_attendee_analytics()
+        assert analytics['company']['distinct'] == 3
+        assert analytics['job_title']['top'] == [{'name': 'Tester', 'count': 9, 'error': 0}]
+
+    def test_failed_registration_not_counted(self, app):
+        """A duplicate email rolls back its sketch update too."""
+        from app.services.registration_service import (DuplicateEmailError,
+                                                       RegistrationService)
+        self._register(1, 'Contoso')
+        with pytest.raises(DuplicateEmailError):
+            self._register(1, 'Fabrikam')
+        assert RegistrationService.get_attendee_analytics()['company']['distinct'] == 1
+
+    def test_rebuild_matches_table(self, app):
+        """rebuild_sketches recovers rows written outside the service layer."""
+        from app.models import Registration
+        from app.services.registration_service import RegistrationService
+        self._register(1, 'Contoso')
+        db.session.execute(db.insert(Registration), [
+            {'name': 'Raw', 'email': f'raw{i}@example.com', 'company': 'Litware',
+             'job_title': 'Developer'} for i in range(3)
+        ])
+        db.session.commit()
+
+        assert RegistrationService.rebuild_sketches() == {'company': 2, 'job_title': 1}
+        top = RegistrationService.get_attendee_analytics()['company']['top']
+        assert top[0] == {'name': 'Litware', 'count': 3, 'error': 0}
+
+    def test_empty_analytics(self, app, count_queries):
+        """Without registrations the analytics are empty and nothing is written."""
+        from app.models import RegistrationSketch
+        from app.services.registration_service import RegistrationService
+        with count_queries() as queries:
+            analytics = RegistrationService.get_attendee_analytics()
+        assert analytics == {
+            'company': {'distinct': 0, 'top': []},
+            'job_title': {'distinct': 0, 'top': []},
+        }
+        assert queries.count == 2
+        assert all(sql.lstrip().upper().startswith('SELECT') for sql, _ in queries.statements)
+        assert db.session.query(RegistrationSketch).count() == 0
+
+    def test_read_without_deltas_does_not_fold(self, app, count_queries, monkeypatch):
+        """Once folded, reads are one query until new deltas are queued."""
+        from app.services.registration_service import RegistrationService
+        self._register(1, 'Contoso')
+        first = RegistrationService.get_attendee_analytics()
+        monkeypatch.setattr(RegistrationService, 'fold_sketch_deltas',
+                            staticmethod(lambda: pytest.fail('folded without deltas')))
+        with count_queries() as queries:
+            assert RegistrationService.get_attendee_analytics() == first
+        assert queries.count == 1
+
+    def test_admin_page_shows_analytics(self, app, authenticated_client):
+        """The stats panel shows unique companies and the top lists."""
+        self._register(1, 'Contoso')
+        self._register(2, 'Woodgrove Bank', 'Architect')
+        response = authenticated_client.get('/admin/attendees')
+        assert b'Unique Companies' in response.data
+        assert b'Top Job Titles' in response.data
+        assert b'Woodgrove Bank' in response.data
+
+    def test_rebuild_stats_cli_rebuilds_sketches(self, app, runner):
+        """flask rebuild-stats also rebuilds the sketches."""
+        self._register(1, 'Contoso')
+        result = runner.invoke(args=['rebuild-stats'])
+        assert 'Analytics sketches rebuilt (~1 companies, ~1 job titles)' in result.output
+
+
+class TestLiveStats:
+    """Tests for the live registration counts on the admin page."""
+
+    # What a gthread worker reports; the test client is single-threaded
+    THREADED = {'wsgi.multithread': True}
+
+    def _register(self, i):
+        from app.services.registration_service import RegistrationService
+        RegistrationService.create_registration(f'Live {i}', f'live{i}@test.com', 'C', 'T')
+
+    def _events(self, response):
+        """Yield the parsed data of each SSE event in a streamed response."""
+        import json
+        for chunk in response.iter_encoded():
+            for block in chunk.decode().split('\n\n'):
+                data = [line[6:] for line in block.splitlines() if line.startswith('data: ')]
+                if data:
+                    yield json.loads(''.join(data))
+
+    def test_live_counts(self, app):
+        """Total and today's count come from the daily rollup."""
+        from app.services.registration_service import RegistrationService
+        assert RegistrationService.get_live_counts() == {'total': 0, 'today': 0}
+        self._register(1)
+        self._register(2)
+        assert RegistrationService.get_live_counts() == {'total': 2, 'today': 2}
+        assert RegistrationService.get_registration_stats()['today'] == 2
+
+    def test_stream_requires_login(self, client):
+        """Anonymous users are redirected to the login page."""
+        response = client.get('/admin/attendees/live')
+        assert response.status_code == 302
+        assert '/auth/login' in response.location
+
+    def test_stream_pushes_new_registrations(self, app, authenticated_client):
+        """The stream sends the counts at once and after each registration."""
+        app.config['LIVE_STATS_KEEPALIVE_SECONDS'] = 1
+        self._register(1)
+        response = authenticated_client.get('/admin/attendees/live', buffered=False,
+                                            environ_overrides=self.THREADED)
+        assert response.status_code == 200
+        assert response.mimetype == 'text/event-stream'
+        assert response.headers['Cache-Control'] == 'no-cache'
+
+        events = self._events(response)
+        assert next(events) == {'total': 1, 'today': 1}
+        self._register(2)
+        assert next(events) == {'total': 2, 'today': 2}
+        response.close()
+        assert app.extensions['live_stats'].stats()['listeners'] == 0
+
+    def test_stream_ends_after_duration(self, app, authenticated_client):
+        """Streams end after LIVE_STATS_STREAM_SECONDS with a retry hint."""
+        app.config['LIVE_STATS_STREAM_SECONDS'] = 0
+        response = authenticated_client.get('/admin/attendees/live', environ_overrides=self.THREADED)
+        body = response.get_data(as_text=True)
+        assert body.startswith('retry: 2000\n')
+        assert body.count('event: stats') == 1
+        assert app.extensions['live_stats'].stats()['listeners'] == 0
+
+    def test_listener_limit(self, app, authenticated_client):
+        """Streams beyond LIVE_STATS_MAX_LISTENERS get 503."""
+        feed = app.extensions['live_stats']
+        feed.max_listeners = 1
+        first = authenticated_client.get('/admin/attendees/live', buffered=False,
+                                         environ_overrides=self.THREADED)
+        assert first.status_code == 200
+        second = authenticated_client.get('/admin/attendees/live', environ_overrides=self.THREADED)
+        assert second.status_code == 503
+        first.close()
+        assert feed.stats()['rejected'] == 1
+
+    def test_single_threaded_server(self, app, authenticated_client):
+        """Sync workers get 503 and no stream is opened or offered."""
+        response = authenticated_client.get('/admin/attendees/live')
+        assert response.status_code == 503
+        assert 'multithreaded' in response.get_json()['error']
+        assert app.extensions['live_stats'].stats()['listeners'] == 0
+        assert b'EventSource' not in authenticated_client.get('/admin/attendees').data
+
+    def test_disabled(self, app, authenticated_client):
+        """Without a feed the endpoint is not found and the page has no script."""
+        app.extensions.pop('live_stats')
+        app.config['LIVE_STATS_ENABLED'] = False
+        assert authenticated_client.get('/admin/attendees/live').status_code == 404
+        page = authenticated_client.get('/admin/attendees', environ_overrides=self.THREADED)
+        assert b'EventSource' not in page.data
+
+    def test_page_subscribes(self, authenticated_client):
+        """The attendees page marks the live counters and opens the stream."""
+        response = authenticated_client.get('/admin/attendees', environ_overrides=self.THREADED)
+        html = response.get_data(as_text=True)
+        assert 'data-live-stat="total"' in html
+        assert 'data-live-stat="today"' in html
+        assert "new EventSource(\"/admin/attendees/live\")" in html
+
+    def test_file_channel_across_processes(self, tmp_path):
+        """A publish through one FileChannel is seen by another on the same file."""
+        from app.live_stats import FileChannel
+        path = str(tmp_path / 'channel' / 'live')
+        publisher, watcher = FileChannel(path), FileChannel(path)
+        assert watcher.version() is None
+        publisher.publish()
+        first = watcher.version()
+        publisher.publish()
+        assert watcher.version() not in (None, first)
+        assert os.listdir(tmp_path / 'channel') == ['live']
+
+    def test_feed_coalesces_bursts(self, app):
+        """Many publishes during min_interval cause a single extra load."""
+        import threading
+        from app.live_stats import LiveStatsFeed, LocalChannel
+        loaded = threading.Event()
+        calls = []
+
+        def load():
+            calls.append(1)
+            loaded.set()
+            return {'loads': len(calls)}
+
+        feed = LiveStatsFeed(app, LocalChannel(), load, poll_interval=0.01, min_interval=0.2)
+        subscription = feed.subscribe()
+        events = subscription.events(duration=5, keepalive=5)
+        feed.publish()
+        assert next(events) == {'loads': 1}
+        for _ in range(20):
+            feed.publish()
+        assert next(events) == {'loads': 2}
+        subscription.close()
+        subscription.close()
+        assert feed.stats() == {'listeners': 0, 'loads': 2, 'rejected': 0}
+
+    def test_publish_failure_does_not_fail_registration(self, app, tmp_path):
+        """A broken channel is logged; the registration still succeeds."""
+        from app.live_stats import FileChannel
+        from app.services.registration_service import RegistrationService
+        channel = FileChannel(str(tmp_path / 'live'))
+        channel.path = str(tmp_path / 'missing' / 'live')
+        app.extensions['live_stats'].channel = channel
+        self._register(1)
+        assert RegistrationService.get_live_counts()['total'] == 1
+
 class TestCSVExport:
     """Tests for CSV export functionality."""
 
@@ -785,6 +1972,235 @@ class TestCSVExport:
         assert 'Name' in lines[0]
 
 
+class TestCSVExportStreaming:
+    """Tests for the streamed, optionally gzipped CSV export."""
+
+    def _create_registrations(self, app, count):
+        from app.services.registration_service import RegistrationService
+        with app.app_context():
+            for i in range(count):
+                RegistrationService.create_registration(
+                    name=f'User {i}', email=f'user{i}@example.com',
+                    company='Stream Corp', job_title='Engineer'
+                )
+
+    def test_export_csv_is_streamed(self, authenticated_client):
+        """Export should be a streamed response, not a buffered body."""
+        response = authenticated_client.get('/admin/export/csv')
+        assert response.is_streamed
+
+    def test_export_csv_spans_multiple_batches(self, app, authenticated_client):
+        """All rows should be exported when they span several batches."""
+        app.config['EXPORT_CSV_BATCH_SIZE'] = 2
+        self._create_registrations(app, 5)
+        response = authenticated_client.get('/admin/export/csv')
+        lines = response.data.decode('utf-8').strip().split('\n')
+        assert len(lines) == 6  # Header + 5 rows
+        assert 'User 4' in lines[1]  # Newest first
+
+    def test_export_csv_uncompressed_by_default(self, authenticated_client):
+        """Clients that do not accept gzip should get plain CSV."""
+        response = authenticated_client.get('/admin/export/csv')
+        assert 'Content-Encoding' not in response.headers
+
+    def test_export_csv_gzip_when_accepted(self, app, authenticated_client):
+        """Clients accepting gzip should get a compressed stream."""
+        import gzip
+        self._create_registrations(app, 3)
+        plain = authenticated_client.get('/admin/export/csv').data
+        response = authenticated_client.get(
+            '/admin/export/csv', headers={'Accept-Encoding': 'gzip'}
+        )
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert gzip.decompress(response.data) == plain
+
+    def test_export_csv_gzip_can_be_disabled(self, app, authenticated_client):
+        """EXPORT_CSV_GZIP=False should always send plain CSV."""
+        app.config['EXPORT_CSV_GZIP'] = False
+        response = authenticated_client.get(
+            '/admin/export/csv', headers={'Accept-Encoding': 'gzip'}
+        )
+        assert 'Content-Encoding' not in response.headers
+        assert b'Registered At' in response.data
+
+    def test_iter_registrations_yields_all(self, app):
+        """iter_registrations should yield every registration."""
+        self._create_registrations(app, 3)
+        with app.app_context():
+            from app.services.registration_service import RegistrationService
+            regs = list(RegistrationService.iter_registrations(batch_size=2))
+            assert len(regs) == 3
+
+
+class TestPageCache:
+    """Tests for the rendered-page cache on marketing routes."""
+
+    def test_second_request_served_from_cache(self, app, client):
+        """Repeat anonymous requests should hit the cache."""
+        first = client.get('/')
+        second = client.get('/')
+        assert first.data == second.data
+        stats = app.extensions['page_cache'].stats()
+        assert stats['misses'] == 1
+        assert stats['hits'] == 1
+
+    def test_cached_page_has_etag_and_cache_control(self, client):
+        """Cached pages should carry a strong ETag and public Cache-Control."""
+        response = client.get('/webinar')
+        assert response.headers['ETag'].startswith('"')
+        assert not response.headers['ETag'].startswith('W/')
+        cache_control = response.cache_control
+        assert cache_control.public
+        assert cache_control.s_maxage == 300
+        # Browsers revalidate, so they never reuse the anonymous page after login
+        assert cache_control.max_age == 0
+        assert 'Cookie' in response.headers['Vary']
+
+    def test_conditional_get_returns_304(self, client):
+        """A matching If-None-Match should get 304 with no body."""
+        etag = client.get('/thank-you').headers['ETag']
+        response = client.get('/thank-you', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+
+    def test_stale_etag_returns_200(self, client):
+        """A non-matching ETag should get the full page."""
+        response = client.get('/', headers={'If-None-Match': '"stale"'})
+        assert response.status_code == 200
+        assert b'Join Our Upcoming Webinar' in response.data
+
+    def test_gzip_variant(self, client):
+        """Clients accepting gzip should get the precompressed body."""
+        import gzip
+        plain = client.get('/')
+        response = client.get('/', headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(response.data) == plain.data
+        assert response.headers['ETag'] != plain.headers['ETag']
+        assert 'Accept-Encoding' in response.headers['Vary']
+
+    def test_gzip_etag_revalidates(self, client):
+        """The gzip ETag should also produce a 304."""
+        etag = client.get('/', headers={'Accept-Encoding': 'gzip'}).headers['ETag']
+        response = client.get('/', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+        assert response.status_code == 304
+
+    def test_authenticated_pages_not_cached(self, app, authenticated_client):
+        """Logged-in users should see their own navbar, uncached."""
+        response = authenticated_client.get('/')
+        assert b'Logout' in response.data
+        assert 'ETag' not in response.headers
+        assert response.cache_control.private
+        assert response.cache_control.no_cache
+        assert 'Cookie' in response.headers['Vary']
+        assert app.extensions['page_cache'].stats()['size'] == 0
+
+    def test_flash_messages_bypass_cache(self, app, client):
+        """A pending flash message should be rendered, not a cached page."""
+        client.get('/thank-you')
+        response = client.post('/register', data={
+            'name': 'Flash User', 'email': 'flash@test.com',
+            'company': 'Corp', 'job_title': 'Dev'
+        }, follow_redirects=True)
+        assert b'Registration successful' in response.data
+
+    def test_template_change_invalidates(self, app, client, monkeypatch):
+        """A new template mtime should trigger a fresh render."""
+        import app.page_cache as page_cache
+        client.get('/')
+        monkeypatch.setattr(page_cache, '_template_version', lambda templates: ('changed',))
+        client.get('/')
+        assert app.extensions['page_cache'].stats()['misses'] == 2
+
+    def test_cache_can_be_disabled(self, app, client):
+        """PAGE_CACHE_ENABLED=False should render every time."""
+        app.extensions['page_cache'].enabled = False
+        response = client.get('/')
+        assert 'ETag' not in response.headers
+        assert app.extensions['page_cache'].stats()['size'] == 0
+
+
+class TestPoolStats:
+    """Tests for connection pool configuration and statistics."""
+
+    def _queue_pool_engine(self, tmp_path, **options):
+        from sqlalchemy import create_engine
+        from sqlalchemy.pool import QueuePool
+        return create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=QueuePool, **options)
+
+    def test_base_config_sets_pool_options(self):
+        """Deployed configs should size and pre-ping the pool."""
+        from config import ProductionConfig
+        options = ProductionConfig.SQLALCHEMY_ENGINE_OPTIONS
+        assert options['pool_pre_ping'] is True
+        assert {'pool_size', 'max_overflow', 'pool_timeout', 'pool_recycle'} <= set(options)
+
+    def test_pool_stats_requires_login(self, client):
+        """Pool statistics should be admin-only."""
+        response = client.get('/admin/pool-stats')
+        assert response.status_code == 302
+
+    def test_pool_stats_endpoint(self, authenticated_client):
+        """The endpoint should report checkout counters as JSON."""
+        response = authenticated_client.get('/admin/pool-stats')
+        assert response.status_code == 200
+        assert response.json['checkouts'] >= 1
+        assert 'checkout_wait_ms_avg' in response.json
+
+    def test_monitor_counts_checkouts_and_gauges(self, tmp_path):
+        """Checked-out connections should show in gauges and counters."""
+        from app.pool_stats import PoolMonitor
+        engine = self._queue_pool_engine(tmp_path, pool_size=2)
+        monitor = PoolMonitor(engine)
+        conn = engine.connect()
+        stats = monitor.stats()
+        assert stats['pool_class'] == 'QueuePool'
+        assert stats['checkedout'] == 1
+        assert stats['checkouts'] == 1
+        assert stats['connects'] == 1
+        conn.close()
+        assert monitor.stats()['checkins'] == 1
+        engine.dispose()
+
+    def test_monitor_counts_invalidations(self, tmp_path):
+        """Invalidated connections should be counted."""
+        from app.pool_stats import PoolMonitor
+        engine = self._queue_pool_engine(tmp_path)
+        monitor = PoolMonitor(engine)
+        with engine.connect() as conn:
+            conn.invalidate()
+        assert monitor.stats()['invalidations'] == 1
+        engine.dispose()
+
+    def test_monitor_counts_timeouts_and_waits(self, tmp_path):
+        """An exhausted pool should record the wait and the timeout."""
+        from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+        from app.pool_stats import PoolMonitor
+        engine = self._queue_pool_engine(tmp_path, pool_size=1, max_overflow=0, pool_timeout=0.05)
+        monitor = PoolMonitor(engine)
+        held = engine.connect()
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+        stats = monitor.stats()
+        assert stats['timeouts'] == 1
+        assert stats['checkout_wait_ms_max'] >= 40
+        held.close()
+        engine.dispose()
+
+    def test_monitor_survives_dispose(self, tmp_path):
+        """Wait timing should continue on the pool created by dispose()."""
+        from app.pool_stats import PoolMonitor
+        engine = self._queue_pool_engine(tmp_path)
+        monitor = PoolMonitor(engine)
+        engine.connect().close()
+        engine.dispose()
+        engine.connect().close()
+        assert monitor.stats()['checkouts'] == 2
+        assert monitor.stats()['checkout_wait_ms_total'] > 0
+        engine.dispose()
+
+
 class TestErrorPages:
     """Tests for custom error pages."""
 
@@ -931,6 +2347,100 @@ class TestAuthService:
             assert found.username == 'namelookup'
 
 
+class TestPasswordVerification:
+    """Tests for configurable hashing and pooled password verification."""
+
+    def test_create_user_uses_configured_method(self, app):
+        """New hashes should use PASSWORD_HASH_METHOD."""
+        with app.app_context():
+            from app.services.auth_service import AuthService
+            user = AuthService.create_user('method', 'password123')
+            assert user.password_hash.startswith('pbkdf2:sha256:1000$')
+
+    def test_login_rehashes_when_method_changes(self, app):
+        """A successful login should upgrade hashes made with old parameters."""
+        with app.app_context():
+            from app.services.auth_service import AuthService
+            user = AuthService.create_user('rehash', 'password123')
+            old_hash = user.password_hash
+
+            verifier = app.extensions['password_verifier']
+            verifier.method = 'pbkdf2:sha256:2000'
+            verifier._method_prefix = None
+
+            assert AuthService.authenticate('rehash', 'password123') is not None
+            assert user.password_hash != old_hash
+            assert user.password_hash.startswith('pbkdf2:sha256:2000$')
+            assert AuthService.authenticate('rehash', 'password123') is not None
+
+    def test_login_keeps_hash_when_method_unchanged(self, app):
+        """Hashes already using the configured method should not be rewritten."""
+        with app.app_context():
+            from app.services.auth_service import AuthService
+            user = AuthService.create_user('same', 'password123')
+            old_hash = user.password_hash
+            AuthService.authenticate('same', 'password123')
+            assert user.password_hash == old_hash
+
+    def test_failed_login_does_not_rehash(self, app):
+        """A wrong password must never trigger a rehash."""
+        with app.app_context():
+            from app.services.auth_service import AuthService
+            user = AuthService.create_user('norehash', 'password123')
+            old_hash = user.password_hash
+            app.extensions['password_verifier'].method = 'pbkdf2:sha256:2000'
+            assert AuthService.authenticate('norehash', 'wrong') is None
+            assert user.password_hash == old_hash
+
+    def test_needs_rehash_expands_short_method_names(self):
+        """'pbkdf2' should match hashes Werkzeug writes for its expanded form."""
+        from werkzeug.security import generate_password_hash
+        from app.passwords import PasswordVerifier
+        verifier = PasswordVerifier('pbkdf2')
+        assert not verifier.needs_rehash(generate_password_hash('x', method='pbkdf2'))
+        assert verifier.needs_rehash(generate_password_hash('x', method='pbkdf2:sha256:1000'))
+
+    def test_verifier_rejects_when_queue_full(self):
+        """Verifications beyond the queue limit should fail fast."""
+        from app.passwords import PasswordVerifier, PasswordVerifierBusyError
+        verifier = PasswordVerifier('pbkdf2:sha256:1000', workers=1, queue_limit=1)
+        # Occupy the only slot as an in-flight verification would
+        verifier._slots.acquire()
+        try:
+            with pytest.raises(PasswordVerifierBusyError):
+                verifier.verify(verifier.hash('pw'), 'pw')
+        finally:
+            verifier._slots.release()
+        assert verifier.stats()['rejected'] == 1
+        assert verifier.verify(verifier.hash('pw'), 'pw')
+
+    def test_login_returns_503_when_busy(self, app, client):
+        """The login page should report overload instead of hanging."""
+        from app.passwords import PasswordVerifierBusyError
+        with app.app_context():
+            from app.services.auth_service import AuthService
+            AuthService.create_user('busy', 'password123')
+
+        def busy(*args):
+            raise PasswordVerifierBusyError('busy')
+        app.extensions['password_verifier'].verify = busy
+
+        response = client.post('/auth/login', data={
+            'username': 'busy', 'password': 'password123'
+        })
+        assert response.status_code == 503
+        assert b'server is busy' in response.data
+
+    def test_benchmark_passwords_command(self, runner):
+        """benchmark-passwords should report a rate per method."""
+        result = runner.invoke(args=[
+            'benchmark-passwords', '-m', 'pbkdf2:sha256:1000', '-d', '0.1', '-c', '2'
+        ])
+        assert result.exit_code == 0
+        assert 'pbkdf2:sha256:1000' in result.output
+        assert 'logins/s' in result.output
+
+
 class TestFlaskLoginIntegration:
     """Tests for Flask-Login integration."""
 
@@ -960,6 +2470,123 @@ class TestFlaskLoginIntegration:
             assert loaded is None
 
 
+class TestTTLCache:
+    """Tests for the in-process TTL+LRU cache."""
+
+    def test_hit_and_miss_counters(self):
+        """get should count hits and misses."""
+        from app.cache import TTLCache
+        cache = TTLCache(maxsize=2, ttl=60)
+        assert cache.get('a') is None
+        cache.set('a', 1)
+        assert cache.get('a') == 1
+        stats = cache.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+
+    def test_entries_expire_after_ttl(self):
+        """Entries older than the TTL should be treated as misses."""
+        from app.cache import TTLCache
+        now = [100.0]
+        cache = TTLCache(maxsize=2, ttl=10, clock=lambda: now[0])
+        cache.set('a', 1)
+        now[0] += 11
+        assert cache.get('a') is None
+        assert cache.stats()['size'] == 0
+
+    def test_least_recently_used_evicted(self):
+        """The least recently used entry should be evicted when full."""
+        from app.cache import TTLCache
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.stats()['evictions'] == 1
+
+    def test_zero_ttl_disables_cache(self):
+        """A TTL of 0 should store nothing."""
+        from app.cache import TTLCache
+        cache = TTLCache(maxsize=2, ttl=0)
+        cache.set('a', 1)
+        assert cache.get('a') is None
+
+
+class TestCachedUserLoader:
+    """Tests for the cached Flask-Login user loader."""
+
+    def test_second_load_is_cache_hit(self, app):
+        """Loading the same user twice should only query once."""
+        with app.app_context():
+            from app.services.auth_service import AuthService
+            user = AuthService.create_user('cached', 'password123')
+            first = AuthService.load_user(str(user.id))
+            second = AuthService.load_user(str(user.id))
+            assert first is second
+            stats = AuthService.user_cache_stats()
+            assert stats['hits'] == 1
+            assert stats['misses'] == 1
+
+    def test_snapshot_is_not_orm_instance(self, app):
+        """The loader should return a detached snapshot, not a session-bound User."""
+        with app.app_context():
+            from app.services.auth_service import AuthService, UserSnapshot
+            user = AuthService.create_user('snap', 'password123')
+            loaded = AuthService.load_user(str(user.id))
+            assert isinstance(loaded, UserSnapshot)
+            assert loaded.username == 'snap'
+            assert loaded.is_authenticated
+            assert loaded.get_id() == str(user.id)
+
+    def test_is_active_change_invalidates(self, app):
+        """Deactivating a user should evict their cached snapshot."""
+        with app.app_context():
+            from app.services.auth_service import AuthService
+            user = AuthService.create_user('flip', 'password123')
+            assert AuthService.load_user(str(user.id)).is_active
+            user.is_active = False
+            db.session.commit()
+            assert not AuthService.load_user(str(user.id)).is_active
+
+    def test_password_change_invalidates(self, app):
+        """Changing a password should evict the cached snapshot."""
+        with app.app_context():
+            from app.services.auth_service import AuthService
+            user = AuthService.create_user('pw', 'password123')
+            AuthService.load_user(str(user.id))
+            assert AuthService.user_cache_stats()['size'] == 1
+            user.set_password('newpassword456')
+            db.session.commit()
+            assert AuthService.user_cache_stats()['size'] == 0
+
+    def test_rolled_back_change_keeps_cache(self, app):
+        """Changes that are rolled back should not evict anything."""
+        with app.app_context():
+            from app.services.auth_service import AuthService
+            user = AuthService.create_user('rb', 'password123')
+            AuthService.load_user(str(user.id))
+            user.is_active = False
+            db.session.flush()
+            db.session.rollback()
+            assert AuthService.user_cache_stats()['size'] == 1
+
+    def test_invalid_id_returns_none(self, app):
+        """Non-numeric ids should not raise."""
+        with app.app_context():
+            from app.services.auth_service import AuthService
+            assert AuthService.load_user('not-a-number') is None
+
+    def test_cache_stats_endpoint(self, authenticated_client):
+        """The admin cache stats endpoint should report loader counters."""
+        response = authenticated_client.get('/admin/cache-stats')
+        assert response.status_code == 200
+        stats = response.json['user_loader']
+        assert {'hits', 'misses', 'hit_ratio', 'size'} <= set(stats)
+        assert stats['ttl'] == 60
+
+
 class TestLoginForm:
     """Tests for the LoginForm."""
 
@@ -1205,3 +2832,906 @@ class TestCreateAdminCLI:
             user = AuthService.authenticate('dbtest', 'testpassword123')
             assert user is not None
             assert user.username == 'dbtest'
+
+
+class TestImportRegistrationsCLI:
+    """Tests for the flask import-registrations command."""
+
+    def _write_csv(self, tmp_path, lines):
+        path = tmp_path / 'import.csv'
+        path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+        return str(path)
+
+    def test_import_inserts_rows(self, app, runner, tmp_path):
+        """Valid rows should be inserted and reported."""
+        path = self._write_csv(tmp_path, [
+            'name,email,company,job_title',
+            'Ann,ann@test.com,Corp,Dev',
+            'Bob,bob@test.com,Corp,PM',
+        ])
+        result = runner.invoke(args=['import-registrations', path])
+        assert result.exit_code == 0
+        assert 'Imported 2 registrations' in result.output
+        assert 'rows/s' in result.output
+        with app.app_context():
+            from app.services.registration_service import RegistrationService
+            assert RegistrationService.get_registration_count() == 2
+
+    def test_import_normalizes_and_dedups_emails(self, app, runner, tmp_path):
+        """Emails should be normalized and duplicates within the file skipped."""
+        path = self._write_csv(tmp_path, [
+            'name,email,company,job_title',
+            'Ann,  Ann@Test.com ,Corp,Dev',
+            'Ann Again,ann@test.com,Corp,Dev',
+        ])
+        result = runner.invoke(args=['import-registrations', path])
+        assert 'Imported 1 registrations' in result.output
+        assert 'skipped 1 duplicate(s)' in result.output
+        with app.app_context():
+            from app.services.registration_service import RegistrationService
+            assert RegistrationService.email_exists('ann@test.com')
+
+    def test_import_skips_existing_emails(self, app, runner, tmp_path):
+        """Emails already registered should be skipped, not fail the batch."""
+        with app.app_context():
+            from app.services.registration_service import RegistrationService
+            RegistrationService.create_registration(
+                name='Existing', email='existing@test.com', company='C', job_title='Dev'
+            )
+        path = self._write_csv(tmp_path, [
+            'name,email,company,job_title',
+            'Existing,EXISTING@test.com,Corp,Dev',
+            'New,new@test.com,Corp,Dev',
+        ])
+        result = runner.invoke(args=['import-registrations', path])
+        assert result.exit_code == 0
+        assert 'Imported 1 registrations' in result.output
+        assert 'skipped 1 duplicate(s)' in result.output
+
+    def test_import_skips_invalid_rows(self, runner, tmp_path):
+        """Rows with missing fields or bad emails should be counted as invalid."""
+        path = self._write_csv(tmp_path, [
+            'name,email,company,job_title',
+            ',nobody@test.com,Corp,Dev',
+            'Bad,not-an-email,Corp,Dev',
+            'Good,good@test.com,Corp,Dev',
+        ])
+        result = runner.invoke(args=['import-registrations', path])
+        assert 'Imported 1 registrations' in result.output
+        assert '2 invalid row(s)' in result.output
+
+    def test_import_across_batches(self, app, runner, tmp_path):
+        """Duplicates split across batches should still be skipped."""
+        path = self._write_csv(tmp_path, ['name,email,company,job_title'] + [
+            f'User {i},user{i % 4}@test.com,Corp,Dev' for i in range(7)
+        ])
+        result = runner.invoke(args=['import-registrations', path, '--batch-size', '2'])
+        assert 'Imported 4 registrations' in result.output
+        assert 'skipped 3 duplicate(s)' in result.output
+
+    def test_import_updates_stats_rollup(self, app, runner, tmp_path):
+        """Imported rows should be counted in the daily statistics."""
+        path = self._write_csv(tmp_path, [
+            'name,email,company,job_title,created_at',
+            'Ann,ann@test.com,Corp,Dev,2026-02-01T09:00:00',
+            'Bob,bob@test.com,Corp,Dev,2026-02-01T10:00:00',
+            'Cy,cy@test.com,Corp,Dev,2026-02-02T10:00:00',
+        ])
+        runner.invoke(args=['import-registrations', path])
+        with app.app_context():
+            from app.services.registration_service import RegistrationService
+            stats = RegistrationService.get_registration_stats()
+            assert stats['total'] == 3
+            assert {'date': '2026-02-01', 'count': 2} in stats['by_date']
+
+    def test_import_accepts_export_format(self, app, authenticated_client, runner, tmp_path):
+        """A file from /admin/export/csv should import cleanly."""
+        with app.app_context():
+            from app.services.registration_service import RegistrationService
+            RegistrationService.create_registration(
+                name='Round Trip', email='trip@test.com', company='C', job_title='Dev'
+            )
+        exported = authenticated_client.get('/admin/export/csv').data.decode('utf-8')
+        exported = exported.replace('trip@test.com', 'trip2@test.com')
+        path = tmp_path / 'export.csv'
+        path.write_text(exported, encoding='utf-8')
+        result = runner.invoke(args=['import-registrations', str(path)])
+        assert 'Imported 1 registrations' in result.output
+
+    def test_import_missing_columns(self, runner, tmp_path):
+        """A file without required columns should fail with an error."""
+        path = self._write_csv(tmp_path, ['name,email', 'Ann,ann@test.com'])
+        result = runner.invoke(args=['import-registrations', path])
+        assert result.exit_code == 1
+        assert 'company' in result.output
+
+
+class TestSeedCLI:
+    """Tests for the flask seed command and app.seed."""
+
+    def _rows(self):
+        from app.models.registration import Registration
+        return [(r.name, r.email, r.company, r.job_title, r.created_at)
+                for r in Registration.query.order_by(Registration.id)]
+
+    def test_seed_inserts_rows(self, app, runner):
+        """Requested rows are inserted and throughput is reported."""
+        result = runner.invoke(args=['seed', '-r', '50', '-e', '30', '-u', '2'])
+        assert result.exit_code == 0
+        assert 'registrations' in result.output
+        assert 'rows/s' in result.output
+
+        from app.models.registration import Registration
+        from app.models.user import User
+        assert Registration.query.count() == 50
+        assert db.session.query(Entry).count() == 30
+        assert User.query.count() == 2
+
+    def test_seed_requires_counts(self, runner):
+        """Seeding nothing is an error."""
+        result = runner.invoke(args=['seed'])
+        assert result.exit_code == 1
+        assert 'Nothing to seed' in result.output
+
+    def test_same_seed_same_rows(self, app):
+        """The same seed and end date produce identical rows."""
+        from datetime import datetime
+        from app.seed import seed_database
+        end = datetime(2025, 6, 1)
+
+        seed_database(registrations=40, seed=7, end=end)
+        first = self._rows()
+        db.drop_all()
+        db.create_all()
+        seed_database(registrations=40, seed=7, end=end)
+        assert self._rows() == first
+
+        db.drop_all()
+        db.create_all()
+        seed_database(registrations=40, seed=8, end=end)
+        assert self._rows() != first
+
+    def test_timestamps_spread_over_days(self, app):
+        """created_at values increase and cover the requested window."""
+        from datetime import datetime, timedelta
+        from app.seed import seed_database
+        end = datetime(2025, 6, 1)
+
+        seed_database(registrations=100, days=10, end=end)
+        created = [row[4] for row in self._rows()]
+        assert created == sorted(created)
+        assert end - timedelta(days=10) <= created[0] < end - timedelta(days=9)
+        assert end - timedelta(days=1) <= created[-1] < end
+
+    def test_seeding_twice_keeps_emails_unique(self, app):
+        """A second run continues the numbering instead of colliding."""
+        from app.seed import seed_database
+        seed_database(registrations=30, users=2, seed=1)
+        seed_database(registrations=30, users=2, seed=1)
+
+        emails = [row[1] for row in self._rows()]
+        assert len(emails) == len(set(emails)) == 60
+
+    def test_seed_rebuilds_rollup(self, app):
+        """The daily statistics match the seeded registrations."""
+        from app.models.registration_stat import RegistrationDailyStat
+        from app.seed import seed_database
+        seed_database(registrations=200, days=5)
+        total = db.session.query(db.func.sum(RegistrationDailyStat.count)).scalar()
+        assert total == 200
+
+    def test_large_seed_rebuilds_indexes(self, app, monkeypatch):
+        """Indexes dropped for a large load exist again afterwards."""
+        from sqlalchemy import inspect
+        from sqlalchemy.exc import IntegrityError
+        from app import seed
+        monkeypatch.setattr(seed, 'INDEX_REBUILD_THRESHOLD', 10)
+
+        synchronous = db.session.execute(db.text('PRAGMA synchronous')).scalar()
+        timings = seed.seed_database(registrations=20)
+        assert set(timings) == {'registrations', seed.REGISTRATION_INDEXES}
+        names = {index['name'] for index in inspect(db.engine).get_indexes('registrations')}
+        assert {'ix_registrations_name_id', 'ix_registrations_company_id',
+                'ix_registrations_job_title_id', 'ix_registrations_created_at_id',
+                'ix_registrations_email'} <= names
+        assert db.session.execute(db.text('PRAGMA synchronous')).scalar() == synchronous
+
+        # The unique email index dropped for the fresh load is enforced again
+        email = db.session.execute(db.text('SELECT email FROM registrations LIMIT 1')).scalar()
+        with pytest.raises(IntegrityError):
+            db.session.execute(db.text(
+                "INSERT INTO registrations (name, email, company, job_title, created_at) "
+                "VALUES ('Dup', :email, 'C', 'T', '2025-01-01 00:00:00')"
+            ), {'email': email})
+        db.session.rollback()
+
+    def test_seeded_rows_are_searchable(self, app):
+        """Fresh and top-up seeds are both indexed, and the trigger is restored."""
+        from app.seed import seed_database
+        from app.services.registration_service import RegistrationService
+        seed_database(registrations=30, seed=3)
+        seed_database(registrations=30, seed=4)
+
+        email = db.session.execute(db.text(
+            'SELECT email FROM registrations ORDER BY id DESC LIMIT 1'
+        )).scalar()
+        assert [r.email for r in RegistrationService.search_registrations(email)] == [email]
+        RegistrationService.create_registration('Zed Unique', 'zed@example.com', 'Corp', 'Dev')
+        assert RegistrationService.search_registrations('zed')
+
+    def test_seeded_users_can_log_in(self, app, client):
+        """Seeded users share the given password."""
+        from app.seed import seed_database
+        seed_database(users=1, user_password='seeded-password')
+        response = client.post('/auth/login', data={
+            'username': 'loadtest0', 'password': 'seeded-password'
+        })
+        assert response.status_code == 302
+
+
+class TestLoadTestCLI:
+    """Tests for the flask loadtest command and app.loadtest."""
+
+    def test_parse_mix(self):
+        """Mix entries are parsed into (weight, method, path)."""
+        from app.loadtest import parse_mix
+        assert parse_mix(['70:GET /', '30:post /register']) == [
+            (70.0, 'GET', '/'), (30.0, 'POST', '/register')
+        ]
+
+    def test_parse_mix_rejects_unknown_form(self):
+        """POSTs are limited to forms the load test can fill in."""
+        from app.loadtest import parse_mix
+        with pytest.raises(ValueError, match='No form data'):
+            parse_mix(['10:POST /auth/login'])
+        with pytest.raises(ValueError, match='Invalid mix entry'):
+            parse_mix(['GET /'])
+
+    def test_in_process_run_reports_endpoints(self, runner):
+        """The report lists each endpoint and a total."""
+        result = runner.invoke(args=['loadtest', '-c', '1', '-n', '30', '--seed', '1'])
+        assert result.exit_code == 0
+        assert 'GET /' in result.output
+        assert 'p95 ms' in result.output
+        assert 'total' in result.output
+
+    def test_json_report(self, runner):
+        """--json prints per-endpoint numbers that add up to the total."""
+        import json
+        result = runner.invoke(args=['loadtest', '-c', '1', '-n', '20', '--json',
+                                     '-m', '1:GET /api/health'])
+        report = json.loads(result.output[result.output.index('{'):])
+        assert report['GET /api/health']['requests'] == 20
+        assert report['total']['requests'] == 20
+        assert report['total']['errors'] == 0
+        assert report['total']['statuses'] == {'200': 20}
+
+    def test_register_posts_send_csrf_token(self, app):
+        """POST /register succeeds with CSRF enabled, using unique emails."""
+        from app.loadtest import LoadTest, WsgiClient
+        from app.models.registration import Registration
+        app.config['WTF_CSRF_ENABLED'] = True
+
+        load = LoadTest(lambda: WsgiClient(app), [(1, 'POST', '/register')],
+                        concurrency=1, max_requests=5)
+        report = load.run()
+
+        assert report['POST /register']['errors'] == 0
+        assert report['POST /register']['statuses'] == {'302': 5}
+        assert Registration.query.count() == 5
+
+    def test_rejected_form_counts_as_error(self, app):
+        """A form re-rendered with 200 is an error, not a success."""
+        from app.loadtest import LoadTest, WsgiClient
+        app.config['WTF_CSRF_ENABLED'] = True
+
+        class NoTokenClient(WsgiClient):
+            def request(self, method, path, data=None):
+                if data:
+                    data.pop('csrf_token', None)
+                return super().request(method, path, data)
+
+        load = LoadTest(lambda: NoTokenClient(app), [(1, 'POST', '/register')],
+                        concurrency=1, max_requests=2)
+        assert load.run()['total']['errors'] == 2
+
+
+class TestGunicornConfig:
+    """Tests for the cgroup-aware gunicorn.conf.py."""
+
+    def _load(self, monkeypatch, **env):
+        import runpy
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'gunicorn.conf.py')
+        return runpy.run_path(path)
+
+    def test_cpu_quota_cgroup_v2(self, monkeypatch, tmp_path):
+        """cpu.max quota/period limits the CPU count."""
+        conf = self._load(monkeypatch)
+        (tmp_path / 'cpu.max').write_text('50000 100000\n')
+        assert conf['cpu_limit'](str(tmp_path)) == 0.5
+
+    def test_cpu_unlimited_cgroup_v2(self, monkeypatch, tmp_path):
+        """'max' quota falls back to the visible CPUs."""
+        conf = self._load(monkeypatch)
+        (tmp_path / 'cpu.max').write_text('max 100000\n')
+        assert conf['cpu_limit'](str(tmp_path)) == len(os.sched_getaffinity(0))
+
+    def test_cpu_quota_cgroup_v1(self, monkeypatch, tmp_path):
+        """cfs_quota_us/cfs_period_us are used on cgroup v1."""
+        conf = self._load(monkeypatch)
+        (tmp_path / 'cpu').mkdir()
+        (tmp_path / 'cpu' / 'cpu.cfs_quota_us').write_text('100000\n')
+        (tmp_path / 'cpu' / 'cpu.cfs_period_us').write_text('100000\n')
+        assert conf['cpu_limit'](str(tmp_path)) == 1.0
+
+    def test_memory_limit(self, monkeypatch, tmp_path):
+        """memory.max is read; 'max' and the v1 sentinel mean unlimited."""
+        conf = self._load(monkeypatch)
+        (tmp_path / 'memory.max').write_text('1073741824\n')
+        assert conf['memory_limit'](str(tmp_path)) == 1073741824
+        (tmp_path / 'memory.max').write_text('max\n')
+        assert conf['memory_limit'](str(tmp_path)) is None
+
+        v1 = tmp_path / 'v1'
+        (v1 / 'memory').mkdir(parents=True)
+        (v1 / 'memory' / 'memory.limit_in_bytes').write_text('9223372036854771712\n')
+        assert conf['memory_limit'](str(v1)) is None
+
+    def test_nested_cgroup_v2(self, monkeypatch, tmp_path):
+        """Limits on the process's own cgroup and its parents (systemd) are honoured."""
+        conf = self._load(monkeypatch)
+        proc_cgroup = tmp_path / 'proc-cgroup'
+        proc_cgroup.write_text('0::/system.slice/registrations.service\n')
+        root = tmp_path / 'cgroup'
+        service = root / 'system.slice' / 'registrations.service'
+        service.mkdir(parents=True)
+        (root / 'cgroup.controllers').write_text('cpu memory\n')  # No cpu.max at the root
+        (root / 'system.slice' / 'cpu.max').write_text('max 100000\n')
+        (root / 'system.slice' / 'memory.max').write_text('536870912\n')
+        (service / 'cpu.max').write_text('50000 100000\n')  # CPUQuota=50%
+        (service / 'memory.max').write_text('max\n')
+
+        assert conf['cpu_limit'](str(root), str(proc_cgroup)) == 0.5
+        assert conf['memory_limit'](str(root), str(proc_cgroup)) == 536870912
+
+    def test_nested_cgroup_v1(self, monkeypatch, tmp_path):
+        """On cgroup v1 each controller's line in /proc/self/cgroup is followed."""
+        conf = self._load(monkeypatch)
+        proc_cgroup = tmp_path / 'proc-cgroup'
+        proc_cgroup.write_text('4:memory:/system.slice/app.service\n'
+                               '2:cpu,cpuacct:/system.slice/app.service\n0::/\n')
+        cpu = tmp_path / 'cpu' / 'system.slice' / 'app.service'
+        memory = tmp_path / 'memory' / 'system.slice' / 'app.service'
+        cpu.mkdir(parents=True)
+        memory.mkdir(parents=True)
+        (cpu / 'cpu.cfs_quota_us').write_text('50000\n')
+        (cpu / 'cpu.cfs_period_us').write_text('100000\n')
+        (memory / 'memory.limit_in_bytes').write_text('268435456\n')
+
+        assert conf['cpu_limit'](str(tmp_path), str(proc_cgroup)) == 0.5
+        assert conf['memory_limit'](str(tmp_path), str(proc_cgroup)) == 268435456
+
+    def test_worker_counts(self, monkeypatch):
+        """Workers follow 2 x CPUs + 1, capped by memory with threads making up the rest."""
+        worker_counts = self._load(monkeypatch)['worker_counts']
+        mb = 1024 * 1024
+        assert worker_counts(0.5, None) == (2, 1)
+        assert worker_counts(2, None) == (5, 1)
+        assert worker_counts(4, 1024 * mb, worker_memory_mb=256) == (4, 3)
+        assert worker_counts(2, 64 * mb) == (1, 5)
+
+    def test_environment_overrides(self, monkeypatch):
+        """Explicit settings win over the computed ones."""
+        conf = self._load(monkeypatch, GUNICORN_WORKERS='7', GUNICORN_THREADS='3',
+                          GUNICORN_PRELOAD='true', GUNICORN_MAX_REQUESTS='0')
+        assert (conf['workers'], conf['threads']) == (7, 3)
+        assert conf['preload_app'] is True
+        assert conf['max_requests'] == 0
+        assert conf['max_requests_jitter'] == 100
+
+    def test_live_stats_use_threaded_workers(self, monkeypatch):
+        """With live stats on, workers run gthread with room for every stream."""
+        monkeypatch.delenv('GUNICORN_THREADS', raising=False)
+        conf = self._load(monkeypatch, LIVE_STATS_ENABLED='true', LIVE_STATS_MAX_LISTENERS='8')
+        assert conf['threads'] >= 8 + conf['LIVE_STATS_SPARE_THREADS']
+        assert conf['worker_class'] == 'gthread'
+        assert 'LIVE_STATS_MAX_LISTENERS=8' in conf['raw_env']
+
+        # Fixed threads are kept; streams are capped to leave spare threads
+        conf = self._load(monkeypatch, GUNICORN_THREADS='4')
+        assert conf['threads'] == 4
+        assert 'LIVE_STATS_MAX_LISTENERS=2' in conf['raw_env']
+        conf = self._load(monkeypatch, GUNICORN_THREADS='1')
+        assert conf['worker_class'] == 'sync'
+        assert 'LIVE_STATS_MAX_LISTENERS=0' in conf['raw_env']
+
+    def test_live_stats_off_by_default(self, monkeypatch):
+        """By default the thread count comes from worker_counts alone."""
+        monkeypatch.delenv('GUNICORN_THREADS', raising=False)
+        monkeypatch.delenv('LIVE_STATS_ENABLED', raising=False)
+        conf = self._load(monkeypatch)
+        assert conf['live_stats'] is False
+        assert conf['threads'] == conf['_threads']
+        assert not any(env.startswith('LIVE_STATS') for env in conf['raw_env'])
+
+        from config import Config
+        assert Config.LIVE_STATS_ENABLED is False
+
+    def test_metrics_dir_defaults_per_boot(self, monkeypatch, tmp_path):
+        """Workers share a metrics directory that each boot starts empty."""
+        monkeypatch.delenv('METRICS_DIR', raising=False)
+        conf = self._load(monkeypatch)
+        assert conf['raw_env'][0] == f"METRICS_DIR={conf['metrics_dir']}"
+        assert conf['metrics_dir'].startswith(tempfile.gettempdir())
+
+        conf = self._load(monkeypatch, METRICS_DIR=str(tmp_path))
+        assert conf['raw_env'][0] == f'METRICS_DIR={tmp_path}'
+        (tmp_path / '123.json').write_text('{}')
+        (tmp_path / '123.json.tmp').write_text('{')
+        (tmp_path / 'keep.txt').write_text('')
+        conf['on_starting'](server=None)
+        assert [path.name for path in tmp_path.iterdir()] == ['keep.txt']
+
+    def test_post_fork_disposes_engine_when_preloaded(self, app, monkeypatch):
+        """Each worker starts with a fresh connection pool after a preloaded fork."""
+        from types import SimpleNamespace
+        conf = self._load(monkeypatch, GUNICORN_PRELOAD='true')
+        server = SimpleNamespace(app=SimpleNamespace(wsgi=lambda: app))
+
+        pool = db.engine.pool
+        conf['post_fork'](server, worker=None)
+        assert db.engine.pool is not pool
+
+    def test_post_fork_without_preload_is_noop(self, app, monkeypatch):
+        """Without preload the workers build their own engines anyway."""
+        conf = self._load(monkeypatch, GUNICORN_PRELOAD='false')
+        pool = db.engine.pool
+        conf['post_fork'](None, worker=None)
+        assert db.engine.pool is pool
+
+
+class TestWriteBuffer:
+    """Tests for the group-commit entry write buffer."""
+
+    def _buffer(self, app, **kwargs):
+        from app.write_buffer import GroupCommitBuffer
+        kwargs.setdefault('flush_interval', 60)
+        return GroupCommitBuffer(app, Entry.__table__, **kwargs)
+
+    def _row(self, value):
+        from datetime import datetime, timezone
+        return {'value': value, 'created_at': datetime.now(timezone.utc)}
+
+    def test_disabled_by_default(self, app, authenticated_client):
+        """Without ENTRY_WRITE_BUFFER entries are committed one by one."""
+        assert 'entry_buffer' not in app.extensions
+        authenticated_client.post('/demo/', data={'value': 'direct'})
+        assert db.session.query(Entry).count() == 1
+        assert authenticated_client.get('/admin/write-buffer-stats').json == {'enabled': False}
+
+    def test_full_batch_flushes_in_one_transaction(self, app):
+        """Concurrent 'flush' submitters share one commit of max_rows rows."""
+        import threading
+        buffer = self._buffer(app, max_rows=10)
+        threads = [threading.Thread(target=buffer.submit, args=(self._row(f'v{i}'),))
+                   for i in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert db.session.query(Entry).count() == 10
+        stats = buffer.stats()
+        assert stats['flushes'] == 1
+        assert stats['batch_max'] == 10
+        assert stats['rows_written'] == 10
+        buffer.close()
+
+    def test_interval_flushes_partial_batch(self, app):
+        """A lone row is written once flush_interval has passed."""
+        buffer = self._buffer(app, flush_interval=0.01, max_rows=100)
+        buffer.submit(self._row('lonely'))
+        assert db.session.query(Entry).count() == 1
+        assert buffer.stats()['batch_avg'] == 1
+        buffer.close()
+
+    def test_enqueue_returns_before_commit(self, app):
+        """'enqueue' acknowledges immediately; close() writes what is pending."""
+        flushed = []
+        buffer = self._buffer(app, durability='enqueue', max_rows=100, on_flush=flushed.append)
+        for i in range(5):
+            buffer.submit(self._row(f'v{i}'))
+        assert buffer.stats()['pending'] == 5
+
+        buffer.close()
+        assert db.session.query(Entry).count() == 5
+        assert flushed == [5]
+        with pytest.raises(RuntimeError):
+            buffer.submit(self._row('late'))
+
+    def test_queue_limit(self, app):
+        """Rows beyond queue_limit are refused instead of piling up."""
+        from app.write_buffer import WriteBufferFullError
+        buffer = self._buffer(app, durability='enqueue', max_rows=100, queue_limit=2)
+        buffer.submit(self._row('a'))
+        buffer.submit(self._row('b'))
+        with pytest.raises(WriteBufferFullError):
+            buffer.submit(self._row('c'))
+        buffer.close()
+
+    def test_failed_flush_raises_for_waiters(self, app):
+        """In 'flush' mode the INSERT error reaches the submitter."""
+        from sqlalchemy.exc import IntegrityError
+        buffer = self._buffer(app, flush_interval=0.01)
+        with pytest.raises(IntegrityError):
+            buffer.submit({'value': None, 'created_at': None})
+        stats = buffer.stats()
+        assert stats['rows_failed'] == 1
+        assert 'IntegrityError' in stats['last_error']
+        buffer.close()
+
+    def test_rejects_unknown_durability(self, app):
+        """Only 'flush' and 'enqueue' are accepted."""
+        with pytest.raises(ValueError):
+            self._buffer(app, durability='eventually')
+
+    def test_enabled_for_demo_posts(self, monkeypatch):
+        """With ENTRY_WRITE_BUFFER the demo form goes through the buffer."""
+        from app import create_app
+        from config import TestingConfig
+        monkeypatch.setattr(TestingConfig, 'ENTRY_WRITE_BUFFER', True)
+        monkeypatch.setattr(TestingConfig, 'ENTRY_BUFFER_FLUSH_MS', 1)
+
+        app = create_app('testing')
+        with app.app_context():
+            db.create_all()
+            client = app.test_client()
+            client.post('/demo/', data={'value': 'buffered'})
+
+            assert db.session.query(Entry).one().value == 'buffered'
+            assert app.extensions['entry_count'].count() == 1
+            stats = app.extensions['entry_buffer'].stats()
+            assert stats['flushes'] == 1
+            text = client.get('/metrics').get_data(as_text=True)
+            assert 'write_buffer_flush_rows_count{buffer="entries"} 1' in text
+            app.extensions['entry_buffer'].close()
+            db.session.remove()
+            db.drop_all()
+
+
+    def test_demo_post_timeout(self, app, client):
+        """An unconfirmed commit gets 503 with a warning, and the row can still land."""
+        buffer = self._buffer(app, timeout=0.05)  # Flushes after 60s, so never in time
+        app.extensions['entry_buffer'] = buffer
+        response = client.post('/demo/', data={'value': 'slow'})
+        assert response.status_code == 503
+        assert b'may still be saved' in response.data
+
+        buffer.close()
+        assert db.session.query(Entry).one().value == 'slow'
+
+
+class TestStartupTasks:
+    """Tests for the one-time startup tasks and flask startup command."""
+
+    def test_first_run_records_version_and_timings(self, app):
+        """The first run executes every step and stores the marker."""
+        import json
+        from app.models import StartupMarker
+        from app.startup import MARKER_NAME, run_startup_tasks, schema_version
+
+        timings = run_startup_tasks(app)
+        assert list(timings) == ['create_tables', 'search_index']
+
+        marker = db.session.get(StartupMarker, MARKER_NAME)
+        assert marker.version == schema_version(app)
+        assert json.loads(marker.steps) == timings
+
+    def test_matching_version_skips_tasks(self, app):
+        """Later runs with the same schema version do nothing."""
+        from app.startup import run_startup_tasks
+        run_startup_tasks(app)
+        assert run_startup_tasks(app) is None
+        assert run_startup_tasks(app, force=True) is not None
+
+    def test_schema_version_is_stable(self, app):
+        """The fingerprint is deterministic for the same models and config."""
+        from app.startup import schema_version
+        assert schema_version(app) == schema_version(app)
+        assert len(schema_version(app)) == 16
+
+    def test_admin_password_triggers_new_run(self, app):
+        """Setting ADMIN_PASSWORD changes the version and creates the admin."""
+        from app.models import User
+        from app.startup import run_startup_tasks, schema_version
+
+        run_startup_tasks(app)
+        before = schema_version(app)
+        app.config['ADMIN_PASSWORD'] = 'bootstrap-pass'
+
+        assert schema_version(app) != before
+        timings = run_startup_tasks(app)
+        assert 'bootstrap_admin' in timings
+        assert User.query.filter_by(username='admin').count() == 1
+
+        # Re-running with force does not create a second admin
+        run_startup_tasks(app, force=True)
+        assert User.query.filter_by(username='admin').count() == 1
+
+    def test_failed_task_is_not_recorded(self, app, monkeypatch):
+        """A failing admin bootstrap propagates and is retried on the next run."""
+        from app.models import User
+        from app.services.auth_service import AuthService
+        from app.startup import applied_version, run_startup_tasks
+
+        app.config['ADMIN_PASSWORD'] = 'bootstrap-pass'
+        create_user = AuthService.create_user
+
+        def failing_create_user(*args, **kwargs):
+            raise RuntimeError('database unavailable')
+
+        monkeypatch.setattr(AuthService, 'create_user', failing_create_user)
+        with pytest.raises(RuntimeError):
+            run_startup_tasks(app)
+        assert applied_version() is None
+
+        monkeypatch.setattr(AuthService, 'create_user', create_user)
+        assert 'bootstrap_admin' in run_startup_tasks(app)
+        assert User.query.filter_by(username='admin').count() == 1
+
+    def test_lock_timeout_fails_startup(self, app, monkeypatch):
+        """Without the lock a worker fails unless the tasks were applied meanwhile."""
+        from contextlib import contextmanager
+        from app import startup
+
+        @contextmanager
+        def unavailable_lock(timeout):
+            yield False
+
+        monkeypatch.setattr(startup, '_startup_lock', unavailable_lock)
+        with pytest.raises(startup.StartupError):
+            startup.run_startup_tasks(app)
+
+        monkeypatch.undo()
+        startup.run_startup_tasks(app)
+        monkeypatch.setattr(startup, '_startup_lock', unavailable_lock)
+        assert startup.run_startup_tasks(app, force=True) is None
+
+    def test_missing_marker_table_counts_as_not_applied(self, app):
+        """Before the first run there is no marker table to read."""
+        from app.models import StartupMarker
+        from app.startup import applied_version
+        StartupMarker.__table__.drop(db.engine)
+        assert applied_version() is None
+
+    def test_startup_command(self, runner):
+        """flask startup reports step timings, then skips."""
+        result = runner.invoke(args=['startup'])
+        assert result.exit_code == 0
+        assert 'create_tables' in result.output
+        assert 'Startup tasks completed' in result.output
+
+        result = runner.invoke(args=['startup'])
+        assert 'already applied' in result.output
+
+
+class TestMetrics:
+    """Tests for request/SQL metrics and the /metrics endpoint."""
+
+    def test_metrics_endpoint_format(self, client):
+        """/metrics serves Prometheus text with HELP and TYPE lines."""
+        client.get('/')
+        response = client.get('/metrics')
+        assert response.status_code == 200
+        assert response.content_type.startswith('text/plain; version=0.0.4')
+        text = response.get_data(as_text=True)
+        assert '# TYPE http_requests_total counter' in text
+        assert '# TYPE http_request_duration_seconds histogram' in text
+        assert 'http_requests_total{endpoint="main.index",method="GET",status="200"} 1' in text
+
+    def test_latency_histogram_is_cumulative(self, client):
+        """Histogram buckets are cumulative and end with +Inf == count."""
+        for _ in range(3):
+            client.get('/api/health')
+        text = client.get('/metrics').get_data(as_text=True)
+        labels = 'endpoint="api.health",method="GET"'
+        assert f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 3' in text
+        assert f'http_request_duration_seconds_count{{{labels}}} 3' in text
+
+    def test_status_codes_counted(self, client):
+        """Unmatched URLs are counted under a single label."""
+        client.get('/no-such-page')
+        text = client.get('/metrics').get_data(as_text=True)
+        assert 'http_requests_total{endpoint="unmatched",method="GET",status="404"} 1' in text
+
+    def test_sql_queries_counted_per_request(self, app, client):
+        """Requests that hit the database record their statement count."""
+        client.get('/api/entries')
+        series = app.extensions['metrics'].registry.histograms[
+            ('http_request_sql_queries', (('endpoint', 'api.get_entries'),))
+        ]
+        assert series['count'] == 1
+        assert series['sum'] >= 1
+
+    def test_in_flight_returns_to_zero(self, app, client):
+        """The in-flight gauge is decremented when requests finish."""
+        client.get('/')
+        gauges = app.extensions['metrics'].registry.gauges
+        assert gauges[('http_requests_in_flight', (('endpoint', 'main.index'),))] == 0
+
+    def test_aggregates_worker_snapshots(self, tmp_path):
+        """Snapshots from other workers are summed; dead workers' gauges are dropped."""
+        import json
+        from flask import Flask
+        from sqlalchemy import create_engine
+        from app.metrics import RequestMetrics, render_text
+
+        metrics = RequestMetrics(Flask('worker'), create_engine('sqlite://'),
+                                 directory=str(tmp_path))
+        metrics.registry.inc('http_requests_total', (('endpoint', 'x'),), 2)
+
+        other = {
+            'counters': [['http_requests_total', [['endpoint', 'x']], 3]],
+            'gauges': [['http_requests_in_flight', [['endpoint', 'x']], 1]],
+            'histograms': [],
+        }
+        (tmp_path / f'{os.getppid()}.json').write_text(json.dumps(other))
+        (tmp_path / '999999999.json').write_text(json.dumps(other))
+
+        text = render_text(metrics.collect())
+        assert 'http_requests_total{endpoint="x"} 8' in text
+        assert 'http_requests_in_flight{endpoint="x"} 1' in text
+        assert (tmp_path / f'{os.getpid()}.json').exists()
+
+    def test_remote_scrape_requires_token(self, app, client):
+        """Only local callers, or callers with METRICS_TOKEN, may read /metrics."""
+        remote = {'REMOTE_ADDR': '203.0.113.7'}
+        assert client.get('/metrics', environ_base=remote).status_code == 403
+
+        app.extensions['metrics'].token = 's3cret'
+        assert client.get('/metrics').status_code == 403
+        response = client.get('/metrics', environ_base=remote,
+                              headers={'Authorization': 'Bearer wrong'})
+        assert response.status_code == 403
+        response = client.get('/metrics', environ_base=remote,
+                              headers={'Authorization': 'Bearer s3cret'})
+        assert response.status_code == 200
+
+    def test_proxied_request_is_not_local(self, client):
+        """A request nginx forwards from 127.0.0.1 still needs the token."""
+        assert client.get('/metrics').status_code == 200
+        response = client.get('/metrics', environ_base={'REMOTE_ADDR': '127.0.0.1'},
+                              headers={'X-Forwarded-For': '203.0.113.7'})
+        assert response.status_code == 403
+        response = client.get('/metrics', headers={'X-Real-IP': '203.0.113.7'})
+        assert response.status_code == 403
+
+    def test_production_requires_token(self, app, client):
+        """Production serves /metrics only with METRICS_TOKEN, even locally."""
+        from config import ProductionConfig
+        assert ProductionConfig.METRICS_ALLOW_LOCAL is False
+        app.extensions['metrics'].allow_local = False
+        assert client.get('/metrics').status_code == 403
+        app.extensions['metrics'].token = 's3cret'
+        response = client.get('/metrics', headers={'Authorization': 'Bearer s3cret'})
+        assert response.status_code == 200
+
+class TestQueryBudgets:
+    """Per-route limits on the number of SQL statements a request issues.
+
+    A budget that starts failing usually means an N+1 query or a lost
+    cache; the failure message lists every statement that ran.
+    """
+
+    def _create_registrations(self, app, count):
+        from app.services.registration_service import RegistrationService
+        with app.app_context():
+            for i in range(count):
+                RegistrationService.create_registration(
+                    name=f'Person {i:02d}', email=f'person{i}@test.com',
+                    company='Corp', job_title='Dev'
+                )
+
+    def test_health_issues_no_queries(self, client, query_budget):
+        """GET /api/health <= 0 queries."""
+        with query_budget(0, 'GET /api/health'):
+            client.get('/api/health')
+
+    def test_entries_api_budget(self, client, query_budget):
+        """GET /api/entries <= 2 queries (count + page)."""
+        for i in range(5):
+            client.post('/demo/', data={'value': f'entry {i}'})
+        with query_budget(2, 'GET /api/entries'):
+            client.get('/api/entries')
+
+    def test_demo_page_budget(self, client, query_budget):
+        """GET /demo/ <= 2 queries."""
+        client.post('/demo/', data={'value': 'entry'})
+        with query_budget(2, 'GET /demo/'):
+            client.get('/demo/')
+
+    def test_admin_attendees_budget(self, app, authenticated_client, query_budget):
+        """GET /admin/attendees <= 3 queries (daily stats with total, page, sketches)."""
+        self._create_registrations(app, 5)
+        authenticated_client.get('/admin/attendees')  # Warm the user loader cache
+        with query_budget(3, 'GET /admin/attendees'):
+            authenticated_client.get('/admin/attendees')
+
+    def test_admin_attendees_constant_in_rows(self, app, authenticated_client, count_queries):
+        """The number of queries does not grow with the number of rows shown or added."""
+        from app.services.registration_service import RegistrationService
+        self._create_registrations(app, 1)
+        authenticated_client.get('/admin/attendees')
+        # Both requests fold the analytics deltas queued since the last one
+        with app.app_context():
+            RegistrationService.create_registration(
+                name='Extra', email='extra@test.com', company='Corp', job_title='Dev'
+            )
+        with count_queries() as few:
+            authenticated_client.get('/admin/attendees')
+
+        with app.app_context():
+            for i in range(20):
+                RegistrationService.create_registration(
+                    name=f'Extra {i}', email=f'extra{i}-more@test.com',
+                    company='Corp', job_title='Dev'
+                )
+        with count_queries() as many:
+            authenticated_client.get('/admin/attendees')
+        assert many.count == few.count
+
+    def test_csv_export_budget(self, app, authenticated_client, query_budget):
+        """GET /admin/export/csv <= 1 query, however many rows are exported."""
+        self._create_registrations(app, 10)
+        authenticated_client.get('/admin/export/csv')
+        with query_budget(1, 'GET /admin/export/csv'):
+            authenticated_client.get('/admin/export/csv').get_data()
+
+    def test_counter_records_time(self, client, count_queries):
+        """The counter reports statements and the time spent in them."""
+        with count_queries() as queries:
+            client.get('/api/entries')
+        assert queries.count == len(queries.statements)
+        assert queries.duration >= 0
+        assert all('entries' in sql for sql, _ in queries.statements)
+
+    def test_budget_exceeded_fails(self, client, query_budget):
+        """Exceeding a budget fails with the offending statements listed."""
+        with pytest.raises(AssertionError) as excinfo:
+            with query_budget(0, 'GET /api/entries'):
+                client.get('/api/entries')
+        assert 'GET /api/entries issued 2 SQL statements (budget 0' in str(excinfo.value)
+        assert 'FROM entries' in str(excinfo.value)
+
+
+class TestBenchmarks:
+    """Smoke test for the benchmark suite in benchmarks/run.py."""
+
+    def test_run_benchmarks_reports_every_route(self, app):
+        """Each route gets percentiles, RSS and queries per request."""
+        from benchmarks.run import BENCHMARK_ROUTES, run_benchmarks
+
+        results = run_benchmarks(app, [20], BENCHMARK_ROUTES, iterations=3, isolate=False)
+
+        assert [r['route'] for r in results] == [f'{m} {p}' for m, p in BENCHMARK_ROUTES]
+        for result in results:
+            assert result['size'] == 20
+            assert result['errors'] == 0
+            assert 0 < result['p50_ms'] <= result['p95_ms'] <= result['p99_ms']
+            assert result['peak_rss_mb'] > 0
+            assert result['queries_per_request'] >= 1
+
+    def test_seed_is_deterministic(self, app):
+        """Seeding inserts exactly `size` entries and registrations."""
+        from benchmarks.run import seed
+        from app.models.registration import Registration
+
+        seed(50)
+        assert db.session.query(Entry).count() == 50
+        assert db.session.query(Registration).count() == 50
+        first = db.session.get(Registration, 1).email
+
+        seed(50)
+        assert db.session.get(Registration, 1).email == first
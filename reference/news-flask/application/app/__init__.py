@@ -44,6 +44,16 @@ def create_app(config_name: str | None = None) -> Flask:
     # Load configuration
     app.config.from_object(config[config_name])
 
+    # Pool options; in-memory SQLite uses a single static connection instead
+    if not app.config["SQLALCHEMY_DATABASE_URI"].startswith("sqlite:///:memory:"):
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+            "pool_size": app.config["DB_POOL_SIZE"],
+            "max_overflow": app.config["DB_MAX_OVERFLOW"],
+            "pool_timeout": app.config["DB_POOL_TIMEOUT"],
+            "pool_recycle": app.config["DB_POOL_RECYCLE"],
+            "pool_pre_ping": app.config["DB_POOL_PRE_PING"],
+        }
+
     # Initialize extensions
     db.init_app(app)
     migrate.init_app(app, db)
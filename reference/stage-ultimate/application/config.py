@@ -15,6 +15,18 @@ class Config:
     # SQLAlchemy
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Pool for the Key Vault 'database-url' database, sized per Gunicorn
+    # worker: workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW) must stay below the
+    # PostgreSQL server's max_connections. The messages.db SQLite fallback
+    # uses the same settings harmlessly.
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 5)),
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true',
+    }
+
     # Feature flag: force SQLite
     USE_SQLITE = os.environ.get('USE_SQLITE', 'false').lower() == 'true'
 
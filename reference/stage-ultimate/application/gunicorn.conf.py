@@ -0,0 +1,196 @@
+"""Gunicorn configuration sized from the container or VM limits.
+
+Gunicorn loads ./gunicorn.conf.py automatically, so `gunicorn wsgi:application`
+picks this up. Command-line flags still win over anything set here.
+
+Workers default to 2 x CPUs + 1, where CPUs come from the cgroup CPU quota
+(Docker --cpus, Container Apps, systemd CPUQuota) rather than the host's
+core count, and are capped so that workers x GUNICORN_WORKER_MEMORY_MB
+fits in the cgroup memory limit (Docker --memory, systemd MemoryMax). The
+limits are read from the process's own cgroup, found in /proc/self/cgroup,
+and its ancestors. When memory caps the worker count, each worker gets
+threads to make up the difference.
+
+Environment variables (all optional):
+    GUNICORN_BIND                 Address to bind (default 0.0.0.0:5001)
+    GUNICORN_WORKERS              Fixed worker count
+    GUNICORN_THREADS              Fixed threads per worker
+    GUNICORN_WORKER_MEMORY_MB     Expected memory per worker (default 128)
+    GUNICORN_TIMEOUT              Worker timeout in seconds (default 120)
+    GUNICORN_PRELOAD              Load the app once before forking (default false)
+    GUNICORN_MAX_REQUESTS         Restart a worker after this many requests (default 1000, 0 = never)
+    GUNICORN_MAX_REQUESTS_JITTER  Random extra requests so workers don't restart together (default 100)
+"""
+import math
+import os
+
+CGROUP_ROOT = '/sys/fs/cgroup'
+PROC_SELF_CGROUP = '/proc/self/cgroup'
+
+# cgroup v1 reports "no limit" as a huge page-aligned number
+UNLIMITED_MEMORY = 1 << 60
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _cgroup_dirs(root, controller=None, proc_cgroup=PROC_SELF_CGROUP):
+    """Return the directories holding this process's cgroup files, innermost first.
+
+    cgroup v2 (``controller`` None) uses the ``0::<path>`` line of
+    /proc/self/cgroup, v1 the line listing ``controller``. Limits on a parent
+    (e.g. a systemd slice) apply too, so the ancestors follow, down to the
+    mount point itself, which is the process's own cgroup inside a container
+    with a cgroup namespace.
+
+    Args:
+        root: cgroup filesystem mount point
+        controller: cgroup v1 controller directory (cpu, memory), or None
+        proc_cgroup: Path of the process's cgroup membership file
+
+    Returns:
+        list: Directory paths
+    """
+    base = root if controller is None else os.path.join(root, controller)
+    path = ''
+    for line in (_read(proc_cgroup) or '').splitlines():
+        parts = line.split(':', 2)
+        if len(parts) != 3:
+            continue
+        controllers = parts[1].split(',') if parts[1] else []
+        if (controller is None and not controllers) or controller in controllers:
+            path = parts[2].strip('/')
+            break
+    dirs = []
+    while path:
+        dirs.append(os.path.join(base, path))
+        path = os.path.dirname(path)
+    return dirs + [base]
+
+
+def cpu_limit(root=CGROUP_ROOT, proc_cgroup=PROC_SELF_CGROUP):
+    """Return the CPUs available to this process, honouring the cgroup quota.
+
+    The lowest quota of the process's cgroup and its ancestors applies, so
+    a systemd CPUQuota= on the service is found as well as a container's.
+
+    Args:
+        root: cgroup filesystem mount point
+        proc_cgroup: Path of the process's cgroup membership file
+
+    Returns:
+        float: CPU count, possibly fractional (e.g. 0.5)
+    """
+    try:
+        cpus = float(len(os.sched_getaffinity(0)))
+    except AttributeError:  # Not available on macOS
+        cpus = float(os.cpu_count() or 1)
+
+    quotas = []
+    found_v2 = False
+    for directory in _cgroup_dirs(root, None, proc_cgroup):
+        cpu_max = _read(os.path.join(directory, 'cpu.max'))  # v2: "<quota|max> <period>"
+        if cpu_max:
+            found_v2 = True
+            value, _, period_value = cpu_max.partition(' ')
+            if value != 'max':
+                quotas.append(int(value) / int(period_value or 100000))
+    if not found_v2:  # cgroup v1
+        for directory in _cgroup_dirs(root, 'cpu', proc_cgroup):
+            quota_value = _read(os.path.join(directory, 'cpu.cfs_quota_us'))
+            period_value = _read(os.path.join(directory, 'cpu.cfs_period_us'))
+            if quota_value and period_value and int(quota_value) > 0:
+                quotas.append(int(quota_value) / int(period_value))
+
+    return min([cpus] + quotas)
+
+
+def memory_limit(root=CGROUP_ROOT, proc_cgroup=PROC_SELF_CGROUP):
+    """Return the cgroup memory limit in bytes, or None if unlimited.
+
+    The lowest limit of the process's cgroup and its ancestors applies
+    (systemd MemoryMax= as well as a container's limit).
+
+    Args:
+        root: cgroup filesystem mount point
+        proc_cgroup: Path of the process's cgroup membership file
+
+    Returns:
+        int or None: Limit in bytes
+    """
+    values = [_read(os.path.join(directory, 'memory.max'))  # cgroup v2
+              for directory in _cgroup_dirs(root, None, proc_cgroup)]
+    if not any(values):
+        values = [_read(os.path.join(directory, 'memory.limit_in_bytes'))  # v1
+                  for directory in _cgroup_dirs(root, 'memory', proc_cgroup)]
+    limits = [int(value) for value in values
+              if value and value != 'max' and int(value) < UNLIMITED_MEMORY]
+    return min(limits) if limits else None
+
+
+def worker_counts(cpus, memory_bytes, worker_memory_mb=128):
+    """Choose workers and threads per worker for the given limits.
+
+    Args:
+        cpus: Available CPUs (may be fractional)
+        memory_bytes: Memory limit in bytes, or None if unlimited
+        worker_memory_mb: Expected resident memory of one worker
+
+    Returns:
+        tuple: (workers, threads)
+    """
+    wanted = max(2, math.floor(2 * cpus + 1))
+    workers = wanted
+    if memory_bytes is not None:
+        workers = max(1, min(wanted, memory_bytes // (worker_memory_mb * 1024 * 1024)))
+    threads = max(1, math.ceil(wanted / workers))
+    return workers, threads
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+_workers, _threads = worker_counts(
+    cpu_limit(), memory_limit(), _env_int('GUNICORN_WORKER_MEMORY_MB', 128)
+)
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5001')
+workers = _env_int('GUNICORN_WORKERS', _workers)
+threads = _env_int('GUNICORN_THREADS', _threads)
+timeout = _env_int('GUNICORN_TIMEOUT', 120)  # Generous for cold starts
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'false').lower() == 'true'
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', 100)
+accesslog = '-'
+errorlog = '-'
+
+
+def when_ready(server):
+    server.log.info('Sized for %.2f CPUs: %d workers x %d threads (preload %s)',
+                    cpu_limit(), workers, threads, 'on' if preload_app else 'off')
+
+
+def post_fork(server, worker):
+    """Give each worker its own database connections after a preloaded fork.
+
+    With preload_app the engine (and any connection the master opened, e.g.
+    for startup tasks) is inherited by every worker; two processes using one
+    socket corrupt each other's queries. dispose(close=False) drops the
+    inherited pool without closing the parent's connections.
+    """
+    if not preload_app:
+        return
+    app = server.app.wsgi()
+    sqlalchemy = getattr(app, 'extensions', {}).get('sqlalchemy')
+    if sqlalchemy is None:
+        return
+    with app.app_context():
+        for engine in sqlalchemy.engines.values():
+            engine.dispose(close=False)
@@ -67,9 +67,16 @@ def contact():
 
 @bp.route('/messages')
 def messages():
-    """Display all messages."""
+    """Display all messages.
+
+    Selects only the columns the template shows, as plain rows: no ORM
+    instances, identity map or change tracking for a read-only list.
+    """
     try:
-        all_messages = Message.query.order_by(Message.created_at.desc()).all()
+        all_messages = db.session.execute(
+            db.select(Message.name, Message.email, Message.message, Message.created_at)
+            .order_by(Message.created_at.desc())
+        ).all()
         return render_template('messages.html', messages=all_messages)
     except Exception as e:
         logger.error(f"Error fetching messages: {e}")
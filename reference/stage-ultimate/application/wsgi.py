@@ -2,7 +2,7 @@
 WSGI entry point for Gunicorn.
 
 Usage:
-    gunicorn --workers 2 --bind 0.0.0.0:5001 wsgi:application
+    gunicorn --config gunicorn.conf.py wsgi:application
 """
 
 from app import create_app
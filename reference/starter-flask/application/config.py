@@ -11,6 +11,18 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-change-in-production')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Pool for DATABASE_URL (Azure SQL in AzureConfig). The Azure SQL gateway
+    # drops connections left idle for about 30 minutes, so DB_POOL_RECYCLE
+    # (25 minutes) stays under that and pre-ping replaces any that were
+    # dropped anyway.
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 5)),
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1500)),
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true',
+    }
+
     @classmethod
     def get_database_url(cls):
         if os.environ.get('USE_SQLITE', '').lower() == 'true':
@@ -35,6 +47,7 @@ class AzureConfig(Config):
 class PytestConfig(Config):
     """Automated test suite (pytest). Uses in-memory SQLite."""
     TESTING = True
+    SQLALCHEMY_ENGINE_OPTIONS = {}  # In-memory SQLite uses a single static connection
 
     @classmethod
     def get_database_url(cls):